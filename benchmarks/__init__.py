@@ -0,0 +1 @@
+"""Benchmarks for the LangGraph agents in this repo."""
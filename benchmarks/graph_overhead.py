@@ -0,0 +1,382 @@
+"""Fake-model benchmark of the W&L graph's own overhead and fan-out scaling.
+
+The chat models are replaced by FakeChatModel, which sleeps for a fixed or
+sampled latency and returns a configurable number of output tokens, so the
+graph runs end to end without any API call or rate limit. For each scenario
+this measures:
+
+- end-to-end latency of a run (median of the repeats)
+- the ideal latency: the critical path through the injected model latencies,
+  max over subgraphs of (slowest candidate + evaluation)
+- framework overhead: end-to-end minus ideal latency
+- peak number of threads alive during the run
+
+Scenarios sweep NUM_EMOTIONAL/TECHNICAL_ITERATIONS (both set to the same value)
+at the smallest conversation size, then the conversation size at a fixed
+number of iterations, for each node mode (async nodes and sync nodes).
+
+Usage:
+    uv run python -m benchmarks.graph_overhead
+    uv run python -m benchmarks.graph_overhead --iterations 1 8 64 --latency 0.5
+    uv run python -m benchmarks.graph_overhead --mode sync --latency-sigma 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Self
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from benchmarks.startup import PLACEHOLDER_ENV, PROJECT_ROOT, git_commit
+
+DEFAULT_RESULTS_PATH = PROJECT_ROOT / "benchmarks" / "results" / "graph_overhead.json"
+
+DEFAULT_ITERATIONS = (1, 2, 4, 8, 16, 32, 64)
+# Conversation sizes in characters (~4 characters per token)
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+MODES = ("async", "sync")
+
+ROLE_RESPONSES = {
+    "emotional": "Emotional summary.",
+    # The technical summary must keep the AHA placeholder the output fills in
+    "technical": "Technical summary.\n\n[AHA_PLACEHOLDER]\n",
+    "evaluation": "Best summary: 1\n\nReasoning: Benchmark evaluation.",
+}
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model answering with a canned response after a simulated latency.
+
+    The latency is `latency_s`, or, with `latency_sigma` > 0, sampled from a
+    log-normal distribution with that median. Every call's latency is kept
+    with the subgraph it was made in (see `calls`). Like OpenAI's client, it
+    returns `n` completions per call, each reporting the usage of the call.
+    """
+
+    model_name: str = "fake-benchmark"
+    response: str = "Summary."
+    latency_s: float = 1.0
+    latency_sigma: float = 0.0
+    output_tokens: int = 500
+    seed: int | None = None
+    n: int = 1
+
+    _rng: random.Random = PrivateAttr()
+    _calls: list[tuple[str, float]] = PrivateAttr(default_factory=list)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark"
+
+    @property
+    def calls(self) -> list[tuple[str, float]]:
+        """(subgraph node, injected latency) of every call so far."""
+        with self._lock:
+            return list(self._calls)
+
+    def _sample_latency(self, run_manager) -> float:
+        with self._lock:
+            latency = self.latency_s
+            if self.latency_sigma > 0:
+                latency *= math.exp(self._rng.gauss(0.0, self.latency_sigma))
+            metadata = getattr(run_manager, "metadata", None) or {}
+            namespace = metadata.get("langgraph_checkpoint_ns", "")
+            self._calls.append((namespace.split(":", 1)[0], latency))
+        return latency
+
+    def _result(self, messages: list[BaseMessage]) -> ChatResult:
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        filler = " ".join(["token"] * max(self.output_tokens - 1, 0))
+        message = AIMessage(
+            content=f"{self.response}\n{filler}",
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": self.output_tokens,
+                "total_tokens": input_tokens + self.output_tokens,
+            },
+        )
+        return ChatResult(
+            generations=[ChatGeneration(message=message) for _ in range(self.n)]
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self._sample_latency(run_manager))
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self._sample_latency(run_manager))
+        return self._result(messages)
+
+
+def fake_models(
+    latency_s: float,
+    latency_sigma: float = 0.0,
+    output_tokens: int = 500,
+    seed: int | None = 0,
+) -> dict[str, FakeChatModel]:
+    """Role -> FakeChatModel, in place of config.MODELS."""
+    return {
+        role: FakeChatModel(
+            model_name=f"fake-{role}",
+            response=response,
+            latency_s=latency_s,
+            latency_sigma=latency_sigma,
+            output_tokens=output_tokens,
+            seed=None if seed is None else seed + i,
+        )
+        for i, (role, response) in enumerate(ROLE_RESPONSES.items())
+    }
+
+
+def make_conversation(num_chars: int) -> str:
+    """A synthetic two-speaker transcript of about num_chars characters."""
+    turns = []
+    length = 0
+    i = 0
+    while length < num_chars:
+        turn = (
+            f"Speaker {'AB'[i % 2]}: Turn {i} of the walk, talking about the "
+            f"week, a project and how it went.\n"
+        )
+        turns.append(turn)
+        length += len(turn)
+        i += 1
+    return "".join(turns)
+
+
+def ideal_latency_s(calls: list[tuple[str, float]]) -> float:
+    """Critical path of the injected latencies: the subgraphs run in parallel,
+    each one waiting for its slowest candidate, then its evaluation."""
+    by_subgraph: dict[str, list[float]] = {}
+    for subgraph, latency in calls:
+        by_subgraph.setdefault(subgraph, []).append(latency)
+    return max(
+        (
+            # The evaluation is the last (and only sequential) call of a subgraph
+            max(latencies[:-1], default=0.0) + latencies[-1]
+            for latencies in by_subgraph.values()
+        ),
+        default=0.0,
+    )
+
+
+class ThreadSampler:
+    """Sample threading.active_count() in the background, keeping the peak."""
+
+    def __init__(self, interval_s: float = 0.005):
+        self.interval_s = interval_s
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count())
+            self._stop.wait(self.interval_s)
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        # The sampler thread itself is not part of the run
+        self.peak -= 1
+
+
+def run_scenario(
+    iterations: int,
+    conversation_chars: int,
+    mode: str,
+    latency_s: float,
+    latency_sigma: float = 0.0,
+    output_tokens: int = 500,
+    repeat: int = 3,
+    seed: int | None = 0,
+) -> dict:
+    """Build the graph with fake models and time `repeat` runs of it."""
+    for key, value in PLACEHOLDER_ENV.items():
+        os.environ.setdefault(key, value)
+    # Imported here: the graph module builds its clients at import (see startup)
+    from src.agents.walkandlearn_summary.graph import build_graph
+
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = Path(tmp) / "benchmark_walk.md"
+        input_path.write_text(make_conversation(conversation_chars), encoding="utf-8")
+        for i in range(repeat):
+            models = fake_models(
+                latency_s,
+                latency_sigma,
+                output_tokens,
+                seed=None if seed is None else seed + 10 * i,
+            )
+            started = time.perf_counter()
+            graph = build_graph(
+                models=models,
+                num_emotional_iterations=iterations,
+                num_technical_iterations=iterations,
+                use_async=mode == "async",
+                response_cache_enabled=False,
+                rate_limits={},
+                output_base_folder=Path(tmp) / "output",
+            )
+            build_s = time.perf_counter() - started
+            graph_input = {"input_filename": str(input_path)}
+
+            with ThreadSampler() as threads:
+                started = time.perf_counter()
+                if mode == "async":
+                    asyncio.run(graph.ainvoke(graph_input))
+                else:
+                    graph.invoke(graph_input)
+                latency = time.perf_counter() - started
+
+            calls = [call for model in models.values() for call in model.calls]
+            ideal = ideal_latency_s(calls)
+            samples.append(
+                {
+                    "build_s": build_s,
+                    "latency_s": latency,
+                    "ideal_s": ideal,
+                    "overhead_s": latency - ideal,
+                    "llm_calls": len(calls),
+                    "peak_threads": threads.peak,
+                }
+            )
+
+    result = {
+        "iterations": iterations,
+        "conversation_chars": conversation_chars,
+        "mode": mode,
+        "samples": repeat,
+    }
+    for metric in ("build_s", "latency_s", "ideal_s", "overhead_s"):
+        result[metric] = round(statistics.median(s[metric] for s in samples), 4)
+    result["llm_calls"] = samples[0]["llm_calls"]
+    result["peak_threads"] = max(s["peak_threads"] for s in samples)
+    return result
+
+
+def scenarios(
+    iterations: list[int], sizes: list[int], size_iterations: int, modes: list[str]
+) -> list[tuple[int, int, str]]:
+    """(iterations, conversation_chars, mode) of the iteration and size sweeps."""
+    planned = []
+    for mode in modes:
+        planned += [(n, sizes[0], mode) for n in iterations]
+        planned += [(size_iterations, size, mode) for size in sizes[1:]]
+    return planned
+
+
+def print_report(results: list[dict]) -> None:
+    print(
+        f"{'MODE':<6} {'ITER':>4} {'CHARS':>9} {'CALLS':>5} {'LATENCY':>9} "
+        f"{'IDEAL':>9} {'OVERHEAD':>9} {'BUILD':>8} {'THREADS':>7}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<6} {r['iterations']:>4} {r['conversation_chars']:>9} "
+            f"{r['llm_calls']:>5} {r['latency_s']:>8.3f}s {r['ideal_s']:>8.3f}s "
+            f"{r['overhead_s']:>8.3f}s {r['build_s']:>7.3f}s {r['peak_threads']:>7}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--iterations", type=int, nargs="+", default=list(DEFAULT_ITERATIONS)
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Conversation sizes in characters",
+    )
+    parser.add_argument(
+        "--size-iterations",
+        type=int,
+        default=4,
+        help="Iterations used for the conversation size sweep",
+    )
+    parser.add_argument("--mode", choices=MODES, action="append")
+    parser.add_argument(
+        "--latency", type=float, default=1.0, help="(Median) model latency in seconds"
+    )
+    parser.add_argument(
+        "--latency-sigma",
+        type=float,
+        default=0.0,
+        help="Log-normal sigma of the sampled latency (0 = fixed latency)",
+    )
+    parser.add_argument("--output-tokens", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=DEFAULT_RESULTS_PATH)
+    parser.add_argument(
+        "--no-save", action="store_true", help="Do not write the results file"
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for iterations, size, mode in scenarios(
+        args.iterations, args.sizes, args.size_iterations, args.mode or list(MODES)
+    ):
+        print(f"Running {mode}, {iterations} iterations, {size} chars...")
+        results.append(
+            run_scenario(
+                iterations,
+                size,
+                mode,
+                latency_s=args.latency,
+                latency_sigma=args.latency_sigma,
+                output_tokens=args.output_tokens,
+                repeat=args.repeat,
+                seed=args.seed,
+            )
+        )
+
+    print()
+    print_report(results)
+
+    if not args.no_save:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_s": args.latency,
+            "latency_sigma": args.latency_sigma,
+            "output_tokens": args.output_tokens,
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""Startup benchmark for the LangGraph entry points declared in langgraph.json.
+
+Every graph in langgraph.json is built at module import, so server restarts pay
+for it. For each entry point this measures, in a fresh interpreter per sample:
+
+- cold import time (importing the module and reading the graph attribute, or
+  calling it with an empty config when it is a graph factory like make_graph)
+- graph compile time (time spent in the entry module's own body, i.e. excluding
+  its imports, as reported by `python -X importtime`)
+- peak RSS of the process
+- the module-level import tree (heaviest imports under the entry module)
+
+Results are appended to a JSON history file and compared with the median of
+the previous runs to flag regressions.
+
+Usage:
+    uv run python -m benchmarks.startup
+    uv run python -m benchmarks.startup --repeat 5 --entry "W&L Summary"
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+LANGGRAPH_CONFIG = PROJECT_ROOT / "langgraph.json"
+DEFAULT_HISTORY_PATH = PROJECT_ROOT / "benchmarks" / "results" / "startup_history.json"
+
+# Graph modules build their chat model clients at import, which needs API keys
+# to be set (no request is ever sent). Placeholders are used when missing.
+PLACEHOLDER_ENV = {
+    "OPENAI_API_KEY": "benchmark-placeholder",
+    "ANTHROPIC_API_KEY": "benchmark-placeholder",
+    "GOOGLE_API_KEY": "benchmark-placeholder",
+}
+
+METRICS = ("import_s", "compile_s", "peak_rss_mb")
+
+# A metric only counts as a regression if it is worse than the baseline by
+# both the relative threshold and this absolute amount (to ignore noise).
+MIN_ABSOLUTE_DELTA = {
+    "import_s": 0.05,
+    "compile_s": 0.02,
+    "peak_rss_mb": 5.0,
+}
+
+PROBE = """
+import json, resource, sys, time
+
+module_name, attr = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+# __import__ (unlike importlib.import_module) is visible to -X importtime
+__import__(module_name)
+target = getattr(sys.modules[module_name], attr)
+# The server calls a graph factory with each run's config: build the default one
+graph = target if hasattr(target, "invoke") else target({})
+import_s = time.perf_counter() - start
+
+peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss is in bytes on macOS and in kilobytes on Linux
+peak_rss_mb = peak_rss / (1024 * 1024) if sys.platform == "darwin" else peak_rss / 1024
+sample = {"import_s": import_s, "peak_rss_mb": peak_rss_mb}
+print(json.dumps({**sample, "graph": type(graph).__name__}))
+"""
+
+
+@dataclass
+class EntryPoint:
+    name: str
+    module: str
+    attr: str
+
+
+@dataclass
+class ImportNode:
+    module: str
+    self_us: int
+    cumulative_us: int
+    children: list["ImportNode"] = field(default_factory=list)
+
+
+def load_entry_points(config_path: Path = LANGGRAPH_CONFIG) -> list[EntryPoint]:
+    """Read the graphs declared in langgraph.json as importable entry points."""
+    config = json.loads(config_path.read_text(encoding="utf-8"))
+    entry_points = []
+    for name, target in config["graphs"].items():
+        path, attr = target.rsplit(":", 1)
+        module = Path(path).with_suffix("").as_posix().replace("/", ".")
+        entry_points.append(EntryPoint(name=name, module=module, attr=attr))
+    return entry_points
+
+
+def parse_importtime(stderr: str) -> list[ImportNode]:
+    """Parse `python -X importtime` output into a forest of ImportNode.
+
+    importtime prints modules in post-order (children before their parent),
+    indenting each level by two spaces.
+    """
+    pending: dict[int, list[ImportNode]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_part, cumulative_part, name_part = line[len("import time:") :].split(
+            "|", 2
+        )
+        name = name_part[1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        node = ImportNode(
+            module=name.strip(),
+            self_us=int(self_part),
+            cumulative_us=int(cumulative_part),
+            children=pending.pop(depth + 1, []),
+        )
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def summarize_import_tree(
+    node: ImportNode, max_depth: int = 2, max_children: int = 10
+) -> dict:
+    """Keep the heaviest branches of an import tree, as plain JSON data."""
+    summary = {
+        "module": node.module,
+        "self_ms": round(node.self_us / 1000, 1),
+        "cumulative_ms": round(node.cumulative_us / 1000, 1),
+    }
+    if max_depth > 0 and node.children:
+        heaviest = sorted(node.children, key=lambda c: c.cumulative_us, reverse=True)
+        summary["children"] = [
+            summarize_import_tree(child, max_depth - 1, max_children)
+            for child in heaviest[:max_children]
+        ]
+    return summary
+
+
+def measure_once(entry_point: EntryPoint) -> dict:
+    """Import one entry point in a fresh interpreter and collect its metrics."""
+    env = {**PLACEHOLDER_ENV, **os.environ}
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            PROBE,
+            entry_point.module,
+            entry_point.attr,
+        ],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Importing {entry_point.module}:{entry_point.attr} failed:\n"
+            f"{completed.stderr[-2000:]}"
+        )
+
+    sample = json.loads(completed.stdout.strip().splitlines()[-1])
+    roots = parse_importtime(completed.stderr)
+    entry_node = next((r for r in roots if r.module == entry_point.module), None)
+    sample["compile_s"] = entry_node.self_us / 1e6 if entry_node else None
+    sample["import_tree"] = summarize_import_tree(entry_node) if entry_node else None
+    return sample
+
+
+def measure(entry_point: EntryPoint, repeat: int) -> dict:
+    """Measure an entry point `repeat` times and keep the median of each metric."""
+    samples = [measure_once(entry_point) for _ in range(repeat)]
+    result = {"module": f"{entry_point.module}:{entry_point.attr}", "samples": repeat}
+    for metric in METRICS:
+        values = [s[metric] for s in samples if s[metric] is not None]
+        result[metric] = round(statistics.median(values), 4) if values else None
+    # The tree of the median-import sample is the most representative one
+    median_sample = sorted(samples, key=lambda s: s["import_s"])[len(samples) // 2]
+    result["import_tree"] = median_sample["import_tree"]
+    return result
+
+
+def load_history(history_path: Path) -> list[dict]:
+    if not history_path.exists():
+        return []
+    return json.loads(history_path.read_text(encoding="utf-8"))
+
+
+def save_history(history_path: Path, history: list[dict]) -> None:
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    history_path.write_text(json.dumps(history, indent=2) + "\n", encoding="utf-8")
+
+
+def detect_regressions(
+    history: list[dict],
+    results: dict[str, dict],
+    threshold: float = 0.2,
+    baseline_runs: int = 5,
+) -> list[str]:
+    """Compare results with the median of the last runs in the history.
+
+    Args:
+        history: Previous runs, oldest first
+        results: Entry point name -> measured metrics for the current run
+        threshold: Relative slowdown/growth that counts as a regression
+        baseline_runs: How many previous runs form the baseline
+
+    Returns:
+        One human-readable message per regressed metric
+    """
+    regressions = []
+    for name, result in results.items():
+        for metric in METRICS:
+            previous = [
+                run["results"][name][metric]
+                for run in history[-baseline_runs:]
+                if run["results"].get(name, {}).get(metric) is not None
+            ]
+            current = result.get(metric)
+            if not previous or current is None:
+                continue
+            baseline = statistics.median(previous)
+            delta = current - baseline
+            if delta > MIN_ABSOLUTE_DELTA[metric] and delta > baseline * threshold:
+                regressions.append(
+                    f"{name}: {metric} {baseline:.3f} -> {current:.3f} "
+                    f"(+{delta / baseline:.0%})"
+                    if baseline
+                    else f"{name}: {metric} 0 -> {current:.3f}"
+                )
+    return regressions
+
+
+def git_commit() -> str | None:
+    completed = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return completed.stdout.strip() if completed.returncode == 0 else None
+
+
+def print_report(results: dict[str, dict]) -> None:
+    print(f"{'ENTRY POINT':<22} {'IMPORT':>9} {'COMPILE':>9} {'PEAK RSS':>10}")
+    for name, result in results.items():
+        compile_s = result["compile_s"]
+        print(
+            f"{name:<22} {result['import_s']:>8.3f}s "
+            f"{compile_s if compile_s is not None else float('nan'):>8.3f}s "
+            f"{result['peak_rss_mb']:>7.1f} MB"
+        )
+        tree = result.get("import_tree") or {}
+        for child in tree.get("children", [])[:5]:
+            print(f"    {child['cumulative_ms']:>8.1f} ms  {child['module']}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Samples per entry")
+    parser.add_argument(
+        "--entry", action="append", help="Only measure this graph name (repeatable)"
+    )
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH)
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Regression threshold (0.2=20%%)"
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="Do not append to the history file"
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with status 1 when a regression is flagged",
+    )
+    args = parser.parse_args(argv)
+
+    entry_points = [
+        ep for ep in load_entry_points() if not args.entry or ep.name in args.entry
+    ]
+    results = {}
+    for entry_point in entry_points:
+        print(f"Measuring {entry_point.name} ({args.repeat} cold imports)...")
+        results[entry_point.name] = measure(entry_point, args.repeat)
+
+    print()
+    print_report(results)
+
+    history = load_history(args.history)
+    regressions = detect_regressions(history, results, threshold=args.threshold)
+    print()
+    if regressions:
+        print("REGRESSIONS")
+        for regression in regressions:
+            print(f"  - {regression}")
+    else:
+        print(f"No regressions against the last {min(len(history), 5)} run(s).")
+
+    if not args.no_save:
+        history.append(
+            {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "git_commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+                "regressions": regressions,
+            }
+        )
+        save_history(args.history, history)
+        print(f"History written to {args.history}")
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""Batch mode: run the W&L summary graph over many transcripts.
+
+Input files are selected with a glob or a directory relative to
+agent_files/walkandlearn_summary. Every file runs through the compiled graph
+(one output folder per file, see write_output_node), with a global concurrency
+limit and a per-provider limit for the providers of the current
+CONFIG_TEMPLATE. Files that already have an output are skipped.
+
+Usage:
+    uv run python -m src.agents.walkandlearn_summary.batch "walks/*.md"
+    uv run python -m src.agents.walkandlearn_summary.batch walks --max-concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.agents.walkandlearn_summary.config import (
+    BATCH_MAX_CONCURRENCY,
+    BATCH_MAX_CONCURRENCY_PER_PROVIDER,
+    CONFIG_TEMPLATE,
+    INPUT_DIR,
+    get_output_base_folder,
+    template_models,
+)
+from src.agents.walkandlearn_summary.models import MODEL_CATALOG
+from src.agents.walkandlearn_summary.rate_limit import rate_limiter_queue_depths
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    input_filename: str
+    status: str  # "done", "skipped" or "failed"
+    duration_s: float = 0.0
+    error: str | None = None
+
+
+def find_input_files(pattern: str, input_dir: Path = INPUT_DIR) -> list[str]:
+    """List the input files matching a glob or directory, relative to input_dir.
+
+    Args:
+        pattern: A directory (all *.md files in it) or a glob, relative to input_dir
+        input_dir: Root folder of the W&L input files
+
+    Returns:
+        Sorted input filenames, usable as the graph's `input_filename`
+    """
+    target = input_dir / pattern
+    paths = target.glob("*.md") if target.is_dir() else input_dir.glob(pattern)
+    return sorted(p.relative_to(input_dir).as_posix() for p in paths if p.is_file())
+
+
+def has_existing_output(input_filename: str) -> bool:
+    """Whether a previous run already wrote outputs for this input file.
+
+    Only the run folders of this very file count: the outputs of a file of the
+    same name in another folder are not under the same base folder.
+    """
+    base_folder = get_output_base_folder(input_filename)
+    return base_folder.is_dir() and any(base_folder.glob("*/evaluation.md"))
+
+
+def template_providers(template: str = CONFIG_TEMPLATE) -> list[str]:
+    """Providers (e.g. "Anthropic") used by the roles of a template."""
+    models = template_models(template)
+    return sorted(
+        {MODEL_CATALOG.get(models.friendly_name(role)).provider for role in models}
+    )
+
+
+class ProviderSlots:
+    """Concurrency slots of the runs: a global limit and one per provider.
+
+    Args:
+        max_concurrency: Maximum number of runs in flight overall
+        provider_limits: Maximum number of runs in flight per provider
+        providers: Every provider a run may hold a slot of
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        provider_limits: dict[str, int] | None,
+        providers: list[str],
+    ):
+        limits = provider_limits or {}
+        self._global_slots = asyncio.Semaphore(max_concurrency)
+        self._provider_slots = {
+            provider: asyncio.Semaphore(limits.get(provider, max_concurrency))
+            for provider in providers
+        }
+
+    @asynccontextmanager
+    async def hold(self, providers: list[str]):
+        """Hold a global slot and one slot of each of the providers."""
+        async with AsyncExitStack() as slots:
+            await slots.enter_async_context(self._global_slots)
+            # Always acquired in sorted order, so runs cannot deadlock on each other
+            for provider in sorted(providers):
+                await slots.enter_async_context(self._provider_slots[provider])
+            yield
+
+
+class BatchRunner:
+    """Run many input files through a compiled graph with bounded concurrency.
+
+    Args:
+        graph: The compiled W&L graph
+        max_concurrency: Maximum number of files in flight overall
+        provider_limits: Maximum number of files in flight per provider
+        providers: Providers every run uses (each run holds one slot of each)
+        graph_config: RunnableConfig passed to every run
+    """
+
+    def __init__(
+        self,
+        graph,
+        max_concurrency: int = BATCH_MAX_CONCURRENCY,
+        provider_limits: dict[str, int] | None = None,
+        providers: list[str] | None = None,
+        graph_config: dict | None = None,
+    ):
+        self.graph = graph
+        self.graph_config = graph_config
+        self.providers = sorted(providers if providers is not None else [])
+        self._slots = ProviderSlots(max_concurrency, provider_limits, self.providers)
+        self._done = 0
+        self._total = 0
+
+    def _log(self, input_filename: str, message: str) -> None:
+        queued = {k: v for k, v in rate_limiter_queue_depths().items() if v}
+        queue_info = f" (rate limit queue: {queued})" if queued else ""
+        print(
+            f"[{self._done}/{self._total}] {input_filename}: {message}{queue_info}",
+            flush=True,
+        )
+
+    async def run_file(self, input_filename: str) -> BatchResult:
+        async with self._slots.hold(self.providers):
+            self._log(input_filename, "started")
+            start = time.perf_counter()
+            try:
+                async for namespace, update in self.graph.astream(
+                    {"input_filename": input_filename},
+                    config=self.graph_config,
+                    stream_mode="updates",
+                    subgraphs=True,
+                ):
+                    for node_name in update:
+                        path = "/".join(
+                            [*(ns.split(":")[0] for ns in namespace), node_name]
+                        )
+                        self._log(input_filename, f"{path} done")
+            except Exception as e:  # One bad file must not stop the batch
+                self._done += 1
+                logger.exception("Batch run of %s failed", input_filename)
+                self._log(input_filename, f"FAILED ({e!r})")
+                return BatchResult(
+                    input_filename,
+                    "failed",
+                    duration_s=time.perf_counter() - start,
+                    error=repr(e),
+                )
+
+            self._done += 1
+            duration_s = time.perf_counter() - start
+            self._log(input_filename, f"finished in {duration_s:.1f}s")
+            return BatchResult(input_filename, "done", duration_s=duration_s)
+
+    async def run(
+        self, input_filenames: list[str], force: bool = False
+    ) -> list[BatchResult]:
+        """Run every file, skipping those with existing outputs unless force is set."""
+        skipped = [
+            BatchResult(f, "skipped")
+            for f in input_filenames
+            if not force and has_existing_output(f)
+        ]
+        skipped_names = {r.input_filename for r in skipped}
+        to_run = [f for f in input_filenames if f not in skipped_names]
+        for result in skipped:
+            print(f"{result.input_filename}: already has outputs, skipped")
+
+        self._done = 0
+        self._total = len(to_run)
+        results = await asyncio.gather(*(self.run_file(f) for f in to_run))
+        return skipped + list(results)
+
+
+def parse_provider_limits(values: list[str]) -> dict[str, int]:
+    """Parse ["Anthropic=2", ...] CLI values into a provider -> limit dict."""
+    limits = dict(BATCH_MAX_CONCURRENCY_PER_PROVIDER)
+    for value in values:
+        provider, _, limit = value.partition("=")
+        limits[provider] = int(limit)
+    return limits
+
+
+def print_batch_summary(results: list[BatchResult]) -> None:
+    print()
+    print("BATCH SUMMARY")
+    print("-------------")
+    for status in ("done", "skipped", "failed"):
+        matching = [r for r in results if r.status == status]
+        print(f"{status}: {len(matching)}")
+        if status == "failed":
+            for result in matching:
+                print(f"  - {result.input_filename}: {result.error}")
+
+
+async def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize many W&L transcripts.")
+    parser.add_argument("pattern", help=f"Glob or directory, relative to {INPUT_DIR}")
+    parser.add_argument("--max-concurrency", type=int, default=BATCH_MAX_CONCURRENCY)
+    parser.add_argument(
+        "--provider-limit",
+        action="append",
+        default=[],
+        metavar="PROVIDER=N",
+        help="Override a per-provider limit (repeatable)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-process files that have outputs"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the response cache lookups (fresh responses are still stored)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only list the files to process"
+    )
+    args = parser.parse_args(argv)
+
+    input_filenames = find_input_files(args.pattern)
+    if not input_filenames:
+        print(f"No input files match {args.pattern!r} in {INPUT_DIR}")
+        return 1
+
+    if args.dry_run:
+        for input_filename in input_filenames:
+            existing = has_existing_output(input_filename)
+            print(f"{input_filename}{' (has outputs)' if existing else ''}")
+        return 0
+
+    from src.agents.walkandlearn_summary.graph import graph
+
+    runner = BatchRunner(
+        graph,
+        max_concurrency=args.max_concurrency,
+        provider_limits=parse_provider_limits(args.provider_limit),
+        providers=template_providers(),
+        graph_config={"configurable": {"bypass_response_cache": args.no_cache}},
+    )
+    results = await runner.run(input_filenames, force=args.force)
+    print_batch_summary(results)
+    return 1 if any(r.status == "failed" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
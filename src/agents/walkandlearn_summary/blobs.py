@@ -0,0 +1,162 @@
+"""Content-addressed store for the large texts of a run.
+
+With WL_BLOB_STATE=on, the conversation (and its digest or condensed notes)
+and every summary candidate are written once to a local store, and the graph
+state only carries their handles ("blob:<sha256>"). Nodes resolve a handle
+when they need the text, so what the subgraphs receive and what a checkpointer
+persists at every step stays small however long the transcript and however
+many candidates. Recently used texts are kept in memory, so the candidates of
+a run read the conversation from disk once.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+HANDLE_PREFIX = "blob:"
+
+
+def is_handle(value: object) -> bool:
+    """Whether a state value is a blob handle rather than the text itself."""
+    return isinstance(value, str) and value.startswith(HANDLE_PREFIX)
+
+
+class BlobStore:
+    """Texts stored on disk under the SHA-256 of their content.
+
+    A blob's mtime is bumped whenever it is stored again, so evict only drops
+    the texts no run has produced for max_age_s (e.g. the checkpoints of a run
+    that old can no longer be resumed).
+
+    Args:
+        directory: Folder holding the blobs
+        max_age_s: Blobs not stored for this long are evicted
+        memory_bytes: Size of the in-memory cache of recently used texts
+    """
+
+    def __init__(
+        self, directory: Path, max_age_s: float, memory_bytes: int = 64 * 1024 * 1024
+    ):
+        self.directory = Path(directory)
+        self.max_age_s = max_age_s
+        self.memory_bytes = memory_bytes
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}.txt"
+
+    def _remember(self, handle: str, text: str) -> None:
+        with self._lock:
+            if handle in self._memory:
+                self._memory.move_to_end(handle)
+                return
+            self._memory[handle] = text
+            self._memory_size += len(text)
+            while self._memory_size > self.memory_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
+
+    def put(self, text: str) -> str:
+        """Store a text (once per content) and return its handle."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        handle = HANDLE_PREFIX + digest
+        path = self._path(digest)
+        if path.exists():
+            os.utime(path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{digest}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            tmp_path.replace(path)
+        self._remember(handle, text)
+        return handle
+
+    def _recall(self, handle: str) -> str | None:
+        with self._lock:
+            if handle not in self._memory:
+                return None
+            self._memory.move_to_end(handle)
+            return self._memory[handle]
+
+    def get(self, handle: str) -> str:
+        """Return the text of a handle.
+
+        Raises:
+            KeyError: If the blob is not in the store (e.g. evicted)
+        """
+        text = self._recall(handle)
+        if text is not None:
+            return text
+        try:
+            text = self._path(handle.removeprefix(HANDLE_PREFIX)).read_text(
+                encoding="utf-8"
+            )
+        except FileNotFoundError:
+            raise KeyError(f"Blob {handle} is not in {self.directory}") from None
+        self._remember(handle, text)
+        return text
+
+    async def aget(self, handle: str) -> str:
+        """Async version of get (a text not in memory is read in a thread)."""
+        text = self._recall(handle)
+        if text is not None:
+            return text
+        return await asyncio.to_thread(self.get, handle)
+
+    def evict(self) -> int:
+        """Remove the blobs not stored for max_age_s.
+
+        Returns:
+            Number of blobs removed
+        """
+        if not self.directory.exists():
+            return 0
+
+        now = time.time()
+        removed = 0
+        for path in self.directory.glob("*/*.txt"):
+            try:
+                if now - path.stat().st_mtime > self.max_age_s:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+
+        if removed:
+            logger.info("Evicted %d blobs", removed)
+        return removed
+
+
+def put_text(store: BlobStore | None, text: str) -> str:
+    """The value to keep in the state for a text: its handle, or the text
+    itself without a store."""
+    return text if store is None else store.put(text)
+
+
+async def aput_text(store: BlobStore | None, text: str) -> str:
+    """Async version of put_text (the write runs in a thread)."""
+    return text if store is None else await asyncio.to_thread(store.put, text)
+
+
+def resolve_text(store: BlobStore | None, value: str | None) -> str | None:
+    """The text of a state value, which may be a handle or the text itself."""
+    if store is None or not is_handle(value):
+        return value
+    return store.get(value)
+
+
+async def aresolve_text(store: BlobStore | None, value: str | None) -> str | None:
+    """Async version of resolve_text (see BlobStore.aget)."""
+    if store is None or not is_handle(value):
+        return value
+    return await store.aget(value)
@@ -0,0 +1,238 @@
+"""Content-addressed on-disk cache for LLM responses.
+
+Summary and evaluation calls are keyed by a hash of everything that determines
+their output (model slug, temperature, system prompt, candidate index and input
+text), so re-running the graph on the same input and template does not pay for
+the same calls again.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import AIMessage
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Persistent response cache with size and age-based eviction.
+
+    Each entry is one JSON file named after its key. An entry's mtime is bumped
+    on every hit, so eviction drops the least recently used entries first.
+    Eviction scans the whole directory, so it runs once per graph run (see
+    load_conversation) and after every evict_every writes, not on each write.
+
+    Args:
+        directory: Folder holding the cache entries
+        max_bytes: Total size above which the oldest entries are evicted
+        max_age_s: Entries not used for this long are evicted
+        evict_every: Writes after which put evicts
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int,
+        max_age_s: float,
+        evict_every: int = 100,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.evict_every = evict_every
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        kind: str,
+        model_slug: str,
+        temperature: float | None,
+        system_prompt: str,
+        input_text: str,
+        candidate_index: int | None = None,
+    ) -> str:
+        """Hash everything that determines a response into a cache key."""
+        payload = json.dumps(
+            {
+                "kind": kind,
+                "model_slug": model_slug,
+                "temperature": temperature,
+                "system_prompt": system_prompt,
+                "candidate_index": candidate_index,
+                "input_text": input_text,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached response for key, or None on a miss or expired entry."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age_s:
+                path.unlink(missing_ok=True)
+                return None
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)
+        return entry["response"]
+
+    def put(self, key: str, response: Any) -> None:
+        """Store a JSON-serializable response, evicting every evict_every writes."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{key}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(
+            json.dumps({"created_at": time.time(), "response": response}),
+            encoding="utf-8",
+        )
+        tmp_path.replace(path)
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes >= self.evict_every
+            if due:
+                self._writes = 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Remove expired entries, then the oldest ones until under max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.directory.exists():
+            return 0
+
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_s:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+
+        if removed:
+            logger.info("Evicted %d response cache entries", removed)
+        return removed
+
+
+def _input_text(agent_input: dict) -> str:
+    """Flatten the messages of an agent input into the text to hash."""
+    return "\n\n".join(str(message.content) for message in agent_input["messages"])
+
+
+class CachedAgent:
+    """Wraps an agent so its responses are served from a ResponseCache.
+
+    Only the content of the last message is cached; a hit returns it as a
+    single AIMessage, which is all the summary and evaluation nodes read.
+
+    Args:
+        agent: The agent to wrap (anything with invoke/ainvoke)
+        cache: The response cache
+        kind: "summary" or "evaluation", part of the key
+        model_slug: Slug of the agent's model, part of the key
+        temperature: Temperature of the agent's model, part of the key
+        system_prompt: System prompt of the agent, part of the key
+        candidate_index: Candidate this call generates (None for evaluation)
+        bypass: Skip the lookup; the fresh response is still stored
+    """
+
+    def __init__(
+        self,
+        agent,
+        cache: ResponseCache,
+        kind: str,
+        model_slug: str,
+        temperature: float | None,
+        system_prompt: str,
+        candidate_index: int | None = None,
+        bypass: bool = False,
+    ):
+        self.agent = agent
+        self.cache = cache
+        self.kind = kind
+        self.model_slug = model_slug
+        self.temperature = temperature
+        self.system_prompt = system_prompt
+        self.candidate_index = candidate_index
+        self.bypass = bypass
+
+    def _key(self, agent_input: dict) -> str:
+        return self.cache.make_key(
+            kind=self.kind,
+            model_slug=self.model_slug,
+            temperature=self.temperature,
+            system_prompt=self.system_prompt,
+            input_text=_input_text(agent_input),
+            candidate_index=self.candidate_index,
+        )
+
+    @staticmethod
+    def _as_result(content) -> dict:
+        return {
+            "messages": [
+                AIMessage(content=content, response_metadata={"response_cache": "hit"})
+            ]
+        }
+
+    def lookup(self, agent_input: dict) -> dict | None:
+        """The cached result for this input, without calling the agent on a miss."""
+        if self.bypass:
+            return None
+        cached = self.cache.get(self._key(agent_input))
+        return None if cached is None else self._as_result(cached)
+
+    def store(self, agent_input: dict, content: Any) -> None:
+        """Cache a response generated without going through this agent."""
+        self.cache.put(self._key(agent_input), content)
+
+    def invoke(self, agent_input: dict, *args, **kwargs) -> dict:
+        key = self._key(agent_input)
+        if not self.bypass:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._as_result(cached)
+        result = self.agent.invoke(agent_input, *args, **kwargs)
+        self.cache.put(key, result["messages"][-1].content)
+        return result
+
+    async def ainvoke(self, agent_input: dict, *args, **kwargs) -> dict:
+        # Disk I/O runs in a thread: the LangGraph server flags blocking calls
+        # made on the event loop.
+        key = self._key(agent_input)
+        if not self.bypass:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                return self._as_result(cached)
+        result = await self.agent.ainvoke(agent_input, *args, **kwargs)
+        await asyncio.to_thread(self.cache.put, key, result["messages"][-1].content)
+        return result
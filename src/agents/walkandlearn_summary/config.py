@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
-from src.agents.walkandlearn_summary.models import get_model_by_name
+
+from src.agents.walkandlearn_summary.models import LazyRoleModels
+from src.agents.walkandlearn_summary.rate_limit import RateLimit
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 
@@ -8,106 +11,68 @@ TEMPS = {
     "technical": 0.7,
     "evaluation": 0.6,
 }
-MODELS = {
-    "gpt-5.1": {
-        "emotional": get_model_by_name("GPT 5.1", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("GPT 5.1", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("GPT 5.1", temp=TEMPS["evaluation"]),
-    },
-    "gpt-5.1-chat": {
-        "emotional": get_model_by_name("GPT 5.1-chat", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("GPT 5.1-chat", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("GPT 5.1-chat", temp=TEMPS["evaluation"]),
-    },
-    "gpt-5.2": {
-        "emotional": get_model_by_name("GPT 5.2", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("GPT 5.2", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("GPT 5.2", temp=TEMPS["evaluation"]),
-    },
-    "gpt-5.2-chat": {
-        "emotional": get_model_by_name("GPT 5.2-chat", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("GPT 5.2-chat", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("GPT 5.2-chat", temp=TEMPS["evaluation"]),
-    },
-    "claude-sonnet-4.5": {
-        "emotional": get_model_by_name("Sonnet 4.5", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("Sonnet 4.5", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("Sonnet 4.5", temp=TEMPS["evaluation"]),
-    },
-    "gemini-pro": {
-        "emotional": get_model_by_name("Gemini 2.5 Pro", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("Gemini 2.5 Pro", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("Gemini 2.5 Pro", temp=TEMPS["evaluation"]),
-    },
-    "gemini-3-pro": {
-        "emotional": get_model_by_name("Gemini 3 Pro", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("Gemini 3 Pro", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("Gemini 3 Pro", temp=TEMPS["evaluation"]),
-    },
-    "gpt-nano": {
-        "emotional": get_model_by_name("GPT 5-nano", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("GPT 5-nano", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("GPT 5-nano", temp=TEMPS["evaluation"]),
-    },
-    "gemini-nano": {
-        "emotional": get_model_by_name(
-            "Gemini 2.5 Flash Lite", temp=TEMPS["emotional"]
-        ),
-        "technical": get_model_by_name(
-            "Gemini 2.5 Flash Lite", temp=TEMPS["technical"]
-        ),
-        "evaluation": get_model_by_name(
-            "Gemini 2.5 Flash Lite", temp=TEMPS["evaluation"]
-        ),
-    },
+
+
+def same_model_for_all_roles(friendly_name: str) -> dict[str, str]:
+    """Map every role in TEMPS to the same model friendly name."""
+    return {role: friendly_name for role in TEMPS}
+
+
+# Role -> model friendly name. Clients are built lazily (see LazyRoleModels).
+MODEL_ROLES = {
+    "gpt-5.1": same_model_for_all_roles("GPT 5.1"),
+    "gpt-5.1-chat": same_model_for_all_roles("GPT 5.1-chat"),
+    "gpt-5.2": same_model_for_all_roles("GPT 5.2"),
+    "gpt-5.2-chat": same_model_for_all_roles("GPT 5.2-chat"),
+    "claude-sonnet-4.5": same_model_for_all_roles("Sonnet 4.5"),
+    "gemini-pro": same_model_for_all_roles("Gemini 2.5 Pro"),
+    "gemini-3-pro": same_model_for_all_roles("Gemini 3 Pro"),
+    "gpt-nano": same_model_for_all_roles("GPT 5-nano"),
+    "gemini-nano": same_model_for_all_roles("Gemini 2.5 Flash Lite"),
     "thinking": {
-        "emotional": get_model_by_name("Sonnet 4.5", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("GPT 5-nano", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("Sonnet 4.5", temp=TEMPS["evaluation"]),
-    },
-    "wip-thinking": {
-        "emotional": get_model_by_name("GPT 5-nano", temp=TEMPS["emotional"]),
-        "technical": get_model_by_name("GPT 5-nano", temp=TEMPS["technical"]),
-        "evaluation": get_model_by_name("GPT 5-nano", temp=TEMPS["evaluation"]),
+        "emotional": "Sonnet 4.5",
+        "technical": "GPT 5-nano",
+        "evaluation": "Sonnet 4.5",
     },
+    "wip-thinking": same_model_for_all_roles("GPT 5-nano"),
 }
 
 CONFIG_TEMPLATES = {
     "main-gpt": {
         "wip": False,
-        "models": MODELS["gpt-5.2"],
+        "models": MODEL_ROLES["gpt-5.2"],
     },
     "main-gpt-chat": {
         "wip": False,
-        "models": MODELS["gpt-5.2-chat"],
+        "models": MODEL_ROLES["gpt-5.2-chat"],
     },
     "main-claude": {
         "wip": False,
-        "models": MODELS["claude-sonnet-4.5"],
+        "models": MODEL_ROLES["claude-sonnet-4.5"],
     },
     "main-gemini": {
         "wip": False,
-        "models": MODELS["gemini-3-pro"],
+        "models": MODEL_ROLES["gemini-3-pro"],
     },
     "thinking": {
         "wip": False,
-        "models": MODELS["thinking"],
+        "models": MODEL_ROLES["thinking"],
     },
     "gemini-fast-nowip": {
         "wip": False,
-        "models": MODELS["gemini-nano"],
+        "models": MODEL_ROLES["gemini-nano"],
     },
     "wip": {
         "wip": True,
-        "models": MODELS["gpt-nano"],
+        "models": MODEL_ROLES["gpt-nano"],
     },
     "wip-gemini": {
         "wip": True,
-        "models": MODELS["gemini-nano"],
+        "models": MODEL_ROLES["gemini-nano"],
     },
     "wip-thinking": {
         "wip": True,
-        "models": MODELS["wip-thinking"],
+        "models": MODEL_ROLES["wip-thinking"],
     },
 }
 
@@ -131,6 +96,11 @@ EVAL_DISABLED = False
 NUM_EMOTIONAL_ITERATIONS = 3
 NUM_TECHNICAL_ITERATIONS = 3
 
+# Run the summary/evaluation nodes as coroutines (agent.ainvoke) so concurrent
+# runs under the LangGraph server share the event loop instead of a thread each.
+# A deployment can opt back into the sync nodes with WL_ASYNC_NODES=false.
+ASYNC_NODES = os.environ.get("WL_ASYNC_NODES", "true").lower() not in ("0", "false")
+
 # INPUT_FILENAME = "input.md"
 # INPUT_FILENAME = "nput-shap.md"
 # INPUT_FILENAME = "input-norm1.md"
@@ -143,22 +113,183 @@ INPUT_FILENAME = "input-march26.md"
 ########################################################
 # CONFIG VALUES
 ########################################################
+def template_models(template: str) -> LazyRoleModels:
+    """Role -> chat model of a config template.
+
+    Chat model clients are only built when a role is first accessed, and are
+    shared by every template using the same model and temperature.
+    """
+    return LazyRoleModels(CONFIG_TEMPLATES[template]["models"], temps=TEMPS)
+
+
+def default_input_filename(template: str) -> str:
+    """Input file of the runs that do not name one (a short one for WIP templates)."""
+    return "input-wip.md" if CONFIG_TEMPLATES[template]["wip"] else INPUT_FILENAME
+
+
 CONFIG = CONFIG_TEMPLATES[CONFIG_TEMPLATE]
 WIP_MODE = CONFIG["wip"]
 
-MODELS = CONFIG["models"]
+MODELS = template_models(CONFIG_TEMPLATE)
 PRINT_SUMMARY_IN_CHAT = True
 
 # Default input filename (can be overridden via graph state)
-INPUT_FILENAME = "input-wip.md" if WIP_MODE else INPUT_FILENAME
-DEFAULT_INPUT_FILENAME = INPUT_FILENAME
+DEFAULT_INPUT_FILENAME = default_input_filename(CONFIG_TEMPLATE)
+
+# A run can pick its own template, iterations and disabled flags with
+# {"configurable": {"template": "main-gpt", "num_emotional_iterations": 5}}
+# (see graph.make_graph); the compiled graphs of the last GRAPH_CACHE_SIZE
+# distinct choices are kept, so switching between them costs no rebuild.
+GRAPH_CACHE_SIZE = 8
 
 
 OUTPUT_FILE_PATH_OBSIDIAN_BASE = Path(
     "/Users/flo/Work/Private/PKM/Obsidian/TheVault/WalkAndLearn/DebugSandbox"
 )
 
+# Only write the combined result of the best emotional and technical summaries
+# (the other combinations can be rendered on demand, see render.py)
+OUTPUT_BEST_RESULT_ONLY = False
+OUTPUT_WRITE_MAX_WORKERS = 8
+
+INPUT_DIR = PROJECT_ROOT / "agent_files" / "walkandlearn_summary"
+
+# Batch mode (see batch.py): how many files run through the graph at once,
+# overall and per provider used by the current CONFIG_TEMPLATE.
+BATCH_MAX_CONCURRENCY = 4
+BATCH_MAX_CONCURRENCY_PER_PROVIDER = {
+    "Anthropic": 2,
+    "OpenAI": 4,
+    "Google": 4,
+}
+
+# Sweep mode (see sweep.py): the templates one input runs through by default,
+# concurrently, within the per-provider limits above.
+SWEEP_TEMPLATES = ("main-claude", "main-gpt", "main-gemini", "thinking")
+
+
+# Summary/evaluation responses are cached on disk, keyed by model, temperature,
+# prompt, candidate index and input. Set WL_RESPONSE_CACHE=off (or pass
+# {"configurable": {"bypass_response_cache": True}} for one run) to bypass it.
+RESPONSE_CACHE_DISABLED = os.environ.get("WL_RESPONSE_CACHE", "on").lower() == "off"
+RESPONSE_CACHE_DIR = PROJECT_ROOT / "agent_files" / ".cache" / "walkandlearn_summary"
+RESPONSE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+RESPONSE_CACHE_MAX_AGE_S = 30 * 24 * 3600
+
+
+# Opt-in blob state (see blobs.py): the conversation and the summaries are kept
+# in a local content-addressed store, and the graph state (and its checkpoints)
+# only carries their handles. Blobs not produced again for
+# BLOB_STORE_MAX_AGE_S are evicted, so older runs can no longer be resumed.
+BLOB_STATE_ENABLED = os.environ.get("WL_BLOB_STATE", "off").lower() == "on"
+BLOB_STORE_DIR = PROJECT_ROOT / "agent_files" / ".blobs" / "walkandlearn_summary"
+BLOB_STORE_MAX_AGE_S = 30 * 24 * 3600
+
+# Mark the shared prompt prefix (system prompt + conversation) of the summary
+# candidates for provider-side prompt caching.
+PROMPT_CACHING = True
+# Opt-in Anthropic cache warm-up: the first candidate runs alone to write the
+# cache and the others start once it is done, so they read it (0.1x the input
+# price) instead of each paying for a cache write (1.25x). This trades latency
+# for cost: the candidates take about two summary calls instead of one.
+PROMPT_CACHE_WARM_UP = os.environ.get("WL_PROMPT_CACHE_WARM_UP", "off").lower() == "on"
+
+# Map-reduce ("chunked") mode: a transcript that does not fit in
+# CHUNKED_MODE_CONTEXT_FRACTION of a model's context window (see the catalog in
+# models.py) is split into token chunks, condensed into notes in parallel, and
+# the notes are summarized instead.
+CHUNKED_MODE_ENABLED = True
+CHUNKED_MODE_CONTEXT_FRACTION = 0.5
+CHUNKED_MODE_CHUNK_TOKENS = 20_000
+CHUNKED_MODE_CHUNK_OVERLAP = 500
+CHUNKED_MODE_TOKENIZER = "cl100k_base"
+CHUNKED_MODE_MAX_PARALLEL = 8
+
+# SQLite database holding the checkpoints of runs started with runs.py, so a
+# failed or interrupted run can be resumed by thread id
+CHECKPOINT_DB_PATH = (
+    PROJECT_ROOT / "agent_files" / ".checkpoints" / "walkandlearn_summary.sqlite"
+)
+
+# Opt-in OpenTelemetry tracing (see tracing.py): spans are appended to
+# TRACING_FILE, or sent to the OTLP collector at WL_TRACING_ENDPOINT if set
+TRACING_ENABLED = os.environ.get("WL_TRACING", "off").lower() == "on"
+TRACING_ENDPOINT = os.environ.get("WL_TRACING_ENDPOINT") or None
+TRACING_FILE = PROJECT_ROOT / "agent_files" / ".traces" / "walkandlearn_summary.jsonl"
+
+# How the best summary is picked: "single" sends every summary to one evaluator
+# call; "tournament" compares EVAL_TOURNAMENT_GROUP_SIZE summaries per call in
+# concurrent bracket rounds, bounding the evaluator prompt for many candidates;
+# "streaming" compares each candidate with the best so far as soon as it lands.
+EVAL_MODE = os.environ.get("WL_EVAL_MODE", "single")
+EVAL_TOURNAMENT_GROUP_SIZE = 2
+EVAL_TOURNAMENT_MAX_PARALLEL = 8
+
+# Summaries at least this similar (Jaccard similarity of their word 5-grams)
+# are evaluated once, shrinking the evaluator prompt; None evaluates them all
+EVAL_DEDUP_THRESHOLD = 0.9
+
+# Seconds a run may spend before the evaluation proceeds with the candidates
+# that finished; the others are cancelled and recorded as dropped. Off (0) by
+# default; a run can set its own with {"configurable": {"deadline_s": 60}}.
+RUN_DEADLINE_S = float(os.environ.get("WL_RUN_DEADLINE_S", "0"))
+
+# Optional conversation digest read by every summary candidate instead of the
+# raw transcript (see nodes/digest.py): "normalize" strips timestamps, filler
+# and repetition deterministically; "model" also condenses the normalized
+# transcript with one call to the cheap DIGEST_MODEL. Off by default.
+CONVERSATION_DIGEST = os.environ.get("WL_CONVERSATION_DIGEST", "off").lower()
+DIGEST_MODEL = "Gemini 2.5 Flash Lite"
+
+# Opt-in single-call candidates: request all the summary candidates of a type in
+# one call with n completions, where the provider supports it (OpenAI, Gemini),
+# paying for the shared prompt once. Other providers keep one call per candidate.
+MULTI_CHOICE_GENERATION = (
+    os.environ.get("WL_MULTI_CHOICE_GENERATION", "off").lower() == "on"
+)
+
+# Opt-in hedged summary requests (see hedging.py): a summary call still running
+# after HEDGING_PERCENTILE of its model's recent latencies is also sent to a
+# backup model of the same type; the first response wins. Hedging starts once
+# HEDGING_MIN_SAMPLES latencies of the model have been seen in the process.
+HEDGING_ENABLED = os.environ.get("WL_HEDGING", "off").lower() == "on"
+HEDGING_PERCENTILE = 0.9
+HEDGING_MIN_SAMPLES = 10
+HEDGING_LATENCY_WINDOW = 50
+
+# Requests/min and estimated tokens/min allowed per (provider, model). Shared by
+# every call in the process, so batch runs contend for the same budget.
+RATE_LIMITS = {
+    "Anthropic": RateLimit(requests_per_minute=50, tokens_per_minute=30_000),
+    "OpenAI": RateLimit(requests_per_minute=500, tokens_per_minute=500_000),
+    "Google": RateLimit(requests_per_minute=150, tokens_per_minute=1_000_000),
+}
+# Output tokens budgeted per call, on top of the estimated input tokens
+RATE_LIMIT_EXPECTED_OUTPUT_TOKENS = 2_000
+
 
 def get_input_file_path(filename: str) -> Path:
     """Get the full path to an input file given its filename."""
-    return PROJECT_ROOT / "agent_files" / "walkandlearn_summary" / filename
+    return INPUT_DIR / filename
+
+
+def input_key(input_filename: str) -> Path:
+    """The path of an input file relative to INPUT_DIR, without its extension.
+
+    Files of the same name in different folders (walks/a/x.md, walks/b/x.md)
+    get different keys. Paths outside INPUT_DIR are keyed on their name.
+    """
+    path = Path(os.path.normpath(input_filename))
+    if path.is_absolute():
+        try:
+            path = path.relative_to(INPUT_DIR)
+        except ValueError:
+            return Path(path.stem)
+    if path.parts and path.parts[0] == "..":
+        return Path(path.stem)
+    return path.with_suffix("")
+
+
+def get_output_base_folder(input_filename: str) -> Path:
+    """Get the folder holding every run (one timestamped subfolder each) for an input file."""
+    return OUTPUT_FILE_PATH_OBSIDIAN_BASE / input_key(input_filename)
@@ -0,0 +1,92 @@
+"""Per-run deadline for the summary candidates.
+
+load_conversation stores the run's time budget and start in the state; the
+deadline is computed from them when the candidates start (see
+run_deadline_at), so a run resumed later gets its budget again instead of
+dropping every pending candidate. A candidate still running when it expires
+is cancelled and recorded as dropped, so the evaluation proceeds with the
+candidates that finished in time instead of waiting for the slowest one.
+"""
+
+import asyncio
+import contextvars
+import time
+from collections.abc import Callable, Coroutine, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from langchain_core.runnables import RunnableConfig
+
+
+class DeadlineExceeded(Exception):
+    """The run's deadline expired before the call returned."""
+
+
+def run_deadline_s(
+    config: RunnableConfig | None, default: float | None
+) -> float | None:
+    """Seconds a run may take: {"configurable": {"deadline_s": ...}} or default.
+
+    A deadline of 0 (or None) means no deadline.
+    """
+    configurable = (config or {}).get("configurable", {})
+    return configurable.get("deadline_s", default) or None
+
+
+def run_deadline_at(state: Mapping, config: RunnableConfig | None) -> float | None:
+    """time.time() after which the run's unfinished candidates are dropped.
+
+    The budget (state "deadline_s") counts from the run's start (state
+    "run_started_at"), or from {"configurable": {"resumed_at": ...}} when the
+    run was resumed (see runs.py).
+    """
+    deadline_s = state.get("deadline_s")
+    if not deadline_s:
+        return None
+    configurable = (config or {}).get("configurable", {})
+    started_at = configurable.get("resumed_at") or state.get("run_started_at")
+    return (started_at or time.time()) + deadline_s
+
+
+def remaining_s(deadline_at: float | None) -> float | None:
+    """Seconds left until deadline_at (None when there is no deadline)."""
+    if deadline_at is None:
+        return None
+    return deadline_at - time.time()
+
+
+def call_with_deadline[T](call: Callable[[], T], deadline_at: float | None) -> T:
+    """Run call, raising DeadlineExceeded if it has not returned by deadline_at.
+
+    Threads cannot be cancelled: a call that misses the deadline runs to
+    completion in the background and its result is dropped.
+    """
+    timeout = remaining_s(deadline_at)
+    if timeout is None:
+        return call()
+    if timeout <= 0:
+        raise DeadlineExceeded
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = pool.submit(contextvars.copy_context().run, call)
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        raise DeadlineExceeded from None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def acall_with_deadline[T](
+    call: Coroutine[object, object, T], deadline_at: float | None
+) -> T:
+    """Await call, cancelling it and raising DeadlineExceeded at deadline_at."""
+    timeout = remaining_s(deadline_at)
+    if timeout is None:
+        return await call
+    if timeout <= 0:
+        call.close()
+        raise DeadlineExceeded
+    try:
+        return await asyncio.wait_for(call, timeout)
+    except TimeoutError:
+        raise DeadlineExceeded from None
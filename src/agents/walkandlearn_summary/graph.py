@@ -1,38 +1,150 @@
 """LangGraph agent for summarizing conversations with emotional and technical summaries."""
 
+import asyncio
+import contextvars
+import logging
 import operator
-from typing import Annotated, Optional
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Annotated, TypedDict
+
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from src.agents.walkandlearn_summary.blobs import (
+    BlobStore,
+    aput_text,
+    aresolve_text,
+    put_text,
+    resolve_text,
+)
+from src.agents.walkandlearn_summary.cache import CachedAgent, ResponseCache
 from src.agents.walkandlearn_summary.config import (
-    EVAL_DISABLED,
-    MODELS,
+    ASYNC_NODES,
+    BLOB_STATE_ENABLED,
+    BLOB_STORE_DIR,
+    BLOB_STORE_MAX_AGE_S,
+    CHUNKED_MODE_CHUNK_OVERLAP,
+    CHUNKED_MODE_CHUNK_TOKENS,
+    CHUNKED_MODE_CONTEXT_FRACTION,
+    CHUNKED_MODE_ENABLED,
+    CHUNKED_MODE_MAX_PARALLEL,
+    CHUNKED_MODE_TOKENIZER,
+    CONFIG_TEMPLATE,
+    CONFIG_TEMPLATES,
+    CONVERSATION_DIGEST,
+    DIGEST_MODEL,
     EMOTIONAL_DISABLED,
+    EVAL_DEDUP_THRESHOLD,
+    EVAL_DISABLED,
+    EVAL_MODE,
+    EVAL_TOURNAMENT_GROUP_SIZE,
+    EVAL_TOURNAMENT_MAX_PARALLEL,
+    GRAPH_CACHE_SIZE,
+    HEDGING_ENABLED,
+    HEDGING_LATENCY_WINDOW,
+    HEDGING_MIN_SAMPLES,
+    HEDGING_PERCENTILE,
+    MULTI_CHOICE_GENERATION,
     NUM_EMOTIONAL_ITERATIONS,
     NUM_TECHNICAL_ITERATIONS,
-    TECHNICAL_DISABLED,
+    OUTPUT_BEST_RESULT_ONLY,
+    OUTPUT_WRITE_MAX_WORKERS,
     PRINT_SUMMARY_IN_CHAT,
-    CONFIG_TEMPLATE,
-    DEFAULT_INPUT_FILENAME,
-    OUTPUT_FILE_PATH_OBSIDIAN_BASE,
+    PROMPT_CACHE_WARM_UP,
+    PROMPT_CACHING,
+    RATE_LIMIT_EXPECTED_OUTPUT_TOKENS,
+    RATE_LIMITS,
+    RESPONSE_CACHE_DIR,
+    RESPONSE_CACHE_DISABLED,
+    RESPONSE_CACHE_MAX_AGE_S,
+    RESPONSE_CACHE_MAX_BYTES,
+    RUN_DEADLINE_S,
+    TECHNICAL_DISABLED,
+    TRACING_ENABLED,
+    default_input_filename,
     get_input_file_path,
+    get_output_base_folder,
+    input_key,
+    template_models,
 )
-from langchain.agents import create_agent
-from langchain_core.messages import AIMessage
-from langgraph.graph import StateGraph, START, END, MessagesState
-
-from src.agents.walkandlearn_summary.nodes.summary import (
-    generate_summary_with_agent,
+from src.agents.walkandlearn_summary.deadline import (
+    DeadlineExceeded,
+    acall_with_deadline,
+    call_with_deadline,
+    run_deadline_at,
+    run_deadline_s,
+)
+from src.agents.walkandlearn_summary.hedging import HedgedAgent, get_latency_tracker
+from src.agents.walkandlearn_summary.io import read_file
+from src.agents.walkandlearn_summary.metrics import node_timing, timed_node
+from src.agents.walkandlearn_summary.models import (
+    backup_model_for,
+    context_window_of,
+    describe_model,
+    get_model_by_name,
+    provider_of,
+    supports_multiple_choices,
+)
+from src.agents.walkandlearn_summary.nodes.chunking import (
+    asummarize_chunks,
+    chunk_tokens_for,
+    conversation_token_budget,
+    format_condensed_conversation,
+    needs_chunking,
+    split_conversation,
+    summarize_chunks,
+)
+from src.agents.walkandlearn_summary.nodes.digest import (
+    DIGEST_MODES,
+    build_digest_input,
+    choose_digest,
+    digest_stats,
+    normalize_transcript,
+)
+from src.agents.walkandlearn_summary.nodes.evaluation import (
+    KingOfTheHill,
+    aevaluate_summaries,
+    aevaluate_tournament,
+    evaluate_summaries,
+    evaluate_tournament,
+    to_candidate_index,
 )
-from src.agents.walkandlearn_summary.nodes.evaluation import evaluate_summaries
 from src.agents.walkandlearn_summary.nodes.output import (
+    awrite_all_output_files,
     format_evaluation_chat_output,
+    render_metrics_file,
     write_all_output_files,
 )
-from src.agents.walkandlearn_summary.io import read_file
+from src.agents.walkandlearn_summary.nodes.summary import (
+    MultiChoiceAgent,
+    agenerate_summary_with_agent,
+    build_summary_input,
+    extract_summary_text,
+    generate_summary_with_agent,
+)
 from src.agents.walkandlearn_summary.prompts import (
-    EMOTIONAL_SUMMARY_PROMPT,
-    TECHNICAL_SUMMARY_PROMPT,
+    CHUNK_NOTES_PROMPT,
+    DIGEST_PROMPT,
     EVALUATION_PROMPT,
+    summary_prompts,
 )
+from src.agents.walkandlearn_summary.rate_limit import (
+    RateLimit,
+    RateLimitedAgent,
+    estimate_tokens,
+    get_rate_limiter,
+)
+from src.agents.walkandlearn_summary.sink import OutputSink
+from src.agents.walkandlearn_summary.usage import UsageRecorder
+
+logger = logging.getLogger(__name__)
 
 
 def keep_last_value(left, right):
@@ -40,15 +152,130 @@ def keep_last_value(left, right):
     return right if right is not None else left
 
 
+def merge_candidates(left: dict[int, str], right: dict[int, str]) -> dict[int, str]:
+    """Reducer merging summaries keyed by candidate index.
+
+    The candidates finish in any order; keyed by index, their order (and so the
+    evaluated best index) does not depend on it, and an update only adds its
+    own entries instead of concatenating lists. A new mapping is returned:
+    LangGraph shares the channel's value with the checkpoints and the
+    streamed snapshots of earlier steps, which must not change.
+    """
+    if not right:
+        return left
+    return {**(left or {}), **right}
+
+
+def ordered_summaries(candidates: Mapping[int, str] | None) -> list[str]:
+    """The summaries of the finished candidates, in candidate order."""
+    return [candidates[i] for i in sorted(candidates or {})]
+
+
+def bypass_response_cache(config: RunnableConfig | None) -> bool:
+    """Whether this run asked to skip response cache lookups."""
+    return bool((config or {}).get("configurable", {}).get("bypass_response_cache"))
+
+
 class SummaryState(MessagesState):
-    input_filename: Annotated[Optional[str], keep_last_value]
+    input_filename: Annotated[str | None, keep_last_value]
+    # Text of input_filename when the caller already read it (e.g. a sweep
+    # running one transcript through several templates); load_conversation
+    # then does not read the file, and clears it
+    input_text: Annotated[str | None, keep_last_value]
     conversation: Annotated[str, keep_last_value]
-    emotional_summaries: Annotated[list[str], operator.add]
-    technical_summaries: Annotated[list[str], operator.add]
-    emotional_best_idx: Annotated[Optional[int], keep_last_value]
-    emotional_best_reasoning: Annotated[Optional[str], keep_last_value]
-    technical_best_idx: Annotated[Optional[int], keep_last_value]
-    technical_best_reasoning: Annotated[Optional[str], keep_last_value]
+    # Read by the summary candidates instead of the conversation when set (see
+    # nodes/digest.py), with its token reduction
+    conversation_digest: Annotated[str | None, keep_last_value]
+    digest_stats: Annotated[dict | None, keep_last_value]
+    # Candidate index -> summary, of the candidates that finished
+    emotional_summaries: Annotated[dict[int, str], merge_candidates]
+    technical_summaries: Annotated[dict[int, str], merge_candidates]
+    # Seconds after the run's start (time.time()) after which unfinished
+    # candidates are dropped (see deadline.run_deadline_at)
+    deadline_s: Annotated[float | None, keep_last_value]
+    run_started_at: Annotated[float | None, keep_last_value]
+    # Candidate nodes (e.g. "emotional_2") cancelled by the run deadline
+    dropped_candidates: Annotated[list[str], operator.add]
+    # Chunk notes replacing the conversation when it is too long for the
+    # summary models (see condense_conversation)
+    condensed_conversation: Annotated[str | None, keep_last_value]
+    # Usage of every LLM call (see usage.UsageRecorder)
+    llm_usage: Annotated[list[dict], operator.add]
+    # Wall time of every node (see metrics.timed_node)
+    node_timings: Annotated[list[dict], operator.add]
+    emotional_best_idx: Annotated[int | None, keep_last_value]
+    emotional_best_reasoning: Annotated[str | None, keep_last_value]
+    technical_best_idx: Annotated[int | None, keep_last_value]
+    technical_best_reasoning: Annotated[str | None, keep_last_value]
+
+
+class SummaryInput(TypedDict, total=False):
+    """What a summary subgraph receives from the parent state.
+
+    Not the records accumulated with operator.add (llm_usage, node_timings,
+    dropped_candidates): the subgraph hands back its whole state, which must
+    only hold its own records.
+    """
+
+    conversation: str
+    conversation_digest: str | None
+    condensed_conversation: str | None
+    deadline_s: float | None
+    run_started_at: float | None
+
+
+def single_call_agent(model_, prompt: str):
+    """An agent answering one prompt with one model call.
+
+    Its runs are never checkpointed: they have nothing to resume, and their
+    messages would persist a copy of the conversation per call.
+    """
+    return create_agent(model=model_, system_prompt=prompt, checkpointer=False)
+
+
+def rate_limited_agent(
+    agent_,
+    model_,
+    prompt: str,
+    rate_limits: Mapping[str, RateLimit] | None,
+    expected_output_tokens: int = RATE_LIMIT_EXPECTED_OUTPUT_TOKENS,
+):
+    """Wrap an agent in the shared rate limiter of its model, if its provider has one."""
+    provider = provider_of(model_)
+    if rate_limits is None or provider not in rate_limits:
+        return agent_
+    model_slug, _ = describe_model(model_)
+    return RateLimitedAgent(
+        agent_,
+        get_rate_limiter(provider, model_slug, rate_limits[provider]),
+        expected_output_tokens=expected_output_tokens,
+        system_prompt=prompt,
+    )
+
+
+def response_cached_agent(
+    agent_,
+    response_cache: ResponseCache | None,
+    kind: str,
+    model_,
+    prompt: str,
+    config: RunnableConfig | None,
+    candidate_index: int | None = None,
+):
+    """Wrap an agent to serve its responses from the response cache, if any."""
+    if response_cache is None:
+        return agent_
+    model_slug, temperature = describe_model(model_)
+    return CachedAgent(
+        agent_,
+        response_cache,
+        kind=kind,
+        model_slug=model_slug,
+        temperature=temperature,
+        system_prompt=prompt,
+        candidate_index=candidate_index,
+        bypass=bypass_response_cache(config),
+    )
 
 
 def build_summary_subgraph(
@@ -59,6 +286,15 @@ def build_summary_subgraph(
     summary_disabled: bool,
     eval_disabled: bool,
     evaluation_model,
+    use_async: bool = ASYNC_NODES,
+    response_cache: ResponseCache | None = None,
+    rate_limits: Mapping[str, RateLimit] | None = RATE_LIMITS,
+    hedging: bool = HEDGING_ENABLED,
+    eval_dedup_threshold: float | None = EVAL_DEDUP_THRESHOLD,
+    eval_mode: str = EVAL_MODE,
+    multi_choice: bool = MULTI_CHOICE_GENERATION,
+    blob_store: BlobStore | None = None,
+    prompt_cache_warm_up: bool = PROMPT_CACHE_WARM_UP,
 ):
     """Build a subgraph for generating summaries in parallel.
 
@@ -69,105 +305,930 @@ def build_summary_subgraph(
         num_iterations: Number of parallel iterations
         is_disabled: Whether this summary type is disabled
         evaluation_model: The model to use for evaluation
+        use_async: Build async nodes (agent.ainvoke) instead of sync ones
+        response_cache: Serve summary/evaluation responses from this cache
+        rate_limits: Provider -> limit; calls to other providers are not limited
+        hedging: Race slow summary calls against a backup model of the same
+            type (see hedging.py)
+        eval_dedup_threshold: Evaluate near-duplicate summaries once (see
+            evaluation.collapse_near_duplicates); None evaluates them all
+        eval_mode: "single" (one evaluator call), "tournament" (bracket
+            rounds of small-group calls, see evaluation.evaluate_tournament) or
+            "streaming" (each candidate challenges the best so far as soon as
+            it finishes, see evaluation.KingOfTheHill)
+        multi_choice: Generate the candidates in one call with n completions
+            when the model supports it (not in streaming mode, which evaluates
+            the candidates as they arrive one by one)
+        blob_store: Keep the conversation and the summaries in this store,
+            with only their handles in the state (see blobs.py)
+        prompt_cache_warm_up: With Anthropic, run the first candidate alone to
+            write the prompt cache before starting the others (cheaper, but
+            about twice as slow)
     """
-    agent = create_agent(model=model, system_prompt=system_prompt)
-    evaluation_agent = create_agent(
-        model=evaluation_model, system_prompt=EVALUATION_PROMPT
+    if eval_mode == "single":
+        evaluate, aevaluate, evaluate_options = (
+            evaluate_summaries,
+            aevaluate_summaries,
+            {},
+        )
+    elif eval_mode == "tournament":
+        evaluate, aevaluate, evaluate_options = (
+            evaluate_tournament,
+            aevaluate_tournament,
+            {
+                "group_size": EVAL_TOURNAMENT_GROUP_SIZE,
+                "max_parallel": EVAL_TOURNAMENT_MAX_PARALLEL,
+            },
+        )
+    elif eval_mode != "streaming":
+        raise ValueError(f"Unknown evaluation mode: {eval_mode}")
+
+    def with_rate_limit(
+        agent_, model_, prompt, expected_output_tokens=RATE_LIMIT_EXPECTED_OUTPUT_TOKENS
+    ):
+        return rate_limited_agent(
+            agent_, model_, prompt, rate_limits, expected_output_tokens
+        )
+
+    agent = with_rate_limit(
+        single_call_agent(model, system_prompt), model, system_prompt
     )
+    evaluation_agent = with_rate_limit(
+        single_call_agent(evaluation_model, EVALUATION_PROMPT),
+        evaluation_model,
+        EVALUATION_PROMPT,
+    )
+    # Backup of the summary calls, when hedging and the catalog has one
+    backup_spec = backup_model_for(model) if hedging else None
+    summary_backup = None
+    if backup_spec is not None:
+        backup_model = get_model_by_name(
+            backup_spec.friendly_name, temp=describe_model(model)[1]
+        )
+        summary_backup = (
+            with_rate_limit(
+                single_call_agent(backup_model, system_prompt),
+                backup_model,
+                system_prompt,
+            ),
+            backup_model,
+        )
     state_key = f"{summary_type}_summaries"
+    # Anthropic needs an explicit cache breakpoint; the other providers cache
+    # the (identical) prompt prefix of the candidates implicitly.
+    cache_prefix = PROMPT_CACHING and provider_of(model) == "Anthropic"
+    # Candidates started together all pay the cache write (1.25x the input
+    # price) and none reads it. When warming up, the first candidate runs alone
+    # to write the cache and the others start when it is done and read it (0.1x).
+    warm_prompt_cache = (
+        prompt_cache_warm_up
+        and cache_prefix
+        and num_iterations > 1
+        and not summary_disabled
+    )
+
+    def cached_agent(agent_, kind, model_, prompt, config, candidate_index):
+        return response_cached_agent(
+            agent_, response_cache, kind, model_, prompt, config, candidate_index
+        )
+
+    def recorded_agent(
+        agent_, kind, model_, prompt, config, node, candidate_index=None, backup=None
+    ) -> UsageRecorder:
+        """Wrap an agent for one call: response cache, hedging to the (agent,
+        model) backup if any, then usage recording."""
+        model_slug, _ = describe_model(model_)
+        agent_ = cached_agent(agent_, kind, model_, prompt, config, candidate_index)
+        if backup is not None:
+            backup_agent, backup_model_ = backup
+            agent_ = HedgedAgent(
+                agent_,
+                cached_agent(
+                    backup_agent, kind, backup_model_, prompt, config, candidate_index
+                ),
+                primary_slug=model_slug,
+                backup_slug=describe_model(backup_model_)[0],
+                tracker=get_latency_tracker(model_slug, HEDGING_LATENCY_WINDOW),
+                percentile=HEDGING_PERCENTILE,
+                min_samples=HEDGING_MIN_SAMPLES,
+            )
+        return UsageRecorder(agent_, node=node, model_slug=model_slug)
+
+    def summary_source_value(state: SummaryState) -> str:
+        """The condensed notes, the digest or the conversation (or its handle)."""
+        return (
+            state.get("condensed_conversation")
+            or state.get("conversation_digest")
+            or state["conversation"]
+        )
+
+    def summary_source(state: SummaryState) -> str:
+        return resolve_text(blob_store, summary_source_value(state))
+
+    async def asummary_source(state: SummaryState) -> str:
+        return await aresolve_text(blob_store, summary_source_value(state))
 
     # Create dynamic summary nodes
     def make_summary_node(index):
-        def summary_node(state: SummaryState) -> dict:
-            if summary_disabled:
-                return {
-                    state_key: [
-                        f"[{summary_type.capitalize()} summary {index} is disabled]"
-                    ]
+        def disabled_update() -> dict:
+            return {
+                state_key: {
+                    index: f"[{summary_type.capitalize()} summary {index} is disabled]"
                 }
-            summary = generate_summary_with_agent(agent, state["conversation"])
-            return {state_key: [summary]}
+            }
+
+        def summary_agent(config: RunnableConfig) -> UsageRecorder:
+            return recorded_agent(
+                agent,
+                "summary",
+                model,
+                system_prompt,
+                config,
+                node=f"{summary_type}_{index}",
+                candidate_index=index,
+                backup=summary_backup,
+            )
+
+        def dropped_update(recorder: UsageRecorder) -> dict:
+            return {
+                "dropped_candidates": [f"{summary_type}_{index}"],
+                "llm_usage": recorder.records,
+            }
+
+        def summary_node(state: SummaryState, config: RunnableConfig) -> dict:
+            if summary_disabled:
+                return disabled_update()
+            recorder = summary_agent(config)
+            try:
+                summary = call_with_deadline(
+                    lambda: generate_summary_with_agent(
+                        recorder, summary_source(state), cache_prefix=cache_prefix
+                    ),
+                    run_deadline_at(state, config),
+                )
+            except DeadlineExceeded:
+                return dropped_update(recorder)
+            return {
+                state_key: {index: put_text(blob_store, summary)},
+                "llm_usage": recorder.records,
+            }
+
+        async def async_summary_node(
+            state: SummaryState, config: RunnableConfig
+        ) -> dict:
+            if summary_disabled:
+                return disabled_update()
+            recorder = summary_agent(config)
+            source = await asummary_source(state)
+            try:
+                summary = await acall_with_deadline(
+                    agenerate_summary_with_agent(
+                        recorder, source, cache_prefix=cache_prefix
+                    ),
+                    run_deadline_at(state, config),
+                )
+            except DeadlineExceeded:
+                return dropped_update(recorder)
+            return {
+                state_key: {index: await aput_text(blob_store, summary)},
+                "llm_usage": recorder.records,
+            }
 
-        return summary_node
+        return async_summary_node if use_async else summary_node
 
     def wait_for_all_summaries_node(state: SummaryState) -> dict:
         return {}
 
+    def stored_summaries(state: SummaryState) -> list[str]:
+        return [
+            resolve_text(blob_store, summary)
+            for summary in ordered_summaries(state.get(state_key))
+        ]
+
+    async def astored_summaries(state: SummaryState) -> list[str]:
+        return [
+            await aresolve_text(blob_store, summary)
+            for summary in ordered_summaries(state.get(state_key))
+        ]
+
     # Create evaluation node
-    def evaluation_node(state: SummaryState) -> dict:
-        summaries = state.get(state_key, [])
-        best_idx, reasoning = evaluate_summaries(
-            evaluation_agent=evaluation_agent,
+    def evaluation_update(
+        state: SummaryState, result: tuple, recorder: UsageRecorder
+    ) -> dict:
+        # The evaluators number the summaries by position, which differs from
+        # the candidate index when a candidate was dropped
+        best_idx, reasoning = to_candidate_index(
+            result, sorted(state.get(state_key) or {})
+        )
+        return {
+            f"{summary_type}_best_idx": best_idx,
+            f"{summary_type}_best_reasoning": reasoning,
+            "llm_usage": recorder.records,
+        }
+
+    def recorded_evaluation_agent(config: RunnableConfig) -> UsageRecorder:
+        return recorded_agent(
+            evaluation_agent,
+            "evaluation",
+            evaluation_model,
+            EVALUATION_PROMPT,
+            config,
+            node=f"{summary_type}_evaluation",
+        )
+
+    def evaluation_node(state: SummaryState, config: RunnableConfig) -> dict:
+        summaries = stored_summaries(state)
+        recorder = recorded_evaluation_agent(config)
+        result = evaluate(
+            evaluation_agent=recorder,
             summaries=summaries,
             summary_type=summary_type,
             eval_disabled=eval_disabled,
+            dedup_threshold=eval_dedup_threshold,
+            **evaluate_options,
         )
+        return evaluation_update(state, result, recorder)
+
+    async def async_evaluation_node(
+        state: SummaryState, config: RunnableConfig
+    ) -> dict:
+        summaries = await astored_summaries(state)
+        recorder = recorded_evaluation_agent(config)
+        result = await aevaluate(
+            evaluation_agent=recorder,
+            summaries=summaries,
+            summary_type=summary_type,
+            eval_disabled=eval_disabled,
+            dedup_threshold=eval_dedup_threshold,
+            **evaluate_options,
+        )
+        return evaluation_update(state, result, recorder)
+
+    # Streaming evaluation: the candidates and their comparisons run in one
+    # node, since the nodes of a fan-out only hand over their updates together
+    candidate_nodes = [
+        timed_node(f"{summary_type}_{i}", make_summary_node(i))
+        for i in range(num_iterations)
+    ]
+
+    def merge_candidate_updates(updates: dict[int, dict]) -> dict:
+        """Merge the updates of several candidates, in candidate order."""
+        merged: dict = {state_key: {}, "llm_usage": [], "node_timings": []}
+        for index in sorted(updates):
+            for key, value in updates[index].items():
+                if key == state_key:
+                    merged[key].update(value)
+                else:
+                    merged.setdefault(key, []).extend(value)
+        return merged
+
+    def streaming_update(
+        updates: dict[int, dict],
+        king: KingOfTheHill,
+        recorder: UsageRecorder,
+        evaluation_started: tuple[float, float] | None,
+    ) -> dict:
+        """Merge the candidate updates (in candidate order) with the verdict."""
+        merged = merge_candidate_updates(updates)
+        finished = [i for i in sorted(updates) if state_key in updates[i]]
+        best_idx, reasoning = king.result(finished)
+        merged["llm_usage"] += recorder.records
+        if evaluation_started is not None:
+            merged["node_timings"].append(
+                node_timing(f"{summary_type}_evaluation", *evaluation_started)
+            )
         return {
+            **merged,
             f"{summary_type}_best_idx": best_idx,
             f"{summary_type}_best_reasoning": reasoning,
         }
 
+    def streaming_king(config: RunnableConfig) -> tuple[KingOfTheHill, UsageRecorder]:
+        recorder = recorded_evaluation_agent(config)
+        king = KingOfTheHill(
+            recorder, summary_type, eval_disabled, dedup_threshold=eval_dedup_threshold
+        )
+        return king, recorder
+
+    def streaming_candidates_node(state: SummaryState, config: RunnableConfig) -> dict:
+        king, recorder = streaming_king(config)
+        updates: dict[int, dict] = {}
+        evaluation_started = None
+
+        def arrived(index: int, update: dict) -> None:
+            nonlocal evaluation_started
+            updates[index] = update
+            if state_key in update:
+                evaluation_started = evaluation_started or (
+                    time.time(),
+                    time.perf_counter(),
+                )
+                king.challenge(
+                    index, resolve_text(blob_store, update[state_key][index])
+                )
+
+        pending = list(range(num_iterations))
+        if warm_prompt_cache:
+            pending.remove(0)
+            arrived(0, candidate_nodes[0](state, config))
+        with ThreadPoolExecutor(max_workers=max(len(pending), 1)) as pool:
+            futures = {
+                pool.submit(
+                    contextvars.copy_context().run, candidate_nodes[i], state, config
+                ): i
+                for i in pending
+            }
+            for future in as_completed(futures):
+                arrived(futures[future], future.result())
+        return streaming_update(updates, king, recorder, evaluation_started)
+
+    async def async_streaming_candidates_node(
+        state: SummaryState, config: RunnableConfig
+    ) -> dict:
+        king, recorder = streaming_king(config)
+
+        async def run_candidate(index: int) -> tuple[int, dict]:
+            return index, await candidate_nodes[index](state, config)
+
+        updates: dict[int, dict] = {}
+        evaluation_started = None
+
+        async def arrived(index: int, update: dict) -> None:
+            nonlocal evaluation_started
+            updates[index] = update
+            if state_key in update:
+                evaluation_started = evaluation_started or (
+                    time.time(),
+                    time.perf_counter(),
+                )
+                await king.achallenge(
+                    index, await aresolve_text(blob_store, update[state_key][index])
+                )
+
+        pending = list(range(num_iterations))
+        if warm_prompt_cache:
+            pending.remove(0)
+            await arrived(*await run_candidate(0))
+        for arrival in asyncio.as_completed([run_candidate(i) for i in pending]):
+            await arrived(*await arrival)
+        return streaming_update(updates, king, recorder, evaluation_started)
+
+    # Single-call candidates: one request with n completions, falling back to
+    # the candidate nodes for whatever the call does not return
+    def candidate_caches(config: RunnableConfig) -> dict[int, CachedAgent]:
+        if response_cache is None:
+            return {}
+        return {
+            i: cached_agent(None, "summary", model, system_prompt, config, i)
+            for i in range(num_iterations)
+        }
+
+    def multi_choice_agent(n: int) -> UsageRecorder:
+        return UsageRecorder(
+            with_rate_limit(
+                MultiChoiceAgent(model, system_prompt, n),
+                model,
+                system_prompt,
+                expected_output_tokens=RATE_LIMIT_EXPECTED_OUTPUT_TOKENS * n,
+            ),
+            node=f"{summary_type}_candidates",
+            model_slug=describe_model(model)[0],
+        )
+
+    def multi_choice_updates(
+        missing: list[int],
+        result: dict | None,
+        recorder: UsageRecorder,
+        agent_input: dict,
+        caches: dict[int, CachedAgent],
+    ) -> dict[int, dict]:
+        """Candidate updates from the choices of the call (usage on the first)."""
+        choices = result["choices"] if result is not None else []
+        if result is not None and len(choices) < len(missing):
+            logger.warning(
+                "%s: %d of %d candidates generated in one call, "
+                "generating the others one by one",
+                summary_type,
+                len(choices),
+                len(missing),
+            )
+        updates = {}
+        for index, choice in zip(missing, choices):
+            if index in caches:
+                caches[index].store(agent_input, choice)
+            updates[index] = {state_key: {index: put_text(blob_store, choice)}}
+        if updates:
+            updates[missing[0]]["llm_usage"] = recorder.records
+        return updates
+
+    def multi_choice_dropped(missing: list[int], recorder: UsageRecorder) -> dict:
+        return {
+            missing[0]: {
+                "dropped_candidates": [f"{summary_type}_{i}" for i in missing],
+                "llm_usage": recorder.records,
+            }
+        }
+
+    def multi_choice_candidates_node(
+        state: SummaryState, config: RunnableConfig
+    ) -> dict:
+        if summary_disabled:
+            return merge_candidate_updates(
+                {i: candidate_nodes[i](state, config) for i in range(num_iterations)}
+            )
+        agent_input = build_summary_input(summary_source(state), cache_prefix)
+        caches = candidate_caches(config)
+        cached = {i: cache.lookup(agent_input) for i, cache in caches.items()}
+        updates = {
+            i: {state_key: {i: put_text(blob_store, extract_summary_text(result))}}
+            for i, result in cached.items()
+            if result is not None
+        }
+        missing = [i for i in range(num_iterations) if i not in updates]
+        if missing:
+            recorder = multi_choice_agent(len(missing))
+            try:
+                result = call_with_deadline(
+                    lambda: recorder.invoke(agent_input),
+                    run_deadline_at(state, config),
+                )
+            except DeadlineExceeded:
+                return merge_candidate_updates(
+                    {**updates, **multi_choice_dropped(missing, recorder)}
+                )
+            except Exception:  # Any provider error: one call per candidate instead
+                logger.exception(
+                    "%s: single-call generation failed, falling back", summary_type
+                )
+                result = None
+            updates |= multi_choice_updates(
+                missing, result, recorder, agent_input, caches
+            )
+        fallback = [i for i in range(num_iterations) if i not in updates]
+        with ThreadPoolExecutor(max_workers=max(len(fallback), 1)) as pool:
+            futures = {
+                i: pool.submit(
+                    contextvars.copy_context().run, candidate_nodes[i], state, config
+                )
+                for i in fallback
+            }
+            updates |= {i: future.result() for i, future in futures.items()}
+        return merge_candidate_updates(updates)
+
+    async def async_multi_choice_candidates_node(
+        state: SummaryState, config: RunnableConfig
+    ) -> dict:
+        if summary_disabled:
+            updates = await asyncio.gather(
+                *(candidate_nodes[i](state, config) for i in range(num_iterations))
+            )
+            return merge_candidate_updates(dict(enumerate(updates)))
+        agent_input = build_summary_input(await asummary_source(state), cache_prefix)
+        caches = candidate_caches(config)
+        cached = {
+            i: await asyncio.to_thread(cache.lookup, agent_input)
+            for i, cache in caches.items()
+        }
+        updates = {
+            i: {state_key: {i: put_text(blob_store, extract_summary_text(result))}}
+            for i, result in cached.items()
+            if result is not None
+        }
+        missing = [i for i in range(num_iterations) if i not in updates]
+        if missing:
+            recorder = multi_choice_agent(len(missing))
+            try:
+                result = await acall_with_deadline(
+                    recorder.ainvoke(agent_input), run_deadline_at(state, config)
+                )
+            except DeadlineExceeded:
+                return merge_candidate_updates(
+                    {**updates, **multi_choice_dropped(missing, recorder)}
+                )
+            except Exception:  # Any provider error: one call per candidate instead
+                logger.exception(
+                    "%s: single-call generation failed, falling back", summary_type
+                )
+                result = None
+            updates |= multi_choice_updates(
+                missing, result, recorder, agent_input, caches
+            )
+        fallback = [i for i in range(num_iterations) if i not in updates]
+        fallback_updates = await asyncio.gather(
+            *(candidate_nodes[i](state, config) for i in fallback)
+        )
+        updates |= dict(zip(fallback, fallback_updates))
+        return merge_candidate_updates(updates)
+
     # Build the subgraph
-    subgraph = StateGraph(SummaryState)
+    subgraph = StateGraph(SummaryState, input_schema=SummaryInput)
 
-    # Add all summary nodes
-    for i in range(num_iterations):
-        node_name = f"{summary_type}_{i}"
-        subgraph.add_node(node_name, make_summary_node(i))
-        subgraph.add_edge(START, node_name)
-        subgraph.add_edge(node_name, "wait_for_all_summaries")
+    if eval_mode == "streaming":
+        subgraph.add_node(
+            "candidates",
+            timed_node(
+                f"{summary_type}_candidates",
+                async_streaming_candidates_node
+                if use_async
+                else streaming_candidates_node,
+            ),
+        )
+        subgraph.add_edge(START, "candidates")
+        subgraph.add_edge("candidates", END)
+        return subgraph.compile()
+
+    if multi_choice and num_iterations > 1 and supports_multiple_choices(model):
+        subgraph.add_node(
+            "candidates",
+            timed_node(
+                f"{summary_type}_candidates",
+                async_multi_choice_candidates_node
+                if use_async
+                else multi_choice_candidates_node,
+            ),
+        )
+        subgraph.add_edge(START, "candidates")
+        subgraph.add_edge("candidates", "wait_for_all_summaries")
+    else:
+        # Add all summary nodes (after the first one when it warms the cache)
+        first_node = f"{summary_type}_0"
+        for i in range(num_iterations):
+            node_name = f"{summary_type}_{i}"
+            subgraph.add_node(node_name, candidate_nodes[i])
+            if warm_prompt_cache and i > 0:
+                subgraph.add_edge(first_node, node_name)
+            else:
+                subgraph.add_edge(START, node_name)
+            if not (warm_prompt_cache and i == 0):
+                subgraph.add_edge(node_name, "wait_for_all_summaries")
 
     subgraph.add_node("wait_for_all_summaries", wait_for_all_summaries_node)
     subgraph.add_edge("wait_for_all_summaries", "evaluation")
 
-    subgraph.add_node("evaluation", evaluation_node)
+    subgraph.add_node(
+        "evaluation",
+        timed_node(
+            f"{summary_type}_evaluation",
+            async_evaluation_node if use_async else evaluation_node,
+        ),
+    )
     subgraph.add_edge("evaluation", END)
 
     return subgraph.compile()
 
 
-def build_graph():
-    def load_conversation_node(state: SummaryState) -> dict:
-        input_filename = state.get("input_filename") or DEFAULT_INPUT_FILENAME
+def build_graph(
+    checkpointer=None,
+    models: Mapping | None = None,
+    num_emotional_iterations: int = NUM_EMOTIONAL_ITERATIONS,
+    num_technical_iterations: int = NUM_TECHNICAL_ITERATIONS,
+    use_async: bool = ASYNC_NODES,
+    response_cache_enabled: bool = not RESPONSE_CACHE_DISABLED,
+    rate_limits: Mapping[str, RateLimit] | None = RATE_LIMITS,
+    output_base_folder: Path | None = None,
+    hedging: bool = HEDGING_ENABLED,
+    eval_mode: str = EVAL_MODE,
+    multi_choice: bool = MULTI_CHOICE_GENERATION,
+    conversation_digest: str = CONVERSATION_DIGEST,
+    blob_state: bool = BLOB_STATE_ENABLED,
+    config_template: str = CONFIG_TEMPLATE,
+    emotional_disabled: bool = EMOTIONAL_DISABLED,
+    technical_disabled: bool = TECHNICAL_DISABLED,
+    eval_disabled: bool = EVAL_DISABLED,
+    chunked_mode: bool = CHUNKED_MODE_ENABLED,
+    chunk_tokenizer: str = CHUNKED_MODE_TOKENIZER,
+    prompt_cache_warm_up: bool = PROMPT_CACHE_WARM_UP,
+):
+    """Build the main W&L graph.
+
+    The defaults come from config.py; the arguments let benchmarks and tests
+    build variants of the graph.
+
+    Args:
+        checkpointer: Persist a checkpoint after every step (see runs.py),
+            making failed or interrupted runs resumable by thread id. The
+            LangGraph server provides its own, so the module-level graph has none.
+        models: Role -> chat model (the models of config_template when None)
+        num_emotional_iterations: Number of emotional summary candidates
+        num_technical_iterations: Number of technical summary candidates
+        use_async: Build async nodes (agent.ainvoke) instead of sync ones
+        response_cache_enabled: Serve responses from the on-disk response cache
+        rate_limits: Provider -> limit; calls to other providers are not limited
+        output_base_folder: Write the outputs under this folder instead of
+            OUTPUT_FILE_PATH_OBSIDIAN_BASE
+        hedging: Hedge slow summary calls to a backup model (see hedging.py)
+        eval_mode: "single", "tournament" or "streaming" evaluation of the
+            summaries (see build_summary_subgraph)
+        multi_choice: Generate each type's candidates in one call with n
+            completions where the model supports it
+        conversation_digest: "off", "normalize" or "model": digest the
+            conversation once for all the candidates (see nodes/digest.py).
+            The digest model is models["digest"], or DIGEST_MODEL.
+        blob_state: Keep the conversation and the summaries in the blob store,
+            with only their handles in the state (see blobs.py)
+        config_template: Key of CONFIG_TEMPLATES: its models, summary prompts
+            and default input file
+        emotional_disabled: Skip the emotional summaries
+        technical_disabled: Skip the technical summaries
+        eval_disabled: Use the first candidate instead of evaluating them
+        chunked_mode: Condense the conversation into chunk notes, once for both
+            summary types, when it does not fit a summary model's context
+            window. The chunk model is models["chunk"], or the technical model.
+        chunk_tokenizer: chonkie tokenizer used to split long conversations
+        prompt_cache_warm_up: Write the Anthropic prompt cache with the first
+            candidate before starting the others (see build_summary_subgraph)
+    """
+    if config_template not in CONFIG_TEMPLATES:
+        raise ValueError(f"Unknown config template: {config_template}")
+    models = template_models(config_template) if models is None else models
+    emotional_prompt, technical_prompt = summary_prompts(
+        CONFIG_TEMPLATES[config_template]["wip"]
+    )
+    default_input = default_input_filename(config_template)
+    if conversation_digest not in DIGEST_MODES:
+        raise ValueError(f"Unknown conversation digest mode: {conversation_digest}")
+
+    def output_base(input_filename: str) -> Path:
+        if output_base_folder is None:
+            return get_output_base_folder(input_filename)
+        return output_base_folder / input_key(input_filename)
+
+    blobs = BlobStore(BLOB_STORE_DIR, BLOB_STORE_MAX_AGE_S) if blob_state else None
+
+    def load_conversation_node(state: SummaryState, config: RunnableConfig) -> dict:
+        input_filename = state.get("input_filename") or default_input
         input_file_path = get_input_file_path(input_filename)
+        deadline_s = run_deadline_s(config, RUN_DEADLINE_S)
+        if blobs is not None:
+            blobs.evict()
+        if response_cache is not None:
+            response_cache.evict()
+        text = state.get("input_text") or read_file(input_file_path)
         return {
-            "conversation": read_file(input_file_path),
+            "conversation": put_text(blobs, text),
             "input_filename": input_filename,
-            "emotional_summaries": [],
-            "technical_summaries": [],
+            "input_text": "",
+            "emotional_summaries": {},
+            "technical_summaries": {},
+            "deadline_s": deadline_s,
+            "run_started_at": time.time(),
+            "dropped_candidates": [],
+            "conversation_digest": "",
+            "condensed_conversation": "",
+            "digest_stats": {},
         }
 
-    def write_output_node(state: SummaryState) -> dict:
+    response_cache = (
+        None
+        if not response_cache_enabled
+        else ResponseCache(
+            RESPONSE_CACHE_DIR,
+            max_bytes=RESPONSE_CACHE_MAX_BYTES,
+            max_age_s=RESPONSE_CACHE_MAX_AGE_S,
+        )
+    )
+
+    # Conversation digest shared by every candidate (when enabled)
+    digest_model = None
+    if conversation_digest == "model":
+        digest_model = (
+            models["digest"] if "digest" in models else get_model_by_name(DIGEST_MODEL)
+        )
+    candidate_calls = (0 if emotional_disabled else num_emotional_iterations) + (
+        0 if technical_disabled else num_technical_iterations
+    )
+
+    def digest_agent(config: RunnableConfig, normalized: str) -> UsageRecorder | None:
+        """The agent condensing the normalized conversation, unless it does not
+        fit the digest model's context window (with an answer as long)."""
+        context_window = context_window_of(digest_model)
+        expected_output_tokens = estimate_tokens(normalized)
+        if (
+            context_window
+            and estimate_tokens(DIGEST_PROMPT) + 2 * expected_output_tokens
+            > context_window
+        ):
+            return None
+        agent_ = rate_limited_agent(
+            single_call_agent(digest_model, DIGEST_PROMPT),
+            digest_model,
+            DIGEST_PROMPT,
+            rate_limits,
+            expected_output_tokens=expected_output_tokens,
+        )
+        agent_ = response_cached_agent(
+            agent_, response_cache, "digest", digest_model, DIGEST_PROMPT, config
+        )
+        return UsageRecorder(
+            agent_,
+            node="conversation_digest",
+            model_slug=describe_model(digest_model)[0],
+        )
+
+    def digest_update(
+        conversation: str,
+        normalized: str,
+        result: dict | None,
+        recorder: UsageRecorder | None,
+    ) -> dict:
+        digest = choose_digest(normalized, result)
+        return {
+            "conversation_digest": put_text(blobs, digest),
+            "digest_stats": digest_stats(
+                conversation,
+                normalized,
+                digest,
+                mode=conversation_digest,
+                candidate_calls=candidate_calls,
+            ),
+            "llm_usage": recorder.records if recorder is not None else [],
+        }
+
+    def conversation_digest_node(state: SummaryState, config: RunnableConfig) -> dict:
+        conversation = resolve_text(blobs, state["conversation"])
+        normalized = normalize_transcript(conversation)
+        recorder = digest_agent(config, normalized) if digest_model else None
+        result = None
+        if recorder is not None:
+            try:
+                result = recorder.invoke(build_digest_input(normalized))
+            except Exception:
+                logger.warning(
+                    "Conversation digest failed, using the normalized conversation",
+                    exc_info=True,
+                )
+        return digest_update(conversation, normalized, result, recorder)
+
+    async def async_conversation_digest_node(
+        state: SummaryState, config: RunnableConfig
+    ) -> dict:
+        conversation = await aresolve_text(blobs, state["conversation"])
+        normalized = await asyncio.to_thread(normalize_transcript, conversation)
+        recorder = digest_agent(config, normalized) if digest_model else None
+        result = None
+        if recorder is not None:
+            try:
+                result = await recorder.ainvoke(build_digest_input(normalized))
+            except Exception:
+                logger.warning(
+                    "Conversation digest failed, using the normalized conversation",
+                    exc_info=True,
+                )
+        return digest_update(conversation, normalized, result, recorder)
+
+    # Map step for conversations too long for the summary models, run once
+    # before the fan-out so both summary types read the same notes
+    summary_models = [
+        (models[summary_type], prompt)
+        for summary_type, prompt, disabled in (
+            ("emotional", emotional_prompt, emotional_disabled),
+            ("technical", technical_prompt, technical_disabled),
+        )
+        if not disabled
+    ]
+    token_budgets = [
+        conversation_token_budget(
+            context_window,
+            prompt,
+            reserved_output_tokens=RATE_LIMIT_EXPECTED_OUTPUT_TOKENS,
+            context_fraction=CHUNKED_MODE_CONTEXT_FRACTION,
+        )
+        for model_, prompt in summary_models
+        if (context_window := context_window_of(model_))
+    ]
+    token_budget = min(token_budgets) if chunked_mode and token_budgets else None
+    chunk_model = None
+    if token_budget is not None:
+        chunk_tokens = chunk_tokens_for(
+            token_budget, CHUNKED_MODE_CHUNK_TOKENS, CHUNKED_MODE_CHUNK_OVERLAP
+        )
+        # The technical model, or the emotional one when technical is disabled
+        chunk_model = models["chunk"] if "chunk" in models else summary_models[-1][0]
+        chunk_agent = rate_limited_agent(
+            single_call_agent(chunk_model, CHUNK_NOTES_PROMPT),
+            chunk_model,
+            CHUNK_NOTES_PROMPT,
+            rate_limits,
+        )
+
+    def chunks_to_condense(state: SummaryState) -> list[str] | None:
+        conversation = resolve_text(
+            blobs, state.get("conversation_digest") or state["conversation"]
+        )
+        if not needs_chunking(conversation, token_budget):
+            return None
+        return split_conversation(
+            conversation,
+            chunk_tokens=chunk_tokens,
+            chunk_overlap=CHUNKED_MODE_CHUNK_OVERLAP,
+            tokenizer=chunk_tokenizer,
+        )
+
+    def chunk_agents(config: RunnableConfig):
+        recorders = []
+
+        def make_agent(chunk_index: int) -> UsageRecorder:
+            agent_ = response_cached_agent(
+                chunk_agent,
+                response_cache,
+                "chunk",
+                chunk_model,
+                CHUNK_NOTES_PROMPT,
+                config,
+                candidate_index=chunk_index,
+            )
+            recorder = UsageRecorder(
+                agent_,
+                node="condense_conversation",
+                model_slug=describe_model(chunk_model)[0],
+            )
+            recorders.append(recorder)
+            return recorder
+
+        return make_agent, recorders
+
+    def condensed_update(notes: list[str], recorders: list[UsageRecorder]) -> dict:
+        return {
+            "condensed_conversation": put_text(
+                blobs, format_condensed_conversation(notes)
+            ),
+            "llm_usage": [record for r in recorders for record in r.records],
+        }
+
+    def condense_conversation_node(state: SummaryState, config: RunnableConfig) -> dict:
+        chunks = chunks_to_condense(state)
+        if chunks is None:
+            return {}
+        make_agent, recorders = chunk_agents(config)
+        notes = summarize_chunks(make_agent, chunks, CHUNKED_MODE_MAX_PARALLEL)
+        return condensed_update(notes, recorders)
+
+    async def async_condense_conversation_node(
+        state: SummaryState, config: RunnableConfig
+    ) -> dict:
+        chunks = await asyncio.to_thread(chunks_to_condense, state)
+        if chunks is None:
+            return {}
+        make_agent, recorders = chunk_agents(config)
+        notes = await asummarize_chunks(make_agent, chunks, CHUNKED_MODE_MAX_PARALLEL)
+        return condensed_update(notes, recorders)
+
+    output_sink = OutputSink(max_workers=OUTPUT_WRITE_MAX_WORKERS)
+
+    def output_arguments(state: SummaryState) -> dict:
         from datetime import datetime
-        from pathlib import Path
 
-        # Get filename without extension
-        input_filename = state.get("input_filename") or DEFAULT_INPUT_FILENAME
-        filename_without_ext = Path(input_filename).stem
+        input_filename = state.get("input_filename") or default_input
 
         # Generate datetime for frontmatter and filename timestamp
         now = datetime.now()
         timestamp = now.strftime("%Y%m%d-%H%M%S")
+        # Runs of other templates (e.g. a sweep's) may start in the same second
+        if config_template != CONFIG_TEMPLATE:
+            timestamp = f"{timestamp}-{config_template}"
 
-        output_folder = (
-            OUTPUT_FILE_PATH_OBSIDIAN_BASE / filename_without_ext / timestamp
-        )
-        output_folder.mkdir(parents=True, exist_ok=True)
+        # Summary files are named after the candidate index, like the
+        # dropped candidates and the best indices
+        return {
+            "output_folder": output_base(input_filename) / timestamp,
+            "input_filename": input_filename,
+            "config_template": config_template,
+            "now": now,
+            "emotional_summaries": {
+                index: resolve_text(blobs, summary)
+                for index, summary in (state.get("emotional_summaries") or {}).items()
+            },
+            "technical_summaries": {
+                index: resolve_text(blobs, summary)
+                for index, summary in (state.get("technical_summaries") or {}).items()
+            },
+            "emotional_best_idx": state.get("emotional_best_idx"),
+            "emotional_best_reasoning": state.get("emotional_best_reasoning", "N/A"),
+            "technical_best_idx": state.get("technical_best_idx"),
+            "technical_best_reasoning": state.get("technical_best_reasoning", "N/A"),
+            "llm_usage": state.get("llm_usage", []),
+            "best_result_only": OUTPUT_BEST_RESULT_ONLY,
+            "node_timings": state.get("node_timings", []),
+            "dropped_candidates": state.get("dropped_candidates", []),
+            "digest_stats": state.get("digest_stats"),
+        }
 
-        # Write all output files using the centralized function
-        write_all_output_files(
-            output_folder=output_folder,
-            input_filename=input_filename,
-            config_template=CONFIG_TEMPLATE,
-            now=now,
-            emotional_summaries=state.get("emotional_summaries", []),
-            technical_summaries=state.get("technical_summaries", []),
-            emotional_best_idx=state.get("emotional_best_idx"),
-            emotional_best_reasoning=state.get("emotional_best_reasoning", "N/A"),
-            technical_best_idx=state.get("technical_best_idx"),
-            technical_best_reasoning=state.get("technical_best_reasoning", "N/A"),
+    def output_metrics(arguments: dict, started_at: float, started: float):
+        """Timing of write_output itself, and metrics.json including it."""
+        timing = node_timing("write_output", started_at, started)
+        metrics_file = render_metrics_file(
+            output_folder=arguments["output_folder"],
+            input_filename=arguments["input_filename"],
+            config_template=arguments["config_template"],
+            now=arguments["now"],
+            node_timings=[*arguments["node_timings"], timing],
+            llm_usage=arguments["llm_usage"],
+            dropped_candidates=arguments["dropped_candidates"],
+            digest_stats=arguments["digest_stats"],
         )
+        return {"node_timings": [timing]}, metrics_file
 
+    def chat_update(state: SummaryState) -> dict:
         # For chat output, only show evaluation results
         chat_output = format_evaluation_chat_output(
             emotional_best_idx=state.get("emotional_best_idx"),
@@ -182,47 +1243,227 @@ def build_graph():
             else {}
         )
 
+    def traced_output_sink(config: RunnableConfig) -> OutputSink:
+        """The output sink, recording file spans when the run is traced."""
+        if not TRACING_ENABLED:
+            return output_sink
+        from src.agents.walkandlearn_summary.tracing import GraphTracer
+
+        traced = GraphTracer.from_config(config)
+        if traced is None:
+            return output_sink
+        tracer, run_id = traced
+        return output_sink.with_tracing(tracer.tracer, tracer.context_for(run_id))
+
+    def write_output_node(state: SummaryState, config: RunnableConfig) -> dict:
+        started_at, started = time.time(), time.perf_counter()
+        sink = traced_output_sink(config)
+        arguments = output_arguments(state)
+        write_all_output_files(**arguments, sink=sink)
+        timing_update, metrics_file = output_metrics(arguments, started_at, started)
+        sink.write_all(metrics_file)
+        return {**chat_update(state), **timing_update}
+
+    async def async_write_output_node(
+        state: SummaryState, config: RunnableConfig
+    ) -> dict:
+        started_at, started = time.time(), time.perf_counter()
+        sink = traced_output_sink(config)
+        # Resolving the summaries may read them from the blob store
+        arguments = await asyncio.to_thread(output_arguments, state)
+        await awrite_all_output_files(**arguments, sink=sink)
+        timing_update, metrics_file = output_metrics(arguments, started_at, started)
+        await sink.awrite_all(metrics_file)
+        return {**chat_update(state), **timing_update}
+
     # Build the main graph
     graph_builder = StateGraph(SummaryState)
 
     # Add load conversation node
-    graph_builder.add_node("load_conversation", load_conversation_node)
+    graph_builder.add_node(
+        "load_conversation", timed_node("load_conversation", load_conversation_node)
+    )
 
     # Add subgraphs
     emotional_subgraph = build_summary_subgraph(
         summary_type="emotional",
-        model=MODELS["emotional"],
-        system_prompt=EMOTIONAL_SUMMARY_PROMPT,
-        num_iterations=NUM_EMOTIONAL_ITERATIONS,
-        summary_disabled=EMOTIONAL_DISABLED,
-        eval_disabled=EVAL_DISABLED,
-        evaluation_model=MODELS["evaluation"],
+        model=models["emotional"],
+        system_prompt=emotional_prompt,
+        num_iterations=num_emotional_iterations,
+        summary_disabled=emotional_disabled,
+        eval_disabled=eval_disabled,
+        evaluation_model=models["evaluation"],
+        use_async=use_async,
+        response_cache=response_cache,
+        rate_limits=rate_limits,
+        blob_store=blobs,
+        hedging=hedging,
+        eval_mode=eval_mode,
+        multi_choice=multi_choice,
+        prompt_cache_warm_up=prompt_cache_warm_up,
     )
     technical_subgraph = build_summary_subgraph(
         summary_type="technical",
-        model=MODELS["technical"],
-        system_prompt=TECHNICAL_SUMMARY_PROMPT,
-        num_iterations=NUM_TECHNICAL_ITERATIONS,
-        summary_disabled=TECHNICAL_DISABLED,
-        eval_disabled=EVAL_DISABLED,
-        evaluation_model=MODELS["evaluation"],
+        model=models["technical"],
+        system_prompt=technical_prompt,
+        num_iterations=num_technical_iterations,
+        summary_disabled=technical_disabled,
+        eval_disabled=eval_disabled,
+        evaluation_model=models["evaluation"],
+        use_async=use_async,
+        response_cache=response_cache,
+        rate_limits=rate_limits,
+        blob_store=blobs,
+        hedging=hedging,
+        eval_mode=eval_mode,
+        multi_choice=multi_choice,
+        prompt_cache_warm_up=prompt_cache_warm_up,
     )
 
     graph_builder.add_node("emotional_summaries", emotional_subgraph)
     graph_builder.add_node("technical_summaries", technical_subgraph)
 
     # Add write output node
-    graph_builder.add_node("write_output", write_output_node)
+    graph_builder.add_node(
+        "write_output", async_write_output_node if use_async else write_output_node
+    )
 
     # Connect the graph
     graph_builder.add_edge(START, "load_conversation")
-    graph_builder.add_edge("load_conversation", "emotional_summaries")
-    graph_builder.add_edge("load_conversation", "technical_summaries")
+    summaries_source = "load_conversation"
+    if conversation_digest != "off":
+        graph_builder.add_node(
+            "conversation_digest",
+            timed_node(
+                "conversation_digest",
+                async_conversation_digest_node
+                if use_async
+                else conversation_digest_node,
+            ),
+        )
+        graph_builder.add_edge("load_conversation", "conversation_digest")
+        summaries_source = "conversation_digest"
+    if token_budget is not None:
+        graph_builder.add_node(
+            "condense_conversation",
+            timed_node(
+                "condense_conversation",
+                async_condense_conversation_node
+                if use_async
+                else condense_conversation_node,
+            ),
+        )
+        graph_builder.add_edge(summaries_source, "condense_conversation")
+        summaries_source = "condense_conversation"
+    graph_builder.add_edge(summaries_source, "emotional_summaries")
+    graph_builder.add_edge(summaries_source, "technical_summaries")
     graph_builder.add_edge("emotional_summaries", "write_output")
     graph_builder.add_edge("technical_summaries", "write_output")
     graph_builder.add_edge("write_output", END)
 
-    return graph_builder.compile()
+    compiled = graph_builder.compile(checkpointer=checkpointer)
+    if not TRACING_ENABLED:
+        return compiled
+
+    # Imported here: OpenTelemetry is only loaded when tracing is on
+    from src.agents.walkandlearn_summary.tracing import (
+        GraphTracer,
+        get_tracer_provider,
+    )
+
+    return compiled.with_config(callbacks=[GraphTracer(get_tracer_provider())])
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+@dataclass(frozen=True)
+class GraphSettings:
+    """The per-run choices that change the compiled graph.
+
+    Runs pick them in their config, e.g. {"configurable": {"template":
+    "main-gpt", "num_emotional_iterations": 5}}; what they leave out comes
+    from config.py.
+    """
+
+    template: str = CONFIG_TEMPLATE
+    num_emotional_iterations: int = NUM_EMOTIONAL_ITERATIONS
+    num_technical_iterations: int = NUM_TECHNICAL_ITERATIONS
+    emotional_disabled: bool = EMOTIONAL_DISABLED
+    technical_disabled: bool = TECHNICAL_DISABLED
+    eval_disabled: bool = EVAL_DISABLED
+
+    @classmethod
+    def from_config(cls, config: RunnableConfig | None) -> "GraphSettings":
+        """Read the settings of a run from its configurable values.
+
+        Raises:
+            ValueError: If the template is unknown or an iteration count is
+                not a positive integer
+        """
+        configurable = (config or {}).get("configurable", {})
+        defaults = cls()
+        settings = cls(
+            template=configurable.get("template") or defaults.template,
+            num_emotional_iterations=int(
+                configurable.get(
+                    "num_emotional_iterations", defaults.num_emotional_iterations
+                )
+            ),
+            num_technical_iterations=int(
+                configurable.get(
+                    "num_technical_iterations", defaults.num_technical_iterations
+                )
+            ),
+            emotional_disabled=_as_bool(
+                configurable.get("emotional_disabled", defaults.emotional_disabled)
+            ),
+            technical_disabled=_as_bool(
+                configurable.get("technical_disabled", defaults.technical_disabled)
+            ),
+            eval_disabled=_as_bool(
+                configurable.get("eval_disabled", defaults.eval_disabled)
+            ),
+        )
+        if settings.template not in CONFIG_TEMPLATES:
+            raise ValueError(f"Unknown config template: {settings.template}")
+        if (
+            min(settings.num_emotional_iterations, settings.num_technical_iterations)
+            < 1
+        ):
+            raise ValueError("The number of summary iterations must be at least 1")
+        return settings
+
+    def configurable(self) -> dict:
+        """The configurable values that select these settings (see from_config)."""
+        return asdict(self)
+
+
+@lru_cache(maxsize=GRAPH_CACHE_SIZE)
+def compiled_graph(settings: GraphSettings):
+    """The compiled graph of some settings, built once per distinct settings.
+
+    The graphs of the last GRAPH_CACHE_SIZE distinct settings are kept. Their
+    chat model clients are shared anyway (see models.py), as are the rate
+    limiters and latency trackers.
+    """
+    return build_graph(
+        config_template=settings.template,
+        num_emotional_iterations=settings.num_emotional_iterations,
+        num_technical_iterations=settings.num_technical_iterations,
+        emotional_disabled=settings.emotional_disabled,
+        technical_disabled=settings.technical_disabled,
+        eval_disabled=settings.eval_disabled,
+    )
+
+
+def make_graph(config: RunnableConfig):
+    """Graph factory of the LangGraph server (see langgraph.json): the graph
+    of the run's template, iterations and disabled flags."""
+    return compiled_graph(GraphSettings.from_config(config))
 
 
-graph = build_graph()
+graph = compiled_graph(GraphSettings())
@@ -0,0 +1,219 @@
+"""Hedged summary requests, bounding the tail latency of the candidates.
+
+A summary call still running after a percentile of the recent latencies of
+its model is sent again to a backup model of the same catalog type (see
+models.backup_model_for). The first response wins and the other request is
+cancelled. Latencies are tracked per model across every run in the process,
+so in batch mode the hedge delay follows the provider's current latency.
+"""
+
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from src.agents.walkandlearn_summary.models import cost_of_call
+from src.agents.walkandlearn_summary.usage import extract_usage
+
+
+class LatencyTracker:
+    """Sliding window of the latencies of one model's calls.
+
+    Args:
+        window: Number of recent latencies kept
+    """
+
+    def __init__(self, window: int = 50):
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency_s: float) -> None:
+        with self._lock:
+            self._latencies.append(latency_s)
+
+    def percentile(self, q: float, min_samples: int = 1) -> float | None:
+        """The q-th (0 < q < 1) percentile, or None with fewer than min_samples.
+
+        Interpolates linearly between the closest recent latencies.
+
+        Raises:
+            ValueError: If q is not between 0 and 1
+        """
+        if not 0 < q < 1:
+            raise ValueError(f"Percentile must be between 0 and 1, got {q}")
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < max(min_samples, 1):
+            return None
+        position = q * (len(latencies) - 1)
+        lower = math.floor(position)
+        upper = min(lower + 1, len(latencies) - 1)
+        return latencies[lower] + (latencies[upper] - latencies[lower]) * (
+            position - lower
+        )
+
+
+_TRACKERS: dict[str, LatencyTracker] = {}
+_TRACKERS_LOCK = threading.Lock()
+
+
+def get_latency_tracker(model_slug: str, window: int = 50) -> LatencyTracker:
+    """Return the process-wide latency tracker of a model."""
+    with _TRACKERS_LOCK:
+        if model_slug not in _TRACKERS:
+            _TRACKERS[model_slug] = LatencyTracker(window)
+        return _TRACKERS[model_slug]
+
+
+class HedgedAgent:
+    """Wraps an agent so slow calls are raced against a backup agent.
+
+    The result of a hedgeable call carries "hedged" (whether the backup request
+    was sent), "hedge_model" (slug of the model that answered) and
+    "hedge_cost_usd": the estimated input cost of the cancelled request, whose
+    partial output is not known.
+
+    Args:
+        primary: The agent to wrap (anything with invoke/ainvoke)
+        backup: Agent of the backup model
+        primary_slug: Slug of the primary agent's model
+        backup_slug: Slug of the backup agent's model
+        tracker: Recent latencies of the primary model
+        percentile: Latency percentile (0 < q < 1) after which to hedge
+        min_samples: Latencies needed before hedging at all
+    """
+
+    def __init__(
+        self,
+        primary,
+        backup,
+        primary_slug: str,
+        backup_slug: str,
+        tracker: LatencyTracker,
+        percentile: float = 0.9,
+        min_samples: int = 10,
+    ):
+        self.primary = primary
+        self.backup = backup
+        self.primary_slug = primary_slug
+        self.backup_slug = backup_slug
+        self.tracker = tracker
+        self.percentile = percentile
+        self.min_samples = min_samples
+
+    def hedge_delay_s(self) -> float | None:
+        """Seconds to wait for the primary before hedging (None: never hedge)."""
+        return self.tracker.percentile(self.percentile, self.min_samples)
+
+    def _result(self, result: dict, from_backup: bool, hedged: bool, started: float):
+        usage = extract_usage(result)
+        if from_backup or not usage["response_cache_hit"]:
+            # When the backup wins, the primary's time so far is a lower bound
+            # of its latency; leaving it out would keep the hedge delay at the
+            # latencies of the calls that did not need a hedge
+            self.tracker.record(time.perf_counter() - started)
+        hedge_cost = 0.0
+        if hedged:
+            # The cancelled request received the same prompt
+            loser_slug = self.primary_slug if from_backup else self.backup_slug
+            hedge_cost = (
+                cost_of_call(loser_slug, usage["input_tokens"], output_tokens=0) or 0.0
+            )
+        return {
+            **result,
+            "hedged": hedged,
+            "hedge_model": self.backup_slug if from_backup else self.primary_slug,
+            "hedge_cost_usd": hedge_cost,
+        }
+
+    def invoke(self, agent_input: dict, *args, **kwargs) -> dict:
+        started = time.perf_counter()
+        delay_s = self.hedge_delay_s()
+        if delay_s is None:
+            result = self.primary.invoke(agent_input, *args, **kwargs)
+            return self._result(
+                result, from_backup=False, hedged=False, started=started
+            )
+
+        # Threads cannot be cancelled: the losing call runs to completion in
+        # the background and its response is dropped.
+        pool = ThreadPoolExecutor(max_workers=2)
+        try:
+
+            def submit(agent) -> Future:
+                context = contextvars.copy_context()
+                return pool.submit(
+                    context.run, agent.invoke, agent_input, *args, **kwargs
+                )
+
+            primary = submit(self.primary)
+            done, _ = wait([primary], timeout=delay_s)
+            if done:
+                return self._result(
+                    primary.result(), from_backup=False, hedged=False, started=started
+                )
+            backup = submit(self.backup)
+            pending = {primary, backup}
+            while True:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                winner = next((f for f in done if f.exception() is None), None)
+                if winner is not None:
+                    for future in pending:
+                        future.cancel()
+                    return self._result(
+                        winner.result(),
+                        from_backup=winner is backup,
+                        hedged=True,
+                        started=started,
+                    )
+                if not pending:
+                    # Both failed: surface the primary's error
+                    return primary.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def ainvoke(self, agent_input: dict, *args, **kwargs) -> dict:
+        started = time.perf_counter()
+        delay_s = self.hedge_delay_s()
+        if delay_s is None:
+            result = await self.primary.ainvoke(agent_input, *args, **kwargs)
+            return self._result(
+                result, from_backup=False, hedged=False, started=started
+            )
+
+        primary = asyncio.ensure_future(
+            self.primary.ainvoke(agent_input, *args, **kwargs)
+        )
+        backup = None
+        try:
+            done, _ = await asyncio.wait([primary], timeout=delay_s)
+            if done:
+                return self._result(
+                    primary.result(), from_backup=False, hedged=False, started=started
+                )
+            backup = asyncio.ensure_future(
+                self.backup.ainvoke(agent_input, *args, **kwargs)
+            )
+            pending = {primary, backup}
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((t for t in done if t.exception() is None), None)
+                if winner is not None:
+                    return self._result(
+                        winner.result(),
+                        from_backup=winner is backup,
+                        hedged=True,
+                        started=started,
+                    )
+                if not pending:
+                    # Both failed: surface the primary's error
+                    return primary.result()
+        finally:
+            for task in (primary, backup):
+                if task is not None and not task.done():
+                    task.cancel()
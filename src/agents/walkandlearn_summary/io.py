@@ -2,7 +2,6 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import Union
 
 
 def get_frontmatter(
@@ -26,13 +25,28 @@ review-summary_type: {summary_type}
 """
 
 
-def read_file(file_path: Union[Path, str]) -> str:
+def split_frontmatter(content: str) -> tuple[dict[str, str], str]:
+    """Split a file written with get_frontmatter into its fields and its body."""
+    if not content.startswith("---\n"):
+        return {}, content
+    end = content.find("\n---\n", len("---\n"))
+    if end == -1:
+        return {}, content
+    fields = {}
+    for line in content[len("---\n") : end].splitlines():
+        key, sep, value = line.partition(": ")
+        if sep:
+            fields[key] = value
+    return fields, content[end + len("\n---\n") :].removeprefix("\n")
+
+
+def read_file(file_path: Path | str) -> str:
     path = Path(file_path) if isinstance(file_path, str) else file_path
     with open(path, "r", encoding="utf-8") as f:
         return f.read()
 
 
-def write_file(file_path: Union[Path, str], content: str) -> None:
+def write_file(file_path: Path | str, content: str) -> None:
     path = Path(file_path) if isinstance(file_path, str) else file_path
     with open(path, "w", encoding="utf-8") as f:
         f.write(content)
@@ -0,0 +1,156 @@
+"""Per-node wall time of a run, combined with the usage of its LLM calls.
+
+Nodes wrapped with timed_node append their timing to the `node_timings` state
+key. summarize_run_metrics joins those timings with the `llm_usage` records
+(latency, rate-limit wait, tokens and cost of every call) into the metrics
+written to evaluation.md and metrics.json.
+"""
+
+import functools
+import inspect
+import time
+from collections.abc import Callable
+
+
+def node_timing(name: str, started_at: float, started: float) -> dict:
+    """Timing record of a node that started at (time.time(), time.perf_counter())."""
+    return {
+        "node": name,
+        "started_at": started_at,
+        "duration_s": time.perf_counter() - started,
+    }
+
+
+def _with_timing(update: dict, timing: dict) -> dict:
+    # Keep the timings of the steps the node timed itself
+    return {**update, "node_timings": [*update.get("node_timings", []), timing]}
+
+
+def timed_node(name: str, node: Callable) -> Callable:
+    """Wrap a (sync or async) graph node so its update records its wall time.
+
+    The wrapper keeps the node's signature, so LangGraph still passes the
+    config to nodes that accept one.
+    """
+
+    if inspect.iscoroutinefunction(node):
+
+        @functools.wraps(node)
+        async def async_wrapper(*args, **kwargs) -> dict:
+            started_at, started = time.time(), time.perf_counter()
+            update = await node(*args, **kwargs) or {}
+            return _with_timing(update, node_timing(name, started_at, started))
+
+        return async_wrapper
+
+    @functools.wraps(node)
+    def wrapper(*args, **kwargs) -> dict:
+        started_at, started = time.time(), time.perf_counter()
+        update = node(*args, **kwargs) or {}
+        return _with_timing(update, node_timing(name, started_at, started))
+
+    return wrapper
+
+
+def _sum_cost(records: list[dict]) -> float:
+    return sum(r.get("cost_usd") or 0.0 for r in records)
+
+
+def summarize_run_metrics(
+    node_timings: list[dict] | None,
+    llm_usage: list[dict] | None,
+    digest_stats: dict | None = None,
+) -> dict:
+    """Aggregate the wall time, LLM time, rate-limit wait, tokens and cost.
+
+    Args:
+        node_timings: Timings recorded by timed_node
+        llm_usage: Usage records of the run's LLM calls (see usage.UsageRecorder)
+        digest_stats: Token reduction of the conversation digest, if any (see
+            nodes/digest.digest_stats)
+
+    Returns:
+        Run totals, plus one row per node (in start order) with the usage of
+        the LLM calls it made
+    """
+    timings = sorted(node_timings or [], key=lambda t: t["started_at"])
+    records = llm_usage or []
+    records_by_node: dict[str, list[dict]] = {}
+    for record in records:
+        records_by_node.setdefault(record["node"], []).append(record)
+
+    nodes = []
+    for timing in timings:
+        node_records = records_by_node.get(timing["node"], [])
+        nodes.append(
+            {
+                "node": timing["node"],
+                "duration_s": timing["duration_s"],
+                "llm_calls": len(node_records),
+                "llm_latency_s": sum(r.get("latency_s", 0.0) for r in node_records),
+                "wait_s": sum(r.get("wait_s", 0.0) for r in node_records),
+                "input_tokens": sum(r["input_tokens"] for r in node_records),
+                "output_tokens": sum(r["output_tokens"] for r in node_records),
+                "cost_usd": _sum_cost(node_records),
+            }
+        )
+
+    return {
+        "wall_time_s": (
+            max(t["started_at"] + t["duration_s"] for t in timings)
+            - timings[0]["started_at"]
+            if timings
+            else 0.0
+        ),
+        "llm_calls": len(records),
+        "wait_s": sum(r.get("wait_s", 0.0) for r in records),
+        "input_tokens": sum(r["input_tokens"] for r in records),
+        "output_tokens": sum(r["output_tokens"] for r in records),
+        "cost_usd": _sum_cost(records),
+        # Calls to models without catalog prices are not in cost_usd
+        "unpriced_calls": sum(
+            1
+            for r in records
+            if r.get("cost_usd") is None and not r.get("response_cache_hit")
+        ),
+        "hedge": summarize_hedging(records),
+        "digest": summarize_digest(digest_stats, nodes),
+        "nodes": nodes,
+    }
+
+
+def summarize_digest(digest_stats: dict | None, nodes: list[dict]) -> dict:
+    """The digest's token reduction, with the time and cost it added.
+
+    The digest runs before the summary candidates, so its wall time is added
+    to the run's latency, while every candidate reads fewer input tokens.
+
+    Returns:
+        digest_stats plus the digest node's duration_s and cost_usd, or an
+        empty dict when the run had no digest
+    """
+    if not digest_stats:
+        return {}
+    node = next((n for n in nodes if n["node"] == "conversation_digest"), None)
+    return {
+        **digest_stats,
+        "duration_s": node["duration_s"] if node else 0.0,
+        "cost_usd": node["cost_usd"] if node else 0.0,
+    }
+
+
+def summarize_hedging(llm_usage: list[dict] | None) -> dict:
+    """Share of the hedgeable calls sent to a backup model, and what it cost.
+
+    Returns:
+        Hedgeable and hedged calls, the hedge rate, and the estimated cost of
+        the cancelled requests (also included in the run's cost_usd)
+    """
+    hedgeable = [r for r in llm_usage or [] if r.get("hedged") is not None]
+    hedged = [r for r in hedgeable if r["hedged"]]
+    return {
+        "hedgeable_calls": len(hedgeable),
+        "hedged_calls": len(hedged),
+        "hedge_rate": len(hedged) / len(hedgeable) if hedgeable else 0.0,
+        "cost_usd": sum(r.get("hedge_cost_usd", 0.0) for r in hedged),
+    }
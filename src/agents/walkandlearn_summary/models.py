@@ -1,14 +1,100 @@
-import logging
-import pandas as pd
-from langchain.chat_models import init_chat_model
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from functools import cache
 
 # Where to find models
 # - https://platform.openai.com/docs/pricing
+# - https://docs.claude.com/en/docs/about-claude/pricing
+# - https://ai.google.dev/gemini-api/docs/pricing
 
 USING_GOOGLE_VERTEXAI = False
 
-MODELS_DF = pd.DataFrame(
-    [
+
+@dataclass(frozen=True, slots=True)
+class ModelSpec:
+    """One row of the model catalog."""
+
+    friendly_name: str
+    slug: str
+    provider: str
+    type: str
+    langchain_provider: str
+    temperature: float
+    # Maximum prompt + completion tokens
+    context_window: int = 128_000
+    # USD per million tokens: uncached input, prompt-cache read, prompt-cache
+    # write and output (None when unknown)
+    input_price: float | None = None
+    cache_read_price: float | None = None
+    cache_write_price: float | None = None
+    output_price: float | None = None
+
+
+class ModelCatalog:
+    """Immutable set of ModelSpec records indexed by name, slug, provider and type.
+
+    Records keep their declaration order in every index.
+    """
+
+    __slots__ = (
+        "_by_friendly_name",
+        "_by_provider",
+        "_by_slug",
+        "_by_type",
+        "_models",
+    )
+
+    def __init__(self, models: Iterable[ModelSpec]):
+        self._models: tuple[ModelSpec, ...] = tuple(models)
+        self._by_friendly_name: dict[str, ModelSpec] = {}
+        self._by_slug: dict[str, ModelSpec] = {}
+        by_provider: dict[str, list[ModelSpec]] = {}
+        by_type: dict[str, list[ModelSpec]] = {}
+
+        for model in self._models:
+            if model.friendly_name in self._by_friendly_name:
+                raise ValueError(f"Duplicate model name: {model.friendly_name}")
+            self._by_friendly_name[model.friendly_name] = model
+            self._by_slug.setdefault(model.slug, model)
+            by_provider.setdefault(model.provider, []).append(model)
+            by_type.setdefault(model.type, []).append(model)
+
+        self._by_provider = {k: tuple(v) for k, v in by_provider.items()}
+        self._by_type = {k: tuple(v) for k, v in by_type.items()}
+
+    def __iter__(self) -> Iterator[ModelSpec]:
+        return iter(self._models)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __contains__(self, friendly_name: object) -> bool:
+        return friendly_name in self._by_friendly_name
+
+    def get(self, friendly_name: str) -> ModelSpec:
+        """Return the model with this friendly name, or raise KeyError."""
+        return self._by_friendly_name[friendly_name]
+
+    def get_by_slug(self, slug: str) -> ModelSpec:
+        """Return the model with this slug, or raise KeyError."""
+        return self._by_slug[slug]
+
+    def by_provider(self, provider: str) -> tuple[ModelSpec, ...]:
+        return self._by_provider.get(provider, ())
+
+    def by_type(self, type_: str) -> tuple[ModelSpec, ...]:
+        return self._by_type.get(type_, ())
+
+    def providers(self) -> list[str]:
+        return sorted(self._by_provider)
+
+    def types(self) -> list[str]:
+        return sorted(self._by_type)
+
+
+MODEL_CATALOG = ModelCatalog(
+    ModelSpec(*row)
+    for row in [
         (
             "GPT 5-nano",
             "gpt-5-nano",
@@ -16,6 +102,11 @@ MODELS_DF = pd.DataFrame(
             "nano",
             "openai",
             1.0,
+            400_000,
+            0.05,
+            0.005,
+            0.05,
+            0.4,
         ),
         (
             "GPT 5-mini",
@@ -24,6 +115,11 @@ MODELS_DF = pd.DataFrame(
             "mini",
             "openai",
             1.0,
+            400_000,
+            0.25,
+            0.025,
+            0.25,
+            2.0,
         ),
         (
             "GPT 5",
@@ -32,6 +128,11 @@ MODELS_DF = pd.DataFrame(
             "main",
             "openai",
             1.0,
+            400_000,
+            1.25,
+            0.125,
+            1.25,
+            10.0,
         ),
         (
             "GPT 5.1",
@@ -40,6 +141,11 @@ MODELS_DF = pd.DataFrame(
             "main",
             "openai",
             1.0,
+            400_000,
+            1.25,
+            0.125,
+            1.25,
+            10.0,
         ),
         (
             "GPT 5.1-chat",
@@ -48,6 +154,11 @@ MODELS_DF = pd.DataFrame(
             "main",
             "openai",
             1.0,
+            128_000,
+            1.25,
+            0.125,
+            1.25,
+            10.0,
         ),
         (
             "GPT 5.2",
@@ -56,6 +167,11 @@ MODELS_DF = pd.DataFrame(
             "main",
             "openai",
             1.0,
+            400_000,
+            1.75,
+            0.175,
+            1.75,
+            14.0,
         ),
         (
             "GPT 5.2-chat",
@@ -64,6 +180,11 @@ MODELS_DF = pd.DataFrame(
             "main",
             "openai",
             1.0,
+            128_000,
+            1.75,
+            0.175,
+            1.75,
+            14.0,
         ),
         (
             "GPT 5-chat",
@@ -72,6 +193,11 @@ MODELS_DF = pd.DataFrame(
             "main",
             "openai",
             1.0,
+            128_000,
+            1.25,
+            0.125,
+            1.25,
+            10.0,
         ),
         (
             "Sonnet 4.5",
@@ -80,6 +206,11 @@ MODELS_DF = pd.DataFrame(
             "main",
             "anthropic",
             1.0,
+            200_000,
+            3.0,
+            0.3,
+            3.75,
+            15.0,
         ),
         (
             "Haiku 4.5",
@@ -88,6 +219,11 @@ MODELS_DF = pd.DataFrame(
             "mini",
             "anthropic",
             1.0,
+            200_000,
+            1.0,
+            0.1,
+            1.25,
+            5.0,
         ),
         (
             "Opus 4.1",
@@ -96,6 +232,11 @@ MODELS_DF = pd.DataFrame(
             "main",
             "anthropic",
             1.0,
+            200_000,
+            15.0,
+            1.5,
+            18.75,
+            75.0,
         ),
         (
             "Gemini 2.5 Pro",
@@ -104,6 +245,11 @@ MODELS_DF = pd.DataFrame(
             "main",
             "google_vertexai" if USING_GOOGLE_VERTEXAI else "google_genai",
             1.0,
+            1_048_576,
+            1.25,
+            0.31,
+            1.25,
+            10.0,
         ),
         (
             "Gemini 2.5 Flash",
@@ -112,6 +258,11 @@ MODELS_DF = pd.DataFrame(
             "mini",
             "google_vertexai" if USING_GOOGLE_VERTEXAI else "google_genai",
             1.0,
+            1_048_576,
+            0.3,
+            0.075,
+            0.3,
+            2.5,
         ),
         (
             "Gemini 2.5 Flash Lite",
@@ -120,6 +271,11 @@ MODELS_DF = pd.DataFrame(
             "nano",
             "google_vertexai" if USING_GOOGLE_VERTEXAI else "google_genai",
             1.0,
+            1_048_576,
+            0.1,
+            0.025,
+            0.1,
+            0.4,
         ),
         (
             "Gemini 3 Pro",
@@ -128,78 +284,183 @@ MODELS_DF = pd.DataFrame(
             "main",
             "google_vertexai" if USING_GOOGLE_VERTEXAI else "google_genai",
             1.0,
+            1_048_576,
+            2.0,
+            0.2,
+            2.0,
+            12.0,
         ),
-    ],
-    columns=[
-        "friendly_name",
-        "slug",
-        "provider",
-        "type",
-        "langchain_provider",
-        "temperature",
-    ],
+    ]
 )
 
 
 def print_available_models():
     print("MODELS BY PROVIDER")
     print("------------------")
-    for provider, group in MODELS_DF.groupby("provider"):
-        friendly_names = list(group["friendly_name"])
+    for provider in MODEL_CATALOG.providers():
         print(f"{provider}")
-        for friendly_name in friendly_names:
-            print(f"  - {friendly_name}")
+        for model in MODEL_CATALOG.by_provider(provider):
+            print(f"  - {model.friendly_name}")
 
     print()
     print("MODELS BY TYPE")
     print("------------------")
-    for type_, group in MODELS_DF.groupby("type"):
-        friendly_names = list(group["friendly_name"])
+    for type_ in MODEL_CATALOG.types():
         print(f"{type_}")
-        for friendly_name in friendly_names:
-            print(f"  - {friendly_name}")
+        for model in MODEL_CATALOG.by_type(type_):
+            print(f"  - {model.friendly_name}")
+
+
+@cache
+def _build_chat_model(slug: str, langchain_provider: str, temperature: float):
+    """Build (once) the chat model client for a (slug, provider, temperature)."""
+    # Imported here: pulling in langchain's provider integrations is the most
+    # expensive part of a cold start, so only pay for it when a client is built.
+    from langchain.chat_models import init_chat_model
+
+    # Provider rate limits (requests and tokens per minute) are enforced before
+    # each call by rate_limit.py, so the client's own retries are only for
+    # transient errors.
+    return init_chat_model(
+        model=slug,
+        model_provider=langchain_provider,
+        temperature=temperature,
+    )
 
 
 def get_model_by_name(name: str, temp: float | None = None):
     """
     Get a LangChain chat model by friendly name.
 
+    Clients are cached: asking twice for the same (slug, provider, temperature)
+    returns the same instance.
+
     Args:
         name: Friendly name of the model (e.g., "Sonnet 4.5", "GPT 5-nano")
-        temp: Temperature setting for the model. If None, uses the value from the DataFrame.
+        temp: Temperature setting for the model. If None, uses the catalog value.
 
     Returns:
         LangChain chat model instance
     """
     try:
-        row = MODELS_DF[MODELS_DF["friendly_name"] == name].iloc[0]
-        slug = row["slug"]
-        langchain_provider = row["langchain_provider"]
-
-        if temp is None:
-            temp = row["temperature"]
-
-        # Configure retry and timeout settings, especially for Anthropic
-        kwargs = {
-            "model": slug,
-            "model_provider": langchain_provider,
-            "temperature": temp,
-        }
-
-        if langchain_provider == "anthropic":
-            # Anthropic-specific settings for rate limiting
-            logging.info(
-                "Using Anthropic-specific settings for rate limiting | model: %s", name
-            )
-            kwargs.update(
-                {
-                    "max_retries": 10,  # We're hitting the token/min limit => So, quick hack to keep retrying until it works
-                }
-            )
-
-        return init_chat_model(**kwargs)
-    except IndexError:
-        raise ValueError(f"Model {name} not found")
+        spec = MODEL_CATALOG.get(name)
+    except KeyError:
+        raise ValueError(f"Model {name} not found") from None
+
+    if temp is None:
+        temp = spec.temperature
+
+    return _build_chat_model(spec.slug, spec.langchain_provider, float(temp))
+
+
+def describe_model(model) -> tuple[str, float | None]:
+    """Return the (slug, temperature) a chat model client was built with."""
+    slug = (
+        getattr(model, "model_name", None)
+        or getattr(model, "model", None)
+        or type(model).__name__
+    )
+    return str(slug), getattr(model, "temperature", None)
+
+
+def context_window_of(model) -> int | None:
+    """Return the catalog context window (in tokens) of a chat model client."""
+    slug, _ = describe_model(model)
+    try:
+        return MODEL_CATALOG.get_by_slug(slug).context_window
+    except KeyError:
+        return None
+
+
+def cost_of_call(
+    model_slug: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_creation_tokens: int = 0,
+) -> float | None:
+    """Return the USD cost of one call from the catalog prices, or None if unknown.
+
+    input_tokens includes the cache read and write tokens, as reported by
+    LangChain's usage_metadata.
+    """
+    try:
+        spec = MODEL_CATALOG.get_by_slug(model_slug)
+    except KeyError:
+        return None
+    if spec.input_price is None or spec.output_price is None:
+        return None
+    uncached_tokens = max(0, input_tokens - cache_read_tokens - cache_creation_tokens)
+    return (
+        uncached_tokens * spec.input_price
+        + cache_read_tokens * (spec.cache_read_price or spec.input_price)
+        + cache_creation_tokens * (spec.cache_write_price or spec.input_price)
+        + output_tokens * spec.output_price
+    ) / 1_000_000
+
+
+def provider_of(model) -> str:
+    """Return the catalog provider (e.g. "Anthropic") of a chat model client."""
+    slug, _ = describe_model(model)
+    try:
+        return MODEL_CATALOG.get_by_slug(slug).provider
+    except KeyError:
+        return "unknown"
+
+
+def supports_multiple_choices(model) -> bool:
+    """Whether a chat model client can return n > 1 completions per request.
+
+    Only the clients with an `n` setting (OpenAI, Gemini) do; Anthropic's
+    Messages API has no equivalent.
+    """
+    return "n" in getattr(type(model), "model_fields", {})
+
+
+def backup_model_for(model) -> ModelSpec | None:
+    """Return the catalog model a request to this client can be hedged to.
+
+    The backup has the same type (e.g. "main") and, when possible, another
+    provider, so its latency is not correlated with the primary's.
+    """
+    slug, _ = describe_model(model)
+    try:
+        spec = MODEL_CATALOG.get_by_slug(slug)
+    except KeyError:
+        return None
+    candidates = [m for m in MODEL_CATALOG.by_type(spec.type) if m.slug != slug]
+    other_providers = [m for m in candidates if m.provider != spec.provider]
+    return (other_providers or candidates or [None])[0]
+
+
+class LazyRoleModels(Mapping):
+    """Read-only role -> chat model mapping that builds clients on first access.
+
+    Args:
+        roles: Role -> model friendly name (e.g. {"emotional": "Sonnet 4.5"})
+        temps: Role -> temperature
+    """
+
+    def __init__(self, roles: Mapping[str, str], temps: Mapping[str, float]):
+        self._roles = dict(roles)
+        self._temps = dict(temps)
+
+    def __getitem__(self, role: str):
+        friendly_name = self._roles[role]
+        return get_model_by_name(friendly_name, temp=self._temps.get(role))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._roles)
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+    def friendly_name(self, role: str) -> str:
+        """Return the friendly model name configured for a role, without building it."""
+        return self._roles[role]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._roles!r})"
 
 
 if __name__ == "__main__":
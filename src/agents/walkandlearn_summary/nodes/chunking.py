@@ -0,0 +1,153 @@
+"""Map-reduce support for transcripts that exceed a model's context window.
+
+Map: the conversation is split into token chunks (with chonkie) and each chunk
+is condensed into notes, in parallel. Reduce: the notes, in order, replace the
+conversation as the input of the summary candidates.
+"""
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from langchain_core.messages import HumanMessage
+
+from src.agents.walkandlearn_summary.nodes.summary import extract_summary_text
+from src.agents.walkandlearn_summary.rate_limit import estimate_tokens
+
+
+def conversation_token_budget(
+    context_window: int,
+    system_prompt: str,
+    reserved_output_tokens: int,
+    context_fraction: float,
+) -> int:
+    """Tokens the conversation may use in a single summary call.
+
+    Args:
+        context_window: Context window of the model, in tokens
+        system_prompt: The summary system prompt (sent with every call)
+        reserved_output_tokens: Tokens kept free for the summary itself
+        context_fraction: Share of the context window the prompt may fill
+
+    Returns:
+        The token budget for the conversation
+    """
+    return int(
+        context_window * context_fraction
+        - estimate_tokens(system_prompt)
+        - reserved_output_tokens
+    )
+
+
+def needs_chunking(conversation: str, token_budget: int | None) -> bool:
+    """Whether the conversation is too long to summarize in one call."""
+    return token_budget is not None and estimate_tokens(conversation) > token_budget
+
+
+def chunk_tokens_for(
+    token_budget: int, max_chunk_tokens: int, chunk_overlap: int
+) -> int:
+    """Tokens per chunk: half the conversation's token budget, at most max_chunk_tokens.
+
+    Raises:
+        ValueError: If the budget is too small for chunks longer than their
+            overlap (the model's context window is too small for chunked mode)
+    """
+    chunk_tokens = min(max_chunk_tokens, token_budget // 2)
+    if chunk_tokens <= chunk_overlap:
+        raise ValueError(
+            f"Chunked mode needs chunks longer than their {chunk_overlap} tokens "
+            f"of overlap, but the conversation's token budget of {token_budget} "
+            f"only leaves {chunk_tokens} tokens per chunk: the summary model's "
+            "context window is too small"
+        )
+    return chunk_tokens
+
+
+def split_conversation(
+    conversation: str, chunk_tokens: int, chunk_overlap: int, tokenizer: str
+) -> list[str]:
+    """Split the conversation into overlapping token chunks.
+
+    Args:
+        conversation: The full conversation text
+        chunk_tokens: Maximum tokens per chunk
+        chunk_overlap: Tokens shared by consecutive chunks
+        tokenizer: chonkie tokenizer name (e.g. "cl100k_base", "character")
+
+    Returns:
+        The chunk texts, in order
+    """
+    # Imported here: chonkie is only needed for (rare) over-long transcripts
+    from chonkie import TokenChunker
+
+    chunker = TokenChunker(
+        tokenizer=tokenizer, chunk_size=chunk_tokens, chunk_overlap=chunk_overlap
+    )
+    return [chunk.text for chunk in chunker.chunk(conversation)]
+
+
+def build_chunk_input(chunk: str, index: int, total: int) -> dict:
+    """Build the agent input asking for notes on one chunk."""
+    return {
+        "messages": [
+            HumanMessage(
+                content=(
+                    f"Here is part {index + 1} of {total} of the conversation:"
+                    f"\n\n{chunk}"
+                )
+            )
+        ]
+    }
+
+
+def format_condensed_conversation(notes: list[str]) -> str:
+    """Join the per-chunk notes into the input of the summary candidates."""
+    parts = "\n\n".join(
+        f"## Part {i + 1} of {len(notes)}\n\n{note}" for i, note in enumerate(notes)
+    )
+    return (
+        "The conversation was too long to include in full. Below are detailed "
+        "notes of each part, in order.\n\n" + parts
+    )
+
+
+def summarize_chunks(
+    make_agent: Callable[[int], Any], chunks: list[str], max_workers: int
+) -> list[str]:
+    """Condense every chunk into notes, in parallel threads.
+
+    Args:
+        make_agent: Returns the agent to use for the chunk at an index
+        chunks: The chunk texts
+        max_workers: Maximum number of concurrent calls
+
+    Returns:
+        The notes of each chunk, in order
+    """
+
+    def summarize(index: int) -> str:
+        result = make_agent(index).invoke(
+            build_chunk_input(chunks[index], index, len(chunks))
+        )
+        return extract_summary_text(result)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(summarize, range(len(chunks))))
+
+
+async def asummarize_chunks(
+    make_agent: Callable[[int], Any], chunks: list[str], max_concurrency: int
+) -> list[str]:
+    """Async version of summarize_chunks."""
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def summarize(index: int) -> str:
+        async with slots:
+            result = await make_agent(index).ainvoke(
+                build_chunk_input(chunks[index], index, len(chunks))
+            )
+        return extract_summary_text(result)
+
+    return list(await asyncio.gather(*(summarize(i) for i in range(len(chunks)))))
@@ -0,0 +1,131 @@
+"""Shared conversation digest, read by every summary candidate.
+
+The raw walk transcript is full of timestamps, filler words and repetition
+that every candidate pays for again. The digest stage runs once per run,
+before the summary subgraphs: normalize_transcript strips the noise
+deterministically, and an optional pass of a cheap model condenses the result
+further. The candidates (and the chunked mode) then read the digest instead of
+the conversation.
+"""
+
+import re
+
+from langchain_core.messages import HumanMessage
+
+from src.agents.walkandlearn_summary.nodes.summary import extract_summary_text
+from src.agents.walkandlearn_summary.rate_limit import estimate_tokens
+
+DIGEST_MODES = ("off", "normalize", "model")
+
+# The WEBVTT header, and subtitle cue timings ("00:01:02,345 --> 00:01:04,000")
+# with the cue number right above them, if any. Other number lines are kept.
+_CUE_LINE = re.compile(
+    r"\A\s*WEBVTT.*$"
+    r"|^[ \t]*(?:\d+[ \t]*\n[ \t]*)?[\d:.,]+[ \t]*-->[ \t]*[\d:.,]+.*$",
+    re.MULTILINE,
+)
+# [00:12], (1:02:03), 00:12:34.5 at the start of a line
+_TIMESTAMP = re.compile(
+    r"[\[(]\d{1,2}(?::\d{2}){1,2}(?:[.,]\d+)?[\])]\s*"
+    r"|^\s*\d{1,2}(?::\d{2}){1,2}(?:[.,]\d+)?\s+",
+    re.MULTILINE,
+)
+_FILLER = re.compile(
+    r"(?<![\w-])(?:u+m+|u+h+|e+r+m+|h+m+|mm-hmm|uh-huh)(?![\w-])[,.]?[ \t]*",
+    re.IGNORECASE,
+)
+# Stutters of a letter or a subject pronoun ("I I", "we we"), and any word said
+# three times or more ("the the the"). "had had" and "that that" are kept.
+_STUTTER = re.compile(r"\b([a-z]|you|he|she|it|we|they)(?:[ \t]+\1\b)+", re.IGNORECASE)
+_REPEATED_WORD = re.compile(r"\b(\w+)(?:[ \t]+\1\b){2,}", re.IGNORECASE)
+_SPEAKER = re.compile(r"^([A-Z][\w .'-]{0,40}):[ \t]*(.*)$")
+
+
+def _merge_speaker_turns(lines: list[str]) -> list[str]:
+    """Drop repeated lines and join consecutive lines of the same speaker."""
+    merged: list[str] = []
+    speaker = previous = None
+    for line in lines:
+        if not line:
+            if merged and merged[-1]:
+                merged.append(line)
+            continue
+        if line == previous:
+            continue
+        previous = line
+        match = _SPEAKER.match(line)
+        if match and match.group(1) == speaker:
+            while not merged[-1]:
+                merged.pop()
+            merged[-1] = f"{merged[-1]} {match.group(2)}".rstrip()
+            continue
+        speaker = match.group(1) if match else None
+        merged.append(line)
+    return merged
+
+
+def normalize_transcript(conversation: str) -> str:
+    """Deterministically strip the noise of a transcript.
+
+    Removes subtitle cues and timestamps, filler words ("um", "uh", ...) and
+    stuttered words, drops repeated lines, joins consecutive lines of the same
+    speaker and collapses whitespace. The wording is otherwise kept as is.
+    """
+    text = _CUE_LINE.sub("", conversation)
+    text = _TIMESTAMP.sub("", text)
+    text = _FILLER.sub("", text)
+    text = _STUTTER.sub(r"\1", text)
+    text = _REPEATED_WORD.sub(r"\1", text)
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.splitlines()]
+    text = "\n".join(_merge_speaker_turns(lines))
+    return re.sub(r"\n{3,}", "\n\n", text).strip() + "\n"
+
+
+def build_digest_input(conversation: str) -> dict:
+    """Build the agent input asking the digest model to condense the transcript."""
+    return {
+        "messages": [
+            HumanMessage(
+                content=f"Here is the conversation transcript:\n\n{conversation}"
+            )
+        ]
+    }
+
+
+def choose_digest(normalized: str, model_result: dict | None) -> str:
+    """The model's digest, unless there is none or it is not shorter."""
+    if model_result is None:
+        return normalized
+    digest = extract_summary_text(model_result).strip()
+    if not digest or len(digest) >= len(normalized):
+        return normalized
+    return digest + "\n"
+
+
+def digest_stats(
+    conversation: str, normalized: str, digest: str, mode: str, candidate_calls: int
+) -> dict:
+    """Token reduction of the digest, as reported in the run metrics.
+
+    Args:
+        conversation: The raw conversation
+        normalized: The conversation after normalize_transcript
+        digest: What the candidates read instead of the conversation
+        mode: "normalize" or "model"
+        candidate_calls: Summary candidates reading the digest
+
+    Returns:
+        Estimated tokens of each stage, the reduction, and the input tokens
+        saved over all the candidate calls
+    """
+    conversation_tokens = estimate_tokens(conversation)
+    digest_tokens = estimate_tokens(digest)
+    return {
+        "mode": mode,
+        "conversation_tokens": conversation_tokens,
+        "normalized_tokens": estimate_tokens(normalized),
+        "digest_tokens": digest_tokens,
+        "reduction": 1 - digest_tokens / conversation_tokens,
+        "candidate_calls": candidate_calls,
+        "saved_input_tokens": (conversation_tokens - digest_tokens) * candidate_calls,
+    }
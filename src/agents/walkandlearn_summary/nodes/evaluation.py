@@ -1,7 +1,8 @@
 """Evaluation logic for summary generation."""
 
+import asyncio
 import re
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_core.messages import HumanMessage
 
@@ -20,7 +21,94 @@ def format_summaries_for_evaluation(summaries: list[str]) -> str:
     )
 
 
-def parse_evaluation_result(evaluation_result: str) -> Tuple[Optional[int], str]:
+def shingles(text: str, size: int = 5) -> frozenset[tuple[str, ...]]:
+    """Set of the (lowercased) word n-grams of a text.
+
+    A text shorter than `size` words is a single shingle of all its words.
+    """
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= size:
+        return frozenset([tuple(words)])
+    return frozenset(tuple(words[i : i + size]) for i in range(len(words) - size + 1))
+
+
+def jaccard(left: frozenset, right: frozenset) -> float:
+    """Jaccard similarity of two sets (1.0 for two empty sets)."""
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def collapse_near_duplicates(
+    summaries: list[str], threshold: float
+) -> tuple[list[str], list[int]]:
+    """Keep the first of each group of near-duplicate summaries.
+
+    Two summaries are near-duplicates when the Jaccard similarity of their
+    word 5-gram shingles is at least `threshold`.
+
+    Args:
+        summaries: List of summary strings
+        threshold: Similarity (0-1) from which a summary duplicates another
+
+    Returns:
+        The kept summaries, and the original index of each of them
+    """
+    kept: list[int] = []
+    kept_shingles: list[frozenset] = []
+    for i, summary in enumerate(summaries):
+        summary_shingles = shingles(str(summary))
+        if any(
+            jaccard(summary_shingles, other) >= threshold for other in kept_shingles
+        ):
+            continue
+        kept.append(i)
+        kept_shingles.append(summary_shingles)
+    return [summaries[i] for i in kept], kept
+
+
+def _map_to_original(
+    result: tuple[int | None, str], kept: list[int], num_summaries: int
+) -> tuple[int | None, str]:
+    """Translate an evaluation of the kept summaries back to all the summaries."""
+    best_idx, reasoning = result
+    if len(kept) == num_summaries:
+        return result
+    if best_idx is not None and 0 <= best_idx < len(kept):
+        best_idx = kept[best_idx]
+    numbering = ", ".join(f"{i} = {original}" for i, original in enumerate(kept))
+    note = (
+        f"({num_summaries - len(kept)} near-duplicate summaries were not "
+        f"evaluated; summaries evaluated as {numbering})"
+    )
+    return best_idx, f"{reasoning}\n\n{note}"
+
+
+def to_candidate_index(
+    result: tuple[int | None, str], candidates: list[int]
+) -> tuple[int | None, str]:
+    """Translate an evaluation of the finished candidates' summaries, which
+    numbers them by position, to candidate indices.
+
+    Args:
+        result: (best_idx, reasoning), best_idx being a position in candidates
+        candidates: Candidate index of each evaluated summary, in order
+
+    Returns:
+        (best_idx, reasoning), best_idx being a candidate index (None if the
+        evaluated one is not valid); the reasoning notes the numbering when
+        some candidates did not finish
+    """
+    best_idx, reasoning = result
+    if candidates == list(range(len(candidates))):
+        return result
+    valid = best_idx is not None and 0 <= best_idx < len(candidates)
+    numbering = ", ".join(f"{i} = {c}" for i, c in enumerate(candidates))
+    note = f"(Summaries numbered among the finished candidates: {numbering})"
+    return candidates[best_idx] if valid else None, f"{reasoning}\n\n{note}"
+
+
+def parse_evaluation_result(evaluation_result: str) -> tuple[int | None, str]:
     """Parse the evaluation result to extract best summary index and reasoning.
 
     Args:
@@ -54,12 +142,44 @@ def parse_evaluation_result(evaluation_result: str) -> Tuple[Optional[int], str]
         return best_idx, evaluation_result if evaluation_result else "Parse error"
 
 
+def _skip_evaluation(
+    summaries: list[str], summary_type: str, eval_disabled: bool
+) -> tuple[int | None, str] | None:
+    """Return the result to use without calling the evaluator, if any."""
+    if eval_disabled:
+        return (
+            0,
+            f"[{summary_type.capitalize()} evaluation disabled]",
+        )
+
+    if not summaries:
+        return (None, "No summaries to evaluate")
+
+    return None
+
+
+def _kept_summaries(
+    summaries: list[str], dedup_threshold: float | None
+) -> tuple[list[str], list[int]]:
+    if dedup_threshold is None:
+        return summaries, list(range(len(summaries)))
+    return collapse_near_duplicates(summaries, dedup_threshold)
+
+
+def build_evaluation_input(summaries: list[str]) -> dict:
+    """Build the evaluation agent input for a list of summaries."""
+    return {
+        "messages": [HumanMessage(content=format_summaries_for_evaluation(summaries))]
+    }
+
+
 def evaluate_summaries(
     evaluation_agent,
     summaries: list[str],
     summary_type: str,
     eval_disabled: bool,
-) -> Tuple[Optional[int], str]:
+    dedup_threshold: float | None = None,
+) -> tuple[int | None, str]:
     """Evaluate summaries and return the best one.
 
     Args:
@@ -67,27 +187,275 @@ def evaluate_summaries(
         summaries: List of summaries to evaluate
         summary_type: Type of summary (e.g., "emotional", "technical")
         eval_disabled: Whether evaluation is disabled
+        dedup_threshold: Only evaluate the first of each group of summaries at
+            least this similar (see collapse_near_duplicates); None evaluates all
 
     Returns:
-        Tuple of (best_summary_index, reasoning)
+        Tuple of (best_summary_index, reasoning), the index being in summaries
     """
-    if eval_disabled:
-        return (
-            0,
-            f"[{summary_type.capitalize()} evaluation disabled]",
-        )
+    skipped = _skip_evaluation(summaries, summary_type, eval_disabled)
+    if skipped is not None:
+        return skipped
 
-    if not summaries:
-        return (None, "No summaries to evaluate")
-
-    # Format summaries for evaluation
-    formatted_summaries = format_summaries_for_evaluation(summaries)
+    kept_summaries, kept = _kept_summaries(summaries, dedup_threshold)
 
     # Invoke the evaluation agent directly (not using the summary wrapper)
-    result = evaluation_agent.invoke(
-        {"messages": [HumanMessage(content=formatted_summaries)]}
-    )
+    result = evaluation_agent.invoke(build_evaluation_input(kept_summaries))
     evaluation_result = result["messages"][-1].content
 
     # Parse the evaluation result
-    return parse_evaluation_result(evaluation_result)
+    return _map_to_original(
+        parse_evaluation_result(evaluation_result), kept, len(summaries)
+    )
+
+
+async def aevaluate_summaries(
+    evaluation_agent,
+    summaries: list[str],
+    summary_type: str,
+    eval_disabled: bool,
+    dedup_threshold: float | None = None,
+) -> tuple[int | None, str]:
+    """Async version of evaluate_summaries (uses evaluation_agent.ainvoke)."""
+    skipped = _skip_evaluation(summaries, summary_type, eval_disabled)
+    if skipped is not None:
+        return skipped
+
+    kept_summaries, kept = _kept_summaries(summaries, dedup_threshold)
+    result = await evaluation_agent.ainvoke(build_evaluation_input(kept_summaries))
+    evaluation_result = result["messages"][-1].content
+
+    return _map_to_original(
+        parse_evaluation_result(evaluation_result), kept, len(summaries)
+    )
+
+
+def tournament_groups(candidates: list[int], group_size: int) -> list[list[int]]:
+    """Split the candidates of a bracket round into groups of group_size.
+
+    The last group may be smaller; a group of one advances without a match.
+    """
+    return [
+        candidates[i : i + group_size] for i in range(0, len(candidates), group_size)
+    ]
+
+
+def _advance(
+    groups: list[list[int]], verdicts: list[tuple[int | None, str]]
+) -> tuple[list[int], str]:
+    """Winners of a round (in bracket order) and the reasoning of its last match.
+
+    verdicts are the evaluations of the groups with more than one candidate,
+    indexed within their group. An unparseable verdict advances the group's
+    first candidate.
+    """
+    matches = iter(verdicts)
+    winners, reasoning = [], ""
+    for group in groups:
+        if len(group) == 1:
+            winners.append(group[0])
+            continue
+        local_idx, reasoning = next(matches)
+        valid = local_idx is not None and 0 <= local_idx < len(group)
+        winners.append(group[local_idx] if valid else group[0])
+    return winners, reasoning
+
+
+def _tournament_result(
+    winner: int,
+    reasoning: str,
+    final_group: list[int],
+    rounds: int,
+    kept: list[int],
+    num_summaries: int,
+) -> tuple[int | None, str]:
+    """Map the tournament winner back to summaries, noting how it was chosen."""
+    numbering = ", ".join(f"{i} = {kept[c]}" for i, c in enumerate(final_group))
+    note = (
+        f"(Tournament of {len(kept)} summaries in {rounds} rounds; the final "
+        f"compared summaries {numbering}"
+    )
+    if len(kept) < num_summaries:
+        note += f"; {num_summaries - len(kept)} near-duplicates were not evaluated"
+    return kept[winner], f"{reasoning}\n\n{note})"
+
+
+def evaluate_tournament(
+    evaluation_agent,
+    summaries: list[str],
+    summary_type: str,
+    eval_disabled: bool,
+    group_size: int = 2,
+    max_parallel: int = 8,
+    dedup_threshold: float | None = None,
+) -> tuple[int | None, str]:
+    """Pick the best summary in bracket rounds of small-group evaluations.
+
+    Each evaluator call only sees group_size summaries, whatever the number of
+    candidates, and the matches of a round run concurrently. Returns the same
+    (best_idx, reasoning) as evaluate_summaries, the reasoning being the one
+    of the final match.
+
+    Args:
+        evaluation_agent: The agent to use for evaluation
+        summaries: List of summaries to evaluate
+        summary_type: Type of summary (e.g., "emotional", "technical")
+        eval_disabled: Whether evaluation is disabled
+        group_size: Summaries compared per evaluator call (at least 2)
+        max_parallel: Maximum number of concurrent evaluator calls
+        dedup_threshold: See evaluate_summaries
+
+    Returns:
+        Tuple of (best_summary_index, reasoning), the index being in summaries
+    """
+    skipped = _skip_evaluation(summaries, summary_type, eval_disabled)
+    if skipped is not None:
+        return skipped
+
+    kept_summaries, kept = _kept_summaries(summaries, dedup_threshold)
+
+    def judge(group: list[int]) -> tuple[int | None, str]:
+        group_input = build_evaluation_input([kept_summaries[i] for i in group])
+        result = evaluation_agent.invoke(group_input)
+        return parse_evaluation_result(result["messages"][-1].content)
+
+    candidates = list(range(len(kept_summaries)))
+    if len(candidates) == 1:
+        return kept[0], "Only one summary to evaluate"
+    rounds = 0
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        while len(candidates) > 1:
+            groups = tournament_groups(candidates, max(group_size, 2))
+            verdicts = list(pool.map(judge, [g for g in groups if len(g) > 1]))
+            final_group = groups[0]
+            candidates, reasoning = _advance(groups, verdicts)
+            rounds += 1
+    return _tournament_result(
+        candidates[0], reasoning, final_group, rounds, kept, len(summaries)
+    )
+
+
+async def aevaluate_tournament(
+    evaluation_agent,
+    summaries: list[str],
+    summary_type: str,
+    eval_disabled: bool,
+    group_size: int = 2,
+    max_parallel: int = 8,
+    dedup_threshold: float | None = None,
+) -> tuple[int | None, str]:
+    """Async version of evaluate_tournament (uses evaluation_agent.ainvoke)."""
+    skipped = _skip_evaluation(summaries, summary_type, eval_disabled)
+    if skipped is not None:
+        return skipped
+
+    kept_summaries, kept = _kept_summaries(summaries, dedup_threshold)
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def judge(group: list[int]) -> tuple[int | None, str]:
+        group_input = build_evaluation_input([kept_summaries[i] for i in group])
+        async with semaphore:
+            result = await evaluation_agent.ainvoke(group_input)
+        return parse_evaluation_result(result["messages"][-1].content)
+
+    candidates = list(range(len(kept_summaries)))
+    if len(candidates) == 1:
+        return kept[0], "Only one summary to evaluate"
+    rounds = 0
+    while len(candidates) > 1:
+        groups = tournament_groups(candidates, max(group_size, 2))
+        verdicts = await asyncio.gather(*(judge(g) for g in groups if len(g) > 1))
+        final_group = groups[0]
+        candidates, reasoning = _advance(groups, list(verdicts))
+        rounds += 1
+    return _tournament_result(
+        candidates[0], reasoning, final_group, rounds, kept, len(summaries)
+    )
+
+
+class KingOfTheHill:
+    """Streaming evaluation: each summary challenges the best one so far.
+
+    Summaries are submitted as they arrive, so when the last one lands only
+    its comparison with the current best is left. A challenger that is a
+    near-duplicate of a summary already compared is skipped.
+
+    Args:
+        evaluation_agent: The agent comparing the best summary and a challenger
+        summary_type: Type of summary (e.g., "emotional", "technical")
+        eval_disabled: Whether evaluation is disabled
+        dedup_threshold: See evaluate_summaries
+    """
+
+    def __init__(
+        self,
+        evaluation_agent,
+        summary_type: str,
+        eval_disabled: bool,
+        dedup_threshold: float | None = None,
+    ):
+        self.evaluation_agent = evaluation_agent
+        self.summary_type = summary_type
+        self.eval_disabled = eval_disabled
+        self.dedup_threshold = dedup_threshold
+        self.best: int | None = None
+        self.reasoning = "Only one summary to evaluate"
+        self.comparisons = 0
+        self._best_summary = ""
+        self._seen: list[frozenset] = []
+
+    def _is_duplicate(self, summary: str) -> bool:
+        if self.dedup_threshold is None:
+            return False
+        summary_shingles = shingles(str(summary))
+        duplicate = any(
+            jaccard(summary_shingles, seen) >= self.dedup_threshold
+            for seen in self._seen
+        )
+        self._seen.append(summary_shingles)
+        return duplicate
+
+    def _crown(self, index: int, summary: str) -> None:
+        self.best, self._best_summary = index, summary
+
+    def _needs_comparison(self, index: int, summary: str) -> bool:
+        if self.eval_disabled or self._is_duplicate(summary):
+            return False
+        if self.best is None:
+            self._crown(index, summary)
+            return False
+        return True
+
+    def _apply(self, index: int, summary: str, evaluation_result: str) -> None:
+        self.comparisons += 1
+        local_idx, reasoning = parse_evaluation_result(evaluation_result)
+        # Summary 0 is the best so far, summary 1 the challenger
+        if local_idx == 1:
+            self._crown(index, summary)
+        self.reasoning = reasoning
+
+    def challenge(self, index: int, summary: str) -> None:
+        """Compare a newly arrived summary with the best one so far."""
+        if not self._needs_comparison(index, summary):
+            return
+        result = self.evaluation_agent.invoke(
+            build_evaluation_input([self._best_summary, summary])
+        )
+        self._apply(index, summary, result["messages"][-1].content)
+
+    async def achallenge(self, index: int, summary: str) -> None:
+        """Async version of challenge (uses evaluation_agent.ainvoke)."""
+        if not self._needs_comparison(index, summary):
+            return
+        result = await self.evaluation_agent.ainvoke(
+            build_evaluation_input([self._best_summary, summary])
+        )
+        self._apply(index, summary, result["messages"][-1].content)
+
+    def result(self, finished: list[int]) -> tuple[int | None, str]:
+        """(best_idx, reasoning), best_idx being the index submitted with the
+        best of the finished summaries (the indices submitted, in order)."""
+        skipped = _skip_evaluation(finished, self.summary_type, self.eval_disabled)
+        if skipped is not None:
+            return to_candidate_index(skipped, finished)
+        return self.best, self.reasoning
@@ -1,15 +1,24 @@
 """Output formatting functions for evaluation results."""
 
+import json
+from collections.abc import Mapping
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-from src.agents.walkandlearn_summary.io import write_file, get_frontmatter
+
+from src.agents.walkandlearn_summary.io import (
+    get_frontmatter,
+    read_file,
+    split_frontmatter,
+)
+from src.agents.walkandlearn_summary.metrics import summarize_run_metrics
+from src.agents.walkandlearn_summary.sink import OutputSink, SinkStats
+from src.agents.walkandlearn_summary.usage import summarize_prompt_cache
 
 
 def format_evaluation_file_content(
-    emotional_best_idx: Optional[int],
+    emotional_best_idx: int | None,
     emotional_reasoning: str,
-    technical_best_idx: Optional[int],
+    technical_best_idx: int | None,
     technical_reasoning: str,
 ) -> str:
     """Format evaluation results for file output.
@@ -37,10 +46,112 @@ def format_evaluation_file_content(
     return content
 
 
+def format_llm_usage_section(llm_usage: list[dict]) -> str:
+    """Format per-call token usage and prompt-cache metrics for the evaluation file.
+
+    Args:
+        llm_usage: Usage records of the run's LLM calls (see usage.UsageRecorder)
+
+    Returns:
+        Formatted markdown section
+    """
+    cache = summarize_prompt_cache(llm_usage)
+    content = "# LLM Usage\n\n"
+    content += (
+        f"**Prompt cache:** {cache['cache_read_tokens']} of {cache['input_tokens']} "
+        f"input tokens read from cache ({cache['cache_hit_ratio']:.0%}), "
+        f"{cache['calls_with_cache_hit']} of {cache['calls']} calls hit, "
+        f"{cache['cache_creation_tokens']} tokens written\n\n"
+    )
+    content += f"**Response cache hits:** {cache['response_cache_hits']}\n\n"
+    content += (
+        "| Node | Model | Input | Cache read | Cache write | Output "
+        "| Latency (s) | Wait (s) | Cost ($) |\n"
+    )
+    content += "|---|---|---|---|---|---|---|---|---|\n"
+    for record in llm_usage:
+        content += (
+            f"| {record['node']} | {record['model']} | {record['input_tokens']} "
+            f"| {record['cache_read_tokens']} | {record['cache_creation_tokens']} "
+            f"| {record['output_tokens']} | {record.get('latency_s', 0.0):.2f} "
+            f"| {record.get('wait_s', 0.0):.2f} | {_format_cost(record.get('cost_usd'))} |\n"
+        )
+    return content + "\n"
+
+
+def _format_cost(cost_usd: float | None) -> str:
+    return "N/A" if cost_usd is None else f"{cost_usd:.4f}"
+
+
+def format_dropped_candidates_section(dropped_candidates: list[str]) -> str:
+    """List the candidates cancelled by the run deadline."""
+    content = "# Dropped Candidates\n\n"
+    content += (
+        "The run deadline expired before these candidates finished; the "
+        "evaluation used the others.\n\n"
+    )
+    for candidate in sorted(dropped_candidates):
+        content += f"- {candidate}\n"
+    return content + "\n"
+
+
+def format_run_metrics_section(metrics: dict) -> str:
+    """Format per-node wall time, LLM time, tokens and cost for the evaluation file.
+
+    Args:
+        metrics: Run metrics (see metrics.summarize_run_metrics)
+
+    Returns:
+        Formatted markdown section
+    """
+    content = "# Run Metrics\n\n"
+    content += (
+        f"**Wall time:** {metrics['wall_time_s']:.1f}s, "
+        f"**LLM cost:** ${metrics['cost_usd']:.4f} "
+        f"({metrics['llm_calls']} calls, {metrics['input_tokens']} input / "
+        f"{metrics['output_tokens']} output tokens, "
+        f"{metrics['wait_s']:.1f}s waiting for rate limits)\n\n"
+    )
+    if metrics["unpriced_calls"]:
+        content += (
+            f"> {metrics['unpriced_calls']} calls used models without catalog "
+            "prices and are not included in the cost.\n\n"
+        )
+    hedge = metrics.get("hedge") or {}
+    if hedge.get("hedgeable_calls"):
+        content += (
+            f"**Hedging:** {hedge['hedged_calls']}/{hedge['hedgeable_calls']} "
+            f"summary calls hedged ({hedge['hedge_rate']:.0%}), "
+            f"${hedge['cost_usd']:.4f} for the cancelled requests\n\n"
+        )
+    digest = metrics.get("digest") or {}
+    if digest:
+        content += (
+            f"**Conversation digest ({digest['mode']}):** "
+            f"{digest['conversation_tokens']} → {digest['digest_tokens']} tokens "
+            f"(-{digest['reduction']:.0%}) in {digest['duration_s']:.1f}s "
+            f"before the summaries, {digest['saved_input_tokens']} input tokens "
+            f"saved over {digest['candidate_calls']} summary calls\n\n"
+        )
+    content += (
+        "| Node | Wall (s) | LLM calls | LLM time (s) | Wait (s) | Input | Output "
+        "| Cost ($) |\n"
+    )
+    content += "|---|---|---|---|---|---|---|---|\n"
+    for node in metrics["nodes"]:
+        content += (
+            f"| {node['node']} | {node['duration_s']:.2f} | {node['llm_calls']} "
+            f"| {node['llm_latency_s']:.2f} | {node['wait_s']:.2f} "
+            f"| {node['input_tokens']} | {node['output_tokens']} "
+            f"| {node['cost_usd']:.4f} |\n"
+        )
+    return content + "\n"
+
+
 def format_evaluation_chat_output(
-    emotional_best_idx: Optional[int],
+    emotional_best_idx: int | None,
     emotional_reasoning: str,
-    technical_best_idx: Optional[int],
+    technical_best_idx: int | None,
     technical_reasoning: str,
 ) -> str:
     """Format evaluation results for chat output.
@@ -76,103 +187,122 @@ def generate_output_paths(output_folder: Path, emotional_idx: int, technical_idx
     }
 
 
-def write_file_with_frontmatter(
-    config_template: str,
-    now: datetime,
-    input_filename: str,
-    summary_type: str,
-    summary: str,
-    output_path: Path,
-) -> None:
-
+def _as_text(summary) -> str:
     # Ensure summary is a string (defensive check)
     if isinstance(summary, list):
         summary = "\n".join(str(item) for item in summary)
-    summary = str(summary)
+    return str(summary)
 
-    frontmatter = get_frontmatter(config_template, now, input_filename, summary_type)
-    content = frontmatter + summary
-    write_file(output_path, content)
 
+def combine_summaries(emotional_summary: str, technical_summary: str) -> str:
+    """Build a combined result: the emotional summary inside the technical one."""
+    # Replace [AHA_PLACEHOLDER] with emotional summary content
+    if "[AHA_PLACEHOLDER]" in technical_summary:
+        return technical_summary.replace("[AHA_PLACEHOLDER]", emotional_summary)
 
-def write_all_output_files(
+    # Placeholder missing - prepend warning at the top with emotional summary
+    return (
+        "## ❌ ❌ Missing AHA Placeholder Section ❌ ❌\n\n"
+        + "> [!WARNING]\n"
+        + "> The technical summary did not include the `[AHA_PLACEHOLDER]` marker.\n"
+        + "> The emotional summary has been placed here at the top. Please manually move it to the correct location.\n\n"
+        + "---\n\n"
+        + emotional_summary
+        + "\n\n---\n\n"
+        + technical_summary
+    )
+
+
+def best_or_first(best_idx: int | None, candidates: list[int]) -> int:
+    """The evaluated best candidate, or the first one when there is no valid one."""
+    return best_idx if best_idx in candidates else candidates[0]
+
+
+def by_candidate(summaries: list[str] | Mapping[int, str]) -> dict[int, str]:
+    """Candidate index -> summary text (a list is indexed by position)."""
+    if not isinstance(summaries, Mapping):
+        summaries = dict(enumerate(summaries))
+    return {index: _as_text(summaries[index]) for index in sorted(summaries)}
+
+
+def render_output_files(
     output_folder: Path,
     input_filename: str,
     config_template: str,
     now: datetime,
-    emotional_summaries: list[str],
-    technical_summaries: list[str],
-    emotional_best_idx: Optional[int],
+    emotional_summaries: list[str] | Mapping[int, str],
+    technical_summaries: list[str] | Mapping[int, str],
+    emotional_best_idx: int | None,
     emotional_best_reasoning: str,
-    technical_best_idx: Optional[int],
+    technical_best_idx: int | None,
     technical_best_reasoning: str,
-) -> None:
-    """Write all output files: emotional, technical, combined results, and evaluation.
+    llm_usage: list[dict] | None = None,
+    best_result_only: bool = False,
+    node_timings: list[dict] | None = None,
+    dropped_candidates: list[str] | None = None,
+    digest_stats: dict | None = None,
+) -> dict[Path, str]:
+    """Render every output file of a run, each exactly once.
 
     Args:
         output_folder: Path to the output folder
         input_filename: Name of the input file
         config_template: Configuration template name
         now: Current datetime for frontmatter
-        emotional_summaries: List of emotional summaries
-        technical_summaries: List of technical summaries
-        emotional_best_idx: Best emotional summary index
+        emotional_summaries: Candidate index -> emotional summary, of the
+            candidates that finished (or a list, indexed by position); the
+            files are named after the candidate indices
+        technical_summaries: Same, for the technical summaries
+        emotional_best_idx: Candidate index of the best emotional summary
         emotional_best_reasoning: Reasoning for emotional choice
-        technical_best_idx: Best technical summary index
+        technical_best_idx: Candidate index of the best technical summary
         technical_best_reasoning: Reasoning for technical choice
-    """
+        llm_usage: Usage records of the run's LLM calls, appended to the evaluation
+        best_result_only: Only render the combined result of the best emotional
+            and technical summaries (see render_result_file for the others)
+        node_timings: Wall time of the nodes run so far, added to the evaluation
+        dropped_candidates: Candidate nodes cancelled by the run deadline
+        digest_stats: Token reduction of the conversation digest, if any
 
-    # Write all combined result files (emotional × technical combinations)
-    for e_idx, emotional_summary in enumerate(emotional_summaries):
-        for t_idx, technical_summary in enumerate(technical_summaries):
-            output_paths = generate_output_paths(output_folder, e_idx, t_idx)
-
-            write_file_with_frontmatter(
-                config_template,
-                now,
-                input_filename,
-                "emotional",
-                emotional_summary,
-                output_paths["emotional"],
-            )
+    Returns:
+        Output path -> file content
+    """
+    frontmatters = {
+        summary_type: get_frontmatter(
+            config_template, now, input_filename, summary_type
+        )
+        for summary_type in ("emotional", "technical", "result", "evaluation")
+    }
+    emotional_summaries = by_candidate(emotional_summaries)
+    technical_summaries = by_candidate(technical_summaries)
 
-            write_file_with_frontmatter(
-                config_template,
-                now,
-                input_filename,
-                "technical",
-                technical_summary,
-                output_paths["technical"],
-            )
+    files = {}
+    for e_idx, emotional_summary in emotional_summaries.items():
+        path = output_folder / f"emotional_{e_idx}.md"
+        files[path] = frontmatters["emotional"] + emotional_summary
+    for t_idx, technical_summary in technical_summaries.items():
+        path = output_folder / f"technical_{t_idx}.md"
+        files[path] = frontmatters["technical"] + technical_summary
 
-            #
-            # Write combined result
-            #
-            # Replace [AHA_PLACEHOLDER] with emotional summary content
-            if "[AHA_PLACEHOLDER]" in technical_summary:
-                combined_content = technical_summary.replace(
-                    "[AHA_PLACEHOLDER]", emotional_summary
-                )
-            else:
-                # Placeholder missing - prepend warning at the top with emotional summary
-                combined_content = (
-                    "## ❌ ❌ Missing AHA Placeholder Section ❌ ❌\n\n"
-                    + "> [!WARNING]\n"
-                    + "> The technical summary did not include the `[AHA_PLACEHOLDER]` marker.\n"
-                    + "> The emotional summary has been placed here at the top. Please manually move it to the correct location.\n\n"
-                    + "---\n\n"
-                    + emotional_summary
-                    + "\n\n---\n\n"
-                    + technical_summary
-                )
-            write_file_with_frontmatter(
-                config_template,
-                now,
-                input_filename,
-                "result",
-                combined_content,
-                output_paths["result"],
+    # Combined results (emotional × technical combinations)
+    if best_result_only and emotional_summaries and technical_summaries:
+        combinations = [
+            (
+                best_or_first(emotional_best_idx, list(emotional_summaries)),
+                best_or_first(technical_best_idx, list(technical_summaries)),
             )
+        ]
+    else:
+        combinations = [
+            (e_idx, t_idx)
+            for e_idx in emotional_summaries
+            for t_idx in technical_summaries
+        ]
+    for e_idx, t_idx in combinations:
+        path = output_folder / f"result_e{e_idx}_t{t_idx}.md"
+        files[path] = frontmatters["result"] + combine_summaries(
+            emotional_summaries[e_idx], technical_summaries[t_idx]
+        )
 
     evaluation_content = format_evaluation_file_content(
         emotional_best_idx=emotional_best_idx,
@@ -180,11 +310,129 @@ def write_all_output_files(
         technical_best_idx=technical_best_idx,
         technical_reasoning=technical_best_reasoning,
     )
-    write_file_with_frontmatter(
+    if dropped_candidates:
+        evaluation_content += "---\n\n" + format_dropped_candidates_section(
+            dropped_candidates
+        )
+    if node_timings:
+        evaluation_content += "---\n\n" + format_run_metrics_section(
+            summarize_run_metrics(node_timings, llm_usage, digest_stats)
+        )
+    if llm_usage:
+        evaluation_content += "---\n\n" + format_llm_usage_section(llm_usage)
+    files[output_folder / "evaluation.md"] = (
+        frontmatters["evaluation"] + evaluation_content
+    )
+    return files
+
+
+def write_all_output_files(
+    output_folder: Path,
+    input_filename: str,
+    config_template: str,
+    now: datetime,
+    emotional_summaries: list[str] | Mapping[int, str],
+    technical_summaries: list[str] | Mapping[int, str],
+    emotional_best_idx: int | None,
+    emotional_best_reasoning: str,
+    technical_best_idx: int | None,
+    technical_best_reasoning: str,
+    llm_usage: list[dict] | None = None,
+    best_result_only: bool = False,
+    node_timings: list[dict] | None = None,
+    dropped_candidates: list[str] | None = None,
+    digest_stats: dict | None = None,
+    sink: OutputSink | None = None,
+) -> SinkStats:
+    """Write all output files: emotional, technical, combined results, and evaluation.
+
+    Takes the arguments of render_output_files, plus the sink writing the files
+    (a default OutputSink when None).
+
+    Returns:
+        Which files were written and which were left unchanged
+    """
+    files = render_output_files(
+        output_folder,
+        input_filename,
         config_template,
         now,
-        input_filename,
-        "evaluation",
-        evaluation_content,
-        output_paths["evaluation"],
+        emotional_summaries,
+        technical_summaries,
+        emotional_best_idx,
+        emotional_best_reasoning,
+        technical_best_idx,
+        technical_best_reasoning,
+        llm_usage=llm_usage,
+        best_result_only=best_result_only,
+        node_timings=node_timings,
+        dropped_candidates=dropped_candidates,
+        digest_stats=digest_stats,
+    )
+    return (sink or OutputSink()).write_all(files)
+
+
+def render_metrics_file(
+    output_folder: Path,
+    input_filename: str,
+    config_template: str,
+    now: datetime,
+    node_timings: list[dict] | None,
+    llm_usage: list[dict] | None,
+    dropped_candidates: list[str] | None = None,
+    digest_stats: dict | None = None,
+) -> dict[Path, str]:
+    """Render metrics.json, the machine-readable run metrics.
+
+    Returns:
+        Output path -> file content
+    """
+    metrics = {
+        "input_filename": input_filename,
+        "config_template": config_template,
+        "generated_at": now.strftime("%Y-%m-%dT%H:%M:%S"),
+        **summarize_run_metrics(node_timings, llm_usage, digest_stats),
+        "dropped_candidates": dropped_candidates or [],
+        "llm_calls_detail": llm_usage or [],
+    }
+    return {output_folder / "metrics.json": json.dumps(metrics, indent=2) + "\n"}
+
+
+async def awrite_all_output_files(
+    *args, sink: OutputSink | None = None, **kwargs
+) -> SinkStats:
+    """Async version of write_all_output_files (same arguments)."""
+    files = render_output_files(*args, **kwargs)
+    return await (sink or OutputSink()).awrite_all(files)
+
+
+def render_result_file(
+    output_folder: Path,
+    emotional_idx: int,
+    technical_idx: int,
+    sink: OutputSink | None = None,
+) -> Path:
+    """Render one combined result on demand from a run's summary files.
+
+    Used for the combinations skipped by best_result_only.
+
+    Returns:
+        Path of the result file
+    """
+    emotional_frontmatter, emotional_summary = split_frontmatter(
+        read_file(output_folder / f"emotional_{emotional_idx}.md")
+    )
+    _, technical_summary = split_frontmatter(
+        read_file(output_folder / f"technical_{technical_idx}.md")
+    )
+    frontmatter = get_frontmatter(
+        emotional_frontmatter["review-config_template"],
+        datetime.strptime(emotional_frontmatter["generated_at"], "%Y-%m-%dT%H:%M:%S"),
+        emotional_frontmatter["review-input_file"],
+        "result",
+    )
+    path = generate_output_paths(output_folder, emotional_idx, technical_idx)["result"]
+    (sink or OutputSink()).write_all(
+        {path: frontmatter + combine_summaries(emotional_summary, technical_summary)}
     )
+    return path
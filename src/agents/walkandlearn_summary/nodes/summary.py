@@ -1,28 +1,52 @@
 """Summary generation functions."""
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import ensure_config
 
 
-def generate_summary_with_agent(agent, conversation: str) -> str:
-    """Generate a summary using the provided agent.
+def build_summary_input(conversation: str, cache_prefix: bool = False) -> dict:
+    """Build the agent input asking for a summary of the conversation.
+
+    The system prompt and this message are identical for every candidate, so
+    the whole prompt is a stable prefix that providers can cache.
 
     Args:
-        agent: The LangChain agent to use for generation
         conversation: The conversation text to summarize
+        cache_prefix: Mark the prompt as cacheable with an Anthropic
+            `cache_control` breakpoint. OpenAI and Gemini cache identical
+            prefixes implicitly and need no marker.
 
     Returns:
-        The generated summary as a string
+        The agent input (a single human message)
     """
-    result = agent.invoke(
-        {
-            "messages": [
-                HumanMessage(
-                    content=f"Here is the conversation to summarize:\n\n{conversation}"
-                )
-            ]
-        }
-    )
+    text = f"Here is the conversation to summarize:\n\n{conversation}"
+    if not cache_prefix:
+        return {"messages": [HumanMessage(content=text)]}
+
+    return {
+        "messages": [
+            HumanMessage(
+                content=[
+                    {
+                        "type": "text",
+                        "text": text,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
+            )
+        ]
+    }
+
+
+def extract_summary_text(result: dict) -> str:
+    """Extract the summary text from the last message of an agent result.
+
+    Args:
+        result: The agent result (with a "messages" list)
 
+    Returns:
+        The text of the last message
+    """
     content = result["messages"][-1].content
 
     if isinstance(content, str):
@@ -39,3 +63,80 @@ def generate_summary_with_agent(agent, conversation: str) -> str:
         return "\n".join(get_text(block) for block in content)
 
     raise ValueError(f"Unknown content type: {type(content)}")
+
+
+def generate_summary_with_agent(
+    agent, conversation: str, cache_prefix: bool = False
+) -> str:
+    """Generate a summary using the provided agent.
+
+    Args:
+        agent: The LangChain agent to use for generation
+        conversation: The conversation text to summarize
+        cache_prefix: Mark the prompt for provider-side prompt caching
+
+    Returns:
+        The generated summary as a string
+    """
+    result = agent.invoke(build_summary_input(conversation, cache_prefix))
+    return extract_summary_text(result)
+
+
+async def agenerate_summary_with_agent(
+    agent, conversation: str, cache_prefix: bool = False
+) -> str:
+    """Async version of generate_summary_with_agent (uses agent.ainvoke)."""
+    result = await agent.ainvoke(build_summary_input(conversation, cache_prefix))
+    return extract_summary_text(result)
+
+
+class MultiChoiceAgent:
+    """Agent generating n summaries of one prompt in a single model request.
+
+    Only for chat models with an `n` setting (see
+    models.supports_multiple_choices). The result's messages end with the
+    first choice, whose usage is the usage of the whole request, and its
+    "choices" hold the text of every choice.
+
+    Args:
+        model: The chat model
+        system_prompt: The system prompt of the summary agents
+        n: Number of completions to request
+    """
+
+    def __init__(self, model, system_prompt: str, n: int):
+        self.model = model.model_copy(update={"n": n})
+        self.system_prompt = system_prompt
+
+    def _prompt(self, agent_input: dict) -> list:
+        return [SystemMessage(content=self.system_prompt), *agent_input["messages"]]
+
+    @staticmethod
+    def _run_options() -> dict:
+        # The callbacks, tags and metadata of the node calling the agent
+        config = ensure_config()
+        return {
+            "callbacks": config.get("callbacks"),
+            "tags": config.get("tags"),
+            "metadata": config.get("metadata"),
+        }
+
+    @staticmethod
+    def _result(agent_input: dict, llm_result) -> dict:
+        messages = [generation.message for generation in llm_result.generations[0]]
+        return {
+            "messages": [*agent_input["messages"], messages[0]],
+            "choices": [extract_summary_text({"messages": [m]}) for m in messages],
+        }
+
+    def invoke(self, agent_input: dict) -> dict:
+        llm_result = self.model.generate(
+            [self._prompt(agent_input)], **self._run_options()
+        )
+        return self._result(agent_input, llm_result)
+
+    async def ainvoke(self, agent_input: dict) -> dict:
+        llm_result = await self.model.agenerate(
+            [self._prompt(agent_input)], **self._run_options()
+        )
+        return self._result(agent_input, llm_result)
@@ -1,14 +1,25 @@
-from src.agents.walkandlearn_summary.io import read_file
 from pathlib import Path
-from src.agents.walkandlearn_summary.config import WIP_MODE
 
+from src.agents.walkandlearn_summary.config import WIP_MODE
+from src.agents.walkandlearn_summary.io import read_file
 
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
-EMOTIONAL_SUMMARY_PROMPT = read_file(PROMPTS_DIR / "summary_emotional.md")
-TECHNICAL_SUMMARY_PROMPT = read_file(PROMPTS_DIR / "summary_technical.md")
+FULL_EMOTIONAL_SUMMARY_PROMPT = read_file(PROMPTS_DIR / "summary_emotional.md")
+FULL_TECHNICAL_SUMMARY_PROMPT = read_file(PROMPTS_DIR / "summary_technical.md")
 EVALUATION_PROMPT = read_file(PROMPTS_DIR / "evaluation.md")
+CHUNK_NOTES_PROMPT = read_file(PROMPTS_DIR / "chunk_notes.md")
+DIGEST_PROMPT = read_file(PROMPTS_DIR / "conversation_digest.md")
+
+WIP_EMOTIONAL_SUMMARY_PROMPT = "This is a quick test. Generate a short 'emotional' summary of the conversation. Maximum 2 paragraphs."
+WIP_TECHNICAL_SUMMARY_PROMPT = "This is a quick test. Generate a short 'technical' summary of the conversation. Maximum 2 paragraphs. Include the placeholder [AHA_PLACEHOLDER] where the emotional summary section should go."
+
+
+def summary_prompts(wip: bool) -> tuple[str, str]:
+    """The (emotional, technical) summary prompts of a WIP or full template."""
+    if wip:
+        return WIP_EMOTIONAL_SUMMARY_PROMPT, WIP_TECHNICAL_SUMMARY_PROMPT
+    return FULL_EMOTIONAL_SUMMARY_PROMPT, FULL_TECHNICAL_SUMMARY_PROMPT
+
 
-if WIP_MODE:
-    EMOTIONAL_SUMMARY_PROMPT = "This is a quick test. Generate a short 'emotional' summary of the conversation. Maximum 2 paragraphs."
-    TECHNICAL_SUMMARY_PROMPT = "This is a quick test. Generate a short 'technical' summary of the conversation. Maximum 2 paragraphs. Include the placeholder [AHA_PLACEHOLDER] where the emotional summary section should go."
+EMOTIONAL_SUMMARY_PROMPT, TECHNICAL_SUMMARY_PROMPT = summary_prompts(WIP_MODE)
@@ -0,0 +1,172 @@
+"""Provider-aware rate limiting for LLM calls.
+
+Each (provider, model slug) has one limiter shared by every node, subgraph and
+graph run in the process, tracking both requests/min and estimated tokens/min.
+Calls are scheduled so the limits are never exceeded, instead of hitting the
+provider's limit and backing off on 429s.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    requests_per_minute: int
+    tokens_per_minute: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for rate limiting (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBucketRateLimiter:
+    """Two token buckets (requests and tokens) refilled continuously.
+
+    Each call reserves its request and tokens up front, letting the buckets
+    go negative, and then sleeps until the deficit has been refilled. Waiting
+    callers are therefore served in arrival order without polling.
+
+    Args:
+        limit: Requests and tokens allowed per minute (also the burst size)
+        clock: Monotonic clock, in seconds
+    """
+
+    def __init__(self, limit: RateLimit, clock: Callable[[], float] = time.monotonic):
+        self.limit = limit
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests = float(limit.requests_per_minute)
+        self._tokens = float(limit.tokens_per_minute)
+        self._updated_at = clock()
+        self._waiting = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls currently waiting for capacity."""
+        return self._waiting
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._requests = min(
+            self.limit.requests_per_minute,
+            self._requests + elapsed * self.limit.requests_per_minute / 60,
+        )
+        self._tokens = min(
+            self.limit.tokens_per_minute,
+            self._tokens + elapsed * self.limit.tokens_per_minute / 60,
+        )
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve capacity for one call and return how long to wait for it.
+
+        A call larger than the whole per-minute budget is clamped to it, so it
+        waits for a full bucket instead of forever.
+        """
+        tokens = min(tokens, self.limit.tokens_per_minute)
+        with self._lock:
+            self._refill(self._clock())
+            self._requests -= 1
+            self._tokens -= tokens
+            return max(
+                0.0,
+                -self._requests * 60 / self.limit.requests_per_minute,
+                -self._tokens * 60 / self.limit.tokens_per_minute,
+            )
+
+    def acquire_sync(self, tokens: int) -> float:
+        """Block until the call may proceed; returns the seconds waited."""
+        wait_s = self.reserve(tokens)
+        if wait_s > 0:
+            with self._lock:
+                self._waiting += 1
+            try:
+                time.sleep(wait_s)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        return wait_s
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait (without blocking the event loop) until the call may proceed."""
+        wait_s = self.reserve(tokens)
+        if wait_s > 0:
+            with self._lock:
+                self._waiting += 1
+            try:
+                await asyncio.sleep(wait_s)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        return wait_s
+
+
+_LIMITERS: dict[tuple[str, str], TokenBucketRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(
+    provider: str, model_slug: str, limit: RateLimit
+) -> TokenBucketRateLimiter:
+    """Return the process-wide limiter for a (provider, model slug)."""
+    with _LIMITERS_LOCK:
+        key = (provider, model_slug)
+        if key not in _LIMITERS:
+            _LIMITERS[key] = TokenBucketRateLimiter(limit)
+        return _LIMITERS[key]
+
+
+def rate_limiter_queue_depths() -> dict[str, int]:
+    """Current queue depth of every limiter, keyed "provider/model_slug"."""
+    with _LIMITERS_LOCK:
+        return {
+            f"{provider}/{slug}": limiter.queue_depth
+            for (provider, slug), limiter in _LIMITERS.items()
+        }
+
+
+class RateLimitedAgent:
+    """Wraps an agent so every call first acquires capacity from a limiter.
+
+    Args:
+        agent: The agent to wrap (anything with invoke/ainvoke)
+        limiter: The limiter of the agent's (provider, model)
+        expected_output_tokens: Output tokens to budget per call on top of the
+            estimated input tokens
+        system_prompt: The agent's system prompt, counted in the input tokens
+    """
+
+    def __init__(
+        self,
+        agent,
+        limiter: TokenBucketRateLimiter,
+        expected_output_tokens: int,
+        system_prompt: str | None = None,
+    ):
+        self.agent = agent
+        self.limiter = limiter
+        self.expected_output_tokens = expected_output_tokens
+        self.system_prompt = system_prompt or ""
+
+    def _estimated_tokens(self, agent_input: dict) -> int:
+        input_text = "".join(str(m.content) for m in agent_input["messages"])
+        return (
+            estimate_tokens(self.system_prompt + input_text)
+            + self.expected_output_tokens
+        )
+
+    # The time spent waiting is reported on the result, for usage.UsageRecorder
+    def invoke(self, agent_input: dict, *args, **kwargs) -> dict:
+        wait_s = self.limiter.acquire_sync(self._estimated_tokens(agent_input))
+        result = self.agent.invoke(agent_input, *args, **kwargs)
+        return {**result, "rate_limit_wait_s": wait_s}
+
+    async def ainvoke(self, agent_input: dict, *args, **kwargs) -> dict:
+        wait_s = await self.limiter.acquire(self._estimated_tokens(agent_input))
+        result = await self.agent.ainvoke(agent_input, *args, **kwargs)
+        return {**result, "rate_limit_wait_s": wait_s}
@@ -0,0 +1,58 @@
+"""Render combined results on demand from a run's output folder.
+
+With OUTPUT_BEST_RESULT_ONLY, a run only writes result_e{best}_t{best}.md. The
+other emotional × technical combinations are rendered from the run's
+emotional_*.md and technical_*.md files when needed.
+
+Usage:
+    uv run python -m src.agents.walkandlearn_summary.render <output_folder> 1 2
+    uv run python -m src.agents.walkandlearn_summary.render <output_folder> --all
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from src.agents.walkandlearn_summary.nodes.output import render_result_file
+
+
+def summary_indices(output_folder: Path, summary_type: str) -> list[int]:
+    """Indices of the {summary_type}_{i}.md files in an output folder."""
+    pattern = re.compile(rf"{summary_type}_(\d+)\.md")
+    return sorted(
+        int(match.group(1))
+        for path in output_folder.glob(f"{summary_type}_*.md")
+        if (match := pattern.fullmatch(path.name))
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_folder", type=Path)
+    parser.add_argument("emotional_idx", type=int, nargs="?")
+    parser.add_argument("technical_idx", type=int, nargs="?")
+    parser.add_argument(
+        "--all", action="store_true", help="Render every missing combination"
+    )
+    args = parser.parse_args(argv)
+
+    if args.all:
+        combinations = [
+            (e_idx, t_idx)
+            for e_idx in summary_indices(args.output_folder, "emotional")
+            for t_idx in summary_indices(args.output_folder, "technical")
+            if not (args.output_folder / f"result_e{e_idx}_t{t_idx}.md").exists()
+        ]
+    elif args.emotional_idx is not None and args.technical_idx is not None:
+        combinations = [(args.emotional_idx, args.technical_idx)]
+    else:
+        parser.error("pass EMOTIONAL_IDX TECHNICAL_IDX or --all")
+
+    for e_idx, t_idx in combinations:
+        print(render_result_file(args.output_folder, e_idx, t_idx))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
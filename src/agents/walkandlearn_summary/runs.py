@@ -0,0 +1,242 @@
+"""Durable runs of the W&L summary graph, resumable by thread id.
+
+Runs started here are checkpointed after every step in a SQLite database
+(CHECKPOINT_DB_PATH). When a run fails or is interrupted, resuming its thread
+only re-executes the nodes that did not complete: the summary candidates
+(`emotional_i` / `technical_i`) that finished are kept, and so are the
+evaluations and the output if they already ran.
+
+The run's template and settings (graph.GraphSettings) are part of its config,
+so they are saved in the metadata of every checkpoint; resuming rebuilds the
+graph from them rather than from config.py. A resumed run's deadline counts
+from when it was resumed.
+
+Usage:
+    uv run python -m src.agents.walkandlearn_summary.runs start walks/2025-06-01.md
+    uv run python -m src.agents.walkandlearn_summary.runs start walks/2025-06-01.md --template main-gpt
+    uv run python -m src.agents.walkandlearn_summary.runs list
+    uv run python -m src.agents.walkandlearn_summary.runs resume <thread_id>
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from src.agents.walkandlearn_summary.config import (
+    CHECKPOINT_DB_PATH,
+    CONFIG_TEMPLATES,
+    DEFAULT_INPUT_FILENAME,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunInfo:
+    thread_id: str
+    input_filename: str | None
+    updated_at: str | None
+    next_nodes: tuple[str, ...]
+
+    @property
+    def complete(self) -> bool:
+        return not self.next_nodes
+
+
+@asynccontextmanager
+async def open_checkpointer(db_path: Path = CHECKPOINT_DB_PATH) -> AsyncIterator:
+    """Open the SQLite checkpointer, creating the database if needed."""
+    # Imported here: only durable runs need the SQLite checkpointer
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(str(db_path)) as checkpointer:
+        yield checkpointer
+
+
+def new_thread_id(input_filename: str) -> str:
+    """A readable, unique thread id for a new run of input_filename."""
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"{Path(input_filename).stem}-{timestamp}-{uuid.uuid4().hex[:6]}"
+
+
+def thread_config(thread_id: str, settings: dict | None = None) -> dict:
+    """Config of a run; settings are configurable values such as the template."""
+    return {"configurable": {**(settings or {}), "thread_id": thread_id}}
+
+
+async def saved_settings(checkpointer, thread_id: str) -> dict | None:
+    """The configurable values saved with the last checkpoint of a run.
+
+    Returns:
+        The metadata of the run's last checkpoint, None if there is no such run
+    """
+    checkpoint = await checkpointer.aget_tuple(thread_config(thread_id))
+    if checkpoint is None:
+        return None
+    return dict(checkpoint.metadata or {})
+
+
+async def list_runs(graph, checkpointer) -> list[RunInfo]:
+    """Every run in the checkpointer, most recently updated first.
+
+    Args:
+        graph: The W&L graph compiled with this checkpointer
+        checkpointer: The checkpointer holding the runs
+
+    Returns:
+        One RunInfo per thread, with the nodes still to execute
+    """
+    thread_ids = []
+    async for checkpoint in checkpointer.alist(None):
+        configurable = checkpoint.config["configurable"]
+        # Subgraph checkpoints live in the same thread, under a namespace
+        if configurable.get("checkpoint_ns"):
+            continue
+        if configurable["thread_id"] not in thread_ids:
+            thread_ids.append(configurable["thread_id"])
+
+    runs = []
+    for thread_id in thread_ids:
+        state = await graph.aget_state(thread_config(thread_id))
+        runs.append(
+            RunInfo(
+                thread_id=thread_id,
+                input_filename=state.values.get("input_filename"),
+                updated_at=state.created_at,
+                next_nodes=tuple(state.next),
+            )
+        )
+    return sorted(runs, key=lambda run: run.updated_at or "", reverse=True)
+
+
+async def run_thread(
+    graph,
+    thread_id: str,
+    graph_input: dict | None,
+    settings: dict | None = None,
+) -> None:
+    """Start (graph_input set) or resume (graph_input None) a run, with progress."""
+    async for namespace, update in graph.astream(
+        graph_input,
+        config=thread_config(thread_id, settings),
+        stream_mode="updates",
+        subgraphs=True,
+    ):
+        for node_name in update:
+            path = "/".join([*(ns.split(":")[0] for ns in namespace), node_name])
+            print(f"[{thread_id}] {path} done", flush=True)
+
+
+def print_runs(runs: list[RunInfo]) -> None:
+    if not runs:
+        print("No runs found.")
+        return
+    print(f"{'THREAD ID':<45} {'UPDATED':<20} {'INPUT':<30} NEXT")
+    for run in runs:
+        updated_at = (run.updated_at or "")[:19]
+        next_nodes = ", ".join(run.next_nodes) if run.next_nodes else "(complete)"
+        print(
+            f"{run.thread_id:<45} {updated_at:<20} "
+            f"{run.input_filename or '?':<30} {next_nodes}"
+        )
+
+
+async def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Durable, resumable W&L runs.")
+    parser.add_argument("--db", type=Path, default=CHECKPOINT_DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    start = commands.add_parser("start", help="Start a checkpointed run")
+    start.add_argument("input_filename", nargs="?", default=DEFAULT_INPUT_FILENAME)
+    start.add_argument("--thread-id", help="Defaults to <input stem>-<timestamp>")
+    start.add_argument(
+        "--template",
+        choices=sorted(CONFIG_TEMPLATES),
+        help="Config template (default: CONFIG_TEMPLATE)",
+    )
+    start.add_argument("--emotional-iterations", type=int)
+    start.add_argument("--technical-iterations", type=int)
+    start.add_argument("--no-emotional", action="store_true")
+    start.add_argument("--no-technical", action="store_true")
+    start.add_argument("--no-eval", action="store_true")
+    runs_list = commands.add_parser("list", help="List incomplete runs")
+    runs_list.add_argument(
+        "--all", action="store_true", help="Include the completed runs"
+    )
+    resume = commands.add_parser("resume", help="Resume an incomplete run")
+    resume.add_argument("thread_id")
+    args = parser.parse_args(argv)
+
+    from src.agents.walkandlearn_summary.graph import GraphSettings, build_graph
+
+    def graph_of(settings: GraphSettings):
+        return build_graph(
+            checkpointer=checkpointer,
+            config_template=settings.template,
+            num_emotional_iterations=settings.num_emotional_iterations,
+            num_technical_iterations=settings.num_technical_iterations,
+            emotional_disabled=settings.emotional_disabled,
+            technical_disabled=settings.technical_disabled,
+            eval_disabled=settings.eval_disabled,
+        )
+
+    async with open_checkpointer(args.db) as checkpointer:
+        if args.command == "list":
+            # The parent graph's state is the same whatever the settings
+            runs = await list_runs(graph_of(GraphSettings()), checkpointer)
+            print_runs([run for run in runs if args.all or not run.complete])
+            return 0
+
+        if args.command == "start":
+            thread_id = args.thread_id or new_thread_id(args.input_filename)
+            chosen = {
+                "template": args.template,
+                "num_emotional_iterations": args.emotional_iterations,
+                "num_technical_iterations": args.technical_iterations,
+                "emotional_disabled": args.no_emotional or None,
+                "technical_disabled": args.no_technical or None,
+                "eval_disabled": args.no_eval or None,
+            }
+            settings = GraphSettings.from_config(
+                {"configurable": {k: v for k, v in chosen.items() if v is not None}}
+            )
+            graph = graph_of(settings)
+            graph_input = {"input_filename": args.input_filename}
+            run_settings = settings.configurable()
+        else:
+            thread_id = args.thread_id
+            saved = await saved_settings(checkpointer, thread_id)
+            if saved is None:
+                print(f"No run with thread id {thread_id!r} in {args.db}")
+                return 1
+            # Runs saved before the settings were recorded get config.py's
+            settings = GraphSettings.from_config({"configurable": saved})
+            graph = graph_of(settings)
+            state = await graph.aget_state(thread_config(thread_id))
+            if not state.next:
+                print(f"Run {thread_id!r} is already complete")
+                return 0
+            graph_input = None  # Continue from the last checkpoint
+            # The run deadline counts again from now (see deadline.py)
+            run_settings = {**settings.configurable(), "resumed_at": time.time()}
+
+        print(f"Thread id: {thread_id} (template {settings.template})", flush=True)
+        try:
+            await run_thread(graph, thread_id, graph_input, run_settings)
+        except Exception:  # Any failure leaves a resumable run
+            logger.exception("Run %s failed", thread_id)
+            print(f"Resume with: runs resume {thread_id}")
+            return 1
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,86 @@
+"""Output sink writing a run's files into the (synced) Obsidian vault.
+
+All the files of a run are handed over at once, so each one is written exactly
+once, the writes run in parallel threads, and a file whose content did not
+change (e.g. when write_output re-runs on a resumed thread) is not rewritten,
+which would otherwise make Obsidian sync it again.
+"""
+
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.agents.walkandlearn_summary.io import write_file
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _file_hash(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+@dataclass
+class SinkStats:
+    written: list[Path] = field(default_factory=list)
+    unchanged: list[Path] = field(default_factory=list)
+
+
+class OutputSink:
+    """Write batches of files in parallel, skipping unchanged content.
+
+    Args:
+        max_workers: Maximum number of files written concurrently
+        tracer: OpenTelemetry tracer recording one span per file (optional)
+        trace_context: Context holding the parent span of the file spans
+    """
+
+    def __init__(self, max_workers: int = 8, tracer=None, trace_context=None):
+        self.max_workers = max_workers
+        self.tracer = tracer
+        self.trace_context = trace_context
+
+    def with_tracing(self, tracer, trace_context) -> "OutputSink":
+        """A copy of this sink recording its writes under the given parent span."""
+        return OutputSink(self.max_workers, tracer=tracer, trace_context=trace_context)
+
+    def _write_if_changed(self, path: Path, content: str) -> bool:
+        if _file_hash(path) == content_hash(content):
+            return False
+        write_file(path, content)
+        return True
+
+    def _write(self, path: Path, content: str) -> bool:
+        if self.tracer is None:
+            return self._write_if_changed(path, content)
+        with self.tracer.start_as_current_span(
+            "write_file",
+            context=self.trace_context,
+            attributes={"file.path": str(path), "file.size": len(content)},
+        ) as span:
+            written = self._write_if_changed(path, content)
+            span.set_attribute("wl.unchanged", not written)
+            return written
+
+    def write_all(self, files: dict[Path, str]) -> SinkStats:
+        """Write every path -> content pair; returns which ones were written."""
+        for folder in {path.parent for path in files}:
+            folder.mkdir(parents=True, exist_ok=True)
+
+        stats = SinkStats()
+        paths = list(files)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            written = pool.map(lambda path: self._write(path, files[path]), paths)
+            for path, was_written in zip(paths, written):
+                (stats.written if was_written else stats.unchanged).append(path)
+        return stats
+
+    async def awrite_all(self, files: dict[Path, str]) -> SinkStats:
+        """write_all off the event loop (the LangGraph server flags blocking I/O)."""
+        return await asyncio.to_thread(self.write_all, files)
@@ -0,0 +1,318 @@
+"""Sweep mode: run one transcript through several config templates.
+
+Every template runs concurrently in this process, through its own compiled
+graph (see graph.make_graph), so the templates share the chat model clients,
+the rate limiters of each provider and the response cache. The transcript is
+read once and handed to every run (the input_text of the graph input). Each
+run holds one slot of every provider its template uses, within
+BATCH_MAX_CONCURRENCY_PER_PROVIDER. The runs write their usual output
+folders; the sweep adds one report comparing the templates' wall time,
+tokens, cost and the evaluator's picks, under
+<output folder of the input>/sweeps.
+
+Usage:
+    uv run python -m src.agents.walkandlearn_summary.sweep input.md
+    uv run python -m src.agents.walkandlearn_summary.sweep input.md --templates main-claude main-gpt
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from src.agents.walkandlearn_summary.batch import (
+    ProviderSlots,
+    parse_provider_limits,
+    template_providers,
+)
+from src.agents.walkandlearn_summary.config import (
+    BATCH_MAX_CONCURRENCY,
+    CONFIG_TEMPLATES,
+    INPUT_DIR,
+    SWEEP_TEMPLATES,
+    get_input_file_path,
+    get_output_base_folder,
+    template_models,
+)
+from src.agents.walkandlearn_summary.io import read_file
+from src.agents.walkandlearn_summary.metrics import summarize_run_metrics
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_TYPES = ("emotional", "technical")
+
+
+@dataclass
+class SweepResult:
+    template: str
+    status: str  # "done" or "failed"
+    duration_s: float = 0.0
+    metrics: dict = field(default_factory=dict)
+    picks: dict = field(default_factory=dict)
+    error: str | None = None
+
+
+def evaluator_picks(state: dict) -> dict:
+    """Summary type -> the candidate the evaluator picked, among how many, and why."""
+    return {
+        summary_type: {
+            "best_idx": state.get(f"{summary_type}_best_idx"),
+            "candidates": len(state.get(f"{summary_type}_summaries") or {}),
+            "reasoning": state.get(f"{summary_type}_best_reasoning"),
+        }
+        for summary_type in SUMMARY_TYPES
+    }
+
+
+def template_model_names(template: str) -> dict[str, str]:
+    """Role -> model friendly name of a template."""
+    models = template_models(template)
+    return {role: models.friendly_name(role) for role in models}
+
+
+async def run_template(
+    graph,
+    template: str,
+    input_filename: str,
+    slots: ProviderSlots,
+    graph_config: dict | None = None,
+    input_text: str | None = None,
+) -> SweepResult:
+    """Run the input through one template's graph, holding its providers' slots.
+
+    input_text is the already-read transcript (the graph reads the file when
+    None).
+    """
+    config = dict(graph_config or {})
+    config["configurable"] = {**config.get("configurable", {}), "template": template}
+    graph_input = {"input_filename": input_filename, "input_text": input_text}
+    async with slots.hold(template_providers(template)):
+        print(f"{template}: started", flush=True)
+        start = time.perf_counter()
+        try:
+            state = await graph.ainvoke(graph_input, config)
+        except Exception as e:  # One failing template must not stop the sweep
+            logger.exception("Sweep run of %s failed", template)
+            return SweepResult(
+                template,
+                "failed",
+                duration_s=time.perf_counter() - start,
+                error=repr(e),
+            )
+
+    duration_s = time.perf_counter() - start
+    print(f"{template}: finished in {duration_s:.1f}s", flush=True)
+    return SweepResult(
+        template,
+        "done",
+        duration_s=duration_s,
+        metrics=summarize_run_metrics(
+            state.get("node_timings"),
+            state.get("llm_usage"),
+            state.get("digest_stats"),
+        ),
+        picks=evaluator_picks(state),
+    )
+
+
+async def run_sweep(
+    input_filename: str,
+    templates: list[str],
+    graph_factory: Callable[[dict], object] | None = None,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+    provider_limits: dict[str, int] | None = None,
+    graph_config: dict | None = None,
+) -> list[SweepResult]:
+    """Run one input through every template concurrently.
+
+    The input file is read once, and its text handed to every run.
+
+    Args:
+        input_filename: Input file, relative to INPUT_DIR
+        templates: Keys of CONFIG_TEMPLATES
+        graph_factory: Config -> compiled graph (graph.make_graph when None)
+        max_concurrency: Maximum number of templates in flight
+        provider_limits: Maximum number of templates in flight per provider
+        graph_config: RunnableConfig passed to every run (the template is added)
+
+    Returns:
+        One result per template, in the order given
+    """
+    if graph_factory is None:
+        from src.agents.walkandlearn_summary.graph import make_graph
+
+        graph_factory = make_graph
+
+    # Compiled before the runs start, so unknown templates fail the sweep early
+    graphs = [
+        graph_factory({"configurable": {"template": template}})
+        for template in templates
+    ]
+    providers = sorted(
+        {p for template in templates for p in template_providers(template)}
+    )
+    slots = ProviderSlots(max_concurrency, provider_limits, providers)
+    input_text = await asyncio.to_thread(read_file, get_input_file_path(input_filename))
+    return list(
+        await asyncio.gather(
+            *(
+                run_template(
+                    graph, template, input_filename, slots, graph_config, input_text
+                )
+                for graph, template in zip(graphs, templates)
+            )
+        )
+    )
+
+
+def _format_pick(pick: dict | None) -> str:
+    if not pick or not pick["candidates"]:
+        return "-"
+    if pick["best_idx"] is None:
+        return f"- of {pick['candidates']}"
+    return f"#{pick['best_idx']} of {pick['candidates']}"
+
+
+def format_sweep_report(
+    input_filename: str, results: list[SweepResult], now: datetime
+) -> str:
+    """Render the comparison of the templates as markdown.
+
+    Each template's picks come from its own evaluation model, so they rank the
+    template's candidates, not the templates against each other.
+    """
+    content = f"# Template Sweep: {input_filename}\n\n"
+    content += f"Generated at {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    content += (
+        "| Template | Status | Wall (s) | LLM calls | Wait (s) | Input | Output "
+        "| Cost ($) | Emotional pick | Technical pick |\n"
+    )
+    content += "|---|---|---|---|---|---|---|---|---|---|\n"
+    for result in results:
+        metrics = result.metrics
+        if result.status != "done":
+            content += (
+                f"| {result.template} | {result.status} | {result.duration_s:.1f} "
+                "| - | - | - | - | - | - | - |\n"
+            )
+            continue
+        cost = f"{metrics['cost_usd']:.4f}"
+        if metrics["unpriced_calls"]:
+            cost += "*"
+        content += (
+            f"| {result.template} | {result.status} | {result.duration_s:.1f} "
+            f"| {metrics['llm_calls']} | {metrics['wait_s']:.1f} "
+            f"| {metrics['input_tokens']} | {metrics['output_tokens']} | {cost} "
+            f"| {_format_pick(result.picks.get('emotional'))} "
+            f"| {_format_pick(result.picks.get('technical'))} |\n"
+        )
+    content += "\n"
+    if any(r.metrics.get("unpriced_calls") for r in results):
+        content += (
+            "\\* Some calls used models without catalog prices and are not "
+            "included in the cost.\n\n"
+        )
+
+    for result in results:
+        content += f"## {result.template}\n\n"
+        models = template_model_names(result.template)
+        content += (
+            ", ".join(f"**{role}:** {name}" for role, name in models.items()) + "\n\n"
+        )
+        if result.status != "done":
+            content += f"Failed: `{result.error}`\n\n"
+            continue
+        for summary_type in SUMMARY_TYPES:
+            pick = result.picks.get(summary_type) or {}
+            if pick.get("reasoning"):
+                content += (
+                    f"**{summary_type.capitalize()} pick "
+                    f"({_format_pick(pick)}):** {pick['reasoning'].strip()}\n\n"
+                )
+    return content
+
+
+def write_sweep_report(
+    input_filename: str, results: list[SweepResult], now: datetime
+) -> Path:
+    """Write the sweep's markdown report and its JSON data next to each other.
+
+    Returns:
+        Path of the markdown report
+    """
+    folder = get_output_base_folder(input_filename) / "sweeps"
+    folder.mkdir(parents=True, exist_ok=True)
+    stem = now.strftime("%Y%m%d-%H%M%S")
+    report_path = folder / f"{stem}.md"
+    report_path.write_text(
+        format_sweep_report(input_filename, results, now), encoding="utf-8"
+    )
+    data = {
+        "input_filename": input_filename,
+        "generated_at": now.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": [
+            {**asdict(r), "models": template_model_names(r.template)} for r in results
+        ],
+    }
+    (folder / f"{stem}.json").write_text(
+        json.dumps(data, indent=2) + "\n", encoding="utf-8"
+    )
+    return report_path
+
+
+async def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare config templates on one W&L transcript."
+    )
+    parser.add_argument("input_filename", help=f"Input file, relative to {INPUT_DIR}")
+    parser.add_argument(
+        "--templates",
+        nargs="+",
+        default=list(SWEEP_TEMPLATES),
+        choices=sorted(CONFIG_TEMPLATES),
+        metavar="TEMPLATE",
+        help=f"Templates to compare (default: {' '.join(SWEEP_TEMPLATES)})",
+    )
+    parser.add_argument("--max-concurrency", type=int, default=BATCH_MAX_CONCURRENCY)
+    parser.add_argument(
+        "--provider-limit",
+        action="append",
+        default=[],
+        metavar="PROVIDER=N",
+        help="Override a per-provider limit (repeatable)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the response cache lookups (fresh responses are still stored)",
+    )
+    args = parser.parse_args(argv)
+
+    if not get_input_file_path(args.input_filename).is_file():
+        print(f"No input file {args.input_filename!r} in {INPUT_DIR}")
+        return 1
+
+    templates = list(dict.fromkeys(args.templates))
+    results = await run_sweep(
+        args.input_filename,
+        templates,
+        max_concurrency=args.max_concurrency,
+        provider_limits=parse_provider_limits(args.provider_limit),
+        graph_config={"configurable": {"bypass_response_cache": args.no_cache}},
+    )
+    now = datetime.now()
+    report_path = write_sweep_report(args.input_filename, results, now)
+    print()
+    print(format_sweep_report(args.input_filename, results, now))
+    print(f"Report written to {report_path}")
+    return 1 if any(r.status == "failed" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
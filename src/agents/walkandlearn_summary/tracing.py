@@ -0,0 +1,343 @@
+"""Opt-in OpenTelemetry tracing of W&L graph runs (WL_TRACING=on).
+
+GraphTracer is a LangChain callback handler turning every graph run into one
+trace: a root span for the run, and child spans for the subgraphs, the summary
+candidates, the evaluations, the LLM calls (with model and token attributes)
+and the output file writes. Span start/end times show how many candidates
+actually ran concurrently, see `summarize`.
+
+Spans are appended to a local JSON-lines file, so tracing works offline, or
+sent to an OTLP collector (e.g. Arize Phoenix) when WL_TRACING_ENDPOINT is set.
+
+Usage:
+    WL_TRACING=on uv run python -m src.agents.walkandlearn_summary.runs start walk.md
+    uv run python -m src.agents.walkandlearn_summary.tracing summarize
+"""
+
+import argparse
+import json
+import sys
+import threading
+from collections.abc import Sequence
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from openinference.semconv.trace import OpenInferenceSpanKindValues, SpanAttributes
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from src.agents.walkandlearn_summary.config import TRACING_ENDPOINT, TRACING_FILE
+
+SERVICE_NAME = "walkandlearn_summary"
+ROOT_SPAN_NAME = "walkandlearn_summary.run"
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+@cache
+def get_tracer_provider(
+    traces_path: Path = TRACING_FILE, endpoint: str | None = TRACING_ENDPOINT
+) -> TracerProvider:
+    """The process-wide tracer provider, exporting to a file or a collector."""
+    if endpoint:
+        from arize.otel import Transport, register
+
+        return register(
+            endpoint=endpoint,
+            transport=Transport.HTTP,
+            project_name=SERVICE_NAME,
+            set_global_tracer_provider=False,
+            verbose=False,
+        )
+
+    provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter(traces_path)))
+    return provider
+
+
+def _chain_kind() -> dict:
+    return {
+        SpanAttributes.OPENINFERENCE_SPAN_KIND: OpenInferenceSpanKindValues.CHAIN.value
+    }
+
+
+class GraphTracer(BaseCallbackHandler):
+    """LangChain callback handler recording graph runs as OpenTelemetry spans.
+
+    Args:
+        provider: Tracer provider the spans are created with
+    """
+
+    def __init__(self, provider: TracerProvider):
+        self.provider = provider
+        self.tracer = provider.get_tracer(__name__)
+        self._spans: dict[UUID, trace.Span] = {}
+        # Parent of the runs without a span (LangGraph's hidden internal runs)
+        self._parents: dict[UUID, UUID | None] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def from_config(config: dict | None) -> tuple["GraphTracer", UUID] | None:
+        """The tracer and current run id of a node's config, if the run is traced."""
+        callbacks = (config or {}).get("callbacks")
+        run_id = getattr(callbacks, "parent_run_id", None)
+        for handler in getattr(callbacks, "handlers", []):
+            if isinstance(handler, GraphTracer) and run_id is not None:
+                return handler, run_id
+        return None
+
+    def context_for(self, run_id: UUID | None) -> Context:
+        """Context whose current span is the closest traced ancestor of run_id."""
+        with self._lock:
+            while run_id is not None and run_id not in self._spans:
+                run_id = self._parents.get(run_id)
+            span = self._spans.get(run_id) if run_id is not None else None
+        # An empty context makes the new span the root of a new trace
+        return trace.set_span_in_context(span) if span else Context()
+
+    def _start(
+        self,
+        name: str,
+        run_id: UUID,
+        parent_run_id: UUID | None,
+        attributes: dict,
+    ) -> None:
+        span = self.tracer.start_span(
+            name, context=self.context_for(parent_run_id), attributes=attributes
+        )
+        with self._lock:
+            self._spans[run_id] = span
+
+    def _end(self, run_id: UUID, error: BaseException | None = None) -> None:
+        with self._lock:
+            span = self._spans.pop(run_id, None)
+            self._parents.pop(run_id, None)
+        if span is None:
+            return
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, repr(error)))
+        span.end()
+        if span.name == ROOT_SPAN_NAME:
+            self.provider.force_flush()
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any] | None,
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        tags: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if "langsmith:hidden" in (tags or []):
+            with self._lock:
+                self._parents[run_id] = parent_run_id
+            return
+
+        metadata = metadata or {}
+        attributes = _chain_kind()
+        if parent_run_id is None:
+            name = ROOT_SPAN_NAME
+            if isinstance(inputs, dict) and inputs.get("input_filename"):
+                attributes["wl.input_filename"] = inputs["input_filename"]
+        else:
+            name = kwargs.get("name") or (serialized or {}).get("name") or "chain"
+            if name == "LangGraph" and "langgraph_node" in metadata:
+                # A subgraph (or an agent) run by the node it is attached to
+                name = f"{metadata['langgraph_node']}.graph"
+            if "langgraph_node" in metadata:
+                attributes["langgraph.node"] = metadata["langgraph_node"]
+                attributes["langgraph.step"] = metadata.get("langgraph_step", -1)
+        self._start(name, run_id, parent_run_id, attributes)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any] | None,
+        messages: list,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        invocation_params = kwargs.get("invocation_params") or {}
+        model_name = (
+            invocation_params.get("model")
+            or invocation_params.get("model_name")
+            or (metadata or {}).get("ls_model_name")
+            or "unknown"
+        )
+        self._start(
+            f"llm {model_name}",
+            run_id,
+            parent_run_id,
+            {
+                SpanAttributes.OPENINFERENCE_SPAN_KIND: (
+                    OpenInferenceSpanKindValues.LLM.value
+                ),
+                SpanAttributes.LLM_MODEL_NAME: str(model_name),
+            },
+        )
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            span = self._spans.get(run_id)
+        if span is not None:
+            for generations in response.generations:
+                for generation in generations:
+                    message = getattr(generation, "message", None)
+                    usage = getattr(message, "usage_metadata", None) or {}
+                    if usage:
+                        span.set_attributes(
+                            {
+                                SpanAttributes.LLM_TOKEN_COUNT_PROMPT: usage.get(
+                                    "input_tokens", 0
+                                ),
+                                SpanAttributes.LLM_TOKEN_COUNT_COMPLETION: usage.get(
+                                    "output_tokens", 0
+                                ),
+                                SpanAttributes.LLM_TOKEN_COUNT_TOTAL: usage.get(
+                                    "total_tokens", 0
+                                ),
+                            }
+                        )
+        self._end(run_id)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+
+def _parse_time(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
+def max_concurrency(intervals: list[tuple[float, float]]) -> int:
+    """Largest number of (start, end) intervals overlapping at any time."""
+    events = sorted(
+        [(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals]
+    )
+    current = peak = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def summarize_traces(traces_path: Path) -> list[dict]:
+    """Per trace: duration, and the actual concurrency of each fan-out.
+
+    Returns:
+        One dict per trace with its duration and, for every span with more
+        than one node child, the number of children and their peak concurrency
+    """
+    spans = [
+        json.loads(line)
+        for line in traces_path.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    by_id = {span["context"]["span_id"]: span for span in spans}
+    children: dict[str, list[dict]] = {}
+    for span in spans:
+        if span.get("parent_id") and "langgraph.node" in span.get("attributes", {}):
+            children.setdefault(span["parent_id"], []).append(span)
+
+    summaries = []
+    for root in (s for s in spans if s["name"] == ROOT_SPAN_NAME):
+        trace_id = root["context"]["trace_id"]
+        fan_outs = []
+        for parent_id, nodes in children.items():
+            parent = by_id.get(parent_id)
+            if parent is None or parent["context"]["trace_id"] != trace_id:
+                continue
+            if len(nodes) > 1:
+                intervals = [
+                    (_parse_time(n["start_time"]), _parse_time(n["end_time"]))
+                    for n in nodes
+                ]
+                fan_outs.append(
+                    {
+                        "span": parent["name"],
+                        "nodes": len(nodes),
+                        "max_concurrency": max_concurrency(intervals),
+                    }
+                )
+        summaries.append(
+            {
+                "trace_id": trace_id,
+                "input_filename": root.get("attributes", {}).get("wl.input_filename"),
+                "duration_s": _parse_time(root["end_time"])
+                - _parse_time(root["start_time"]),
+                "fan_outs": fan_outs,
+            }
+        )
+    return summaries
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect W&L run traces.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summarize = commands.add_parser(
+        "summarize", help="Duration and actual fan-out concurrency of each run"
+    )
+    summarize.add_argument("traces_path", type=Path, nargs="?", default=TRACING_FILE)
+    args = parser.parse_args(argv)
+
+    if not args.traces_path.exists():
+        print(f"No traces at {args.traces_path} (run with WL_TRACING=on)")
+        return 1
+    for summary in summarize_traces(args.traces_path):
+        print(
+            f"{summary['trace_id']} {summary['input_filename'] or '?'} "
+            f"{summary['duration_s']:.1f}s"
+        )
+        for fan_out in summary["fan_outs"]:
+            print(
+                f"    {fan_out['span']}: {fan_out['nodes']} nodes, "
+                f"max {fan_out['max_concurrency']} concurrent"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
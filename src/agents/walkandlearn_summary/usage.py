@@ -0,0 +1,105 @@
+"""Token usage collected from the LLM calls of a run."""
+
+import time
+
+from src.agents.walkandlearn_summary.models import cost_of_call
+
+
+def extract_usage(result: dict) -> dict:
+    """Sum the token usage reported on the AI messages of an agent result.
+
+    Args:
+        result: The agent result (with a "messages" list)
+
+    Returns:
+        Input, output, cache-read and cache-creation token counts, whether the
+        response came from the on-disk response cache, and the time spent
+        waiting for the rate limiter
+    """
+    usage = {
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_creation_tokens": 0,
+        "response_cache_hit": False,
+        "wait_s": result.get("rate_limit_wait_s", 0.0),
+    }
+    for message in result.get("messages", []):
+        if getattr(message, "type", None) != "ai":
+            continue
+        if (getattr(message, "response_metadata", None) or {}).get("response_cache"):
+            usage["response_cache_hit"] = True
+        metadata = getattr(message, "usage_metadata", None) or {}
+        details = metadata.get("input_token_details") or {}
+        usage["input_tokens"] += metadata.get("input_tokens", 0)
+        usage["output_tokens"] += metadata.get("output_tokens", 0)
+        usage["cache_read_tokens"] += details.get("cache_read", 0) or 0
+        usage["cache_creation_tokens"] += details.get("cache_creation", 0) or 0
+    return usage
+
+
+class UsageRecorder:
+    """Wraps an agent and records the usage, latency and cost of every call.
+
+    Args:
+        agent: The agent to wrap (anything with invoke/ainvoke)
+        node: Name of the graph node making the calls
+        model_slug: Slug of the agent's model
+    """
+
+    def __init__(self, agent, node: str, model_slug: str):
+        self.agent = agent
+        self.node = node
+        self.model_slug = model_slug
+        self.records: list[dict] = []
+
+    def _record(self, result: dict, started: float) -> dict:
+        usage = extract_usage(result)
+        # A hedged call (see hedging.HedgedAgent) may be answered by the backup
+        model_slug = result.get("hedge_model") or self.model_slug
+        hedge_cost = result.get("hedge_cost_usd", 0.0)
+        cost = cost_of_call(
+            model_slug,
+            input_tokens=usage["input_tokens"],
+            output_tokens=usage["output_tokens"],
+            cache_read_tokens=usage["cache_read_tokens"],
+            cache_creation_tokens=usage["cache_creation_tokens"],
+        )
+        self.records.append(
+            {
+                "node": self.node,
+                "model": model_slug,
+                **usage,
+                "latency_s": time.perf_counter() - started,
+                "cost_usd": None if cost is None else cost + hedge_cost,
+                # None when the call was not hedgeable
+                "hedged": result.get("hedged"),
+                "hedge_cost_usd": hedge_cost,
+            }
+        )
+        return result
+
+    def invoke(self, agent_input: dict, *args, **kwargs) -> dict:
+        started = time.perf_counter()
+        return self._record(self.agent.invoke(agent_input, *args, **kwargs), started)
+
+    async def ainvoke(self, agent_input: dict, *args, **kwargs) -> dict:
+        started = time.perf_counter()
+        result = await self.agent.ainvoke(agent_input, *args, **kwargs)
+        return self._record(result, started)
+
+
+def summarize_prompt_cache(llm_usage: list[dict] | None) -> dict:
+    """Aggregate provider prompt-cache metrics over all calls of a run."""
+    records = llm_usage or []
+    input_tokens = sum(r["input_tokens"] for r in records)
+    cache_read = sum(r["cache_read_tokens"] for r in records)
+    return {
+        "calls": len(records),
+        "calls_with_cache_hit": sum(1 for r in records if r["cache_read_tokens"]),
+        "response_cache_hits": sum(1 for r in records if r["response_cache_hit"]),
+        "input_tokens": input_tokens,
+        "cache_read_tokens": cache_read,
+        "cache_creation_tokens": sum(r["cache_creation_tokens"] for r in records),
+        "cache_hit_ratio": cache_read / input_tokens if input_tokens else 0.0,
+    }
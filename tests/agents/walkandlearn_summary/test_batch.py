@@ -0,0 +1,147 @@
+"""Tests for batch mode."""
+
+import asyncio
+
+from src.agents.walkandlearn_summary import config
+from src.agents.walkandlearn_summary.batch import (
+    BatchRunner,
+    find_input_files,
+    has_existing_output,
+    parse_provider_limits,
+)
+
+
+class FakeGraph:
+    """Stands in for the compiled graph and records how many runs overlap."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.inputs = []
+
+    async def astream(self, graph_input, config, stream_mode, subgraphs):
+        self.inputs.append(graph_input["input_filename"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if graph_input["input_filename"] in self.fail_on:
+                raise RuntimeError("boom")
+            yield (), {"load_conversation": {}}
+            yield (), {"write_output": {}}
+        finally:
+            self.in_flight -= 1
+
+
+class TestFindInputFiles:
+    """Test find_input_files function."""
+
+    def test_lists_markdown_files_of_a_directory(self, tmp_path):
+        """Test that a directory selects every .md file in it."""
+        (tmp_path / "walks").mkdir()
+        (tmp_path / "walks" / "b.md").write_text("b")
+        (tmp_path / "walks" / "a.md").write_text("a")
+        (tmp_path / "walks" / "notes.txt").write_text("n")
+
+        result = find_input_files("walks", input_dir=tmp_path)
+
+        assert result == ["walks/a.md", "walks/b.md"]
+
+    def test_lists_files_matching_a_glob(self, tmp_path):
+        """Test that a glob is resolved relative to the input folder."""
+        (tmp_path / "input-1.md").write_text("1")
+        (tmp_path / "input-2.md").write_text("2")
+        (tmp_path / "other.md").write_text("o")
+
+        result = find_input_files("input-*.md", input_dir=tmp_path)
+
+        assert result == ["input-1.md", "input-2.md"]
+
+
+class TestHasExistingOutput:
+    """Test has_existing_output function."""
+
+    def test_detects_a_completed_run_folder(self, tmp_path, monkeypatch):
+        """Test that a run folder with an evaluation file counts as output."""
+        monkeypatch.setattr(config, "OUTPUT_FILE_PATH_OBSIDIAN_BASE", tmp_path)
+        run_folder = tmp_path / "walks" / "walk-1" / "20260101-120000"
+        run_folder.mkdir(parents=True)
+
+        assert not has_existing_output("walks/walk-1.md")
+
+        (run_folder / "evaluation.md").write_text("done")
+
+        assert has_existing_output("walks/walk-1.md")
+
+    def test_same_name_in_another_folder_is_not_done(self, tmp_path, monkeypatch):
+        """Test that outputs of a/x.md do not mark b/x.md as processed."""
+        monkeypatch.setattr(config, "OUTPUT_FILE_PATH_OBSIDIAN_BASE", tmp_path)
+        run_folder = tmp_path / "a" / "x" / "20260101-120000"
+        run_folder.mkdir(parents=True)
+        (run_folder / "evaluation.md").write_text("done")
+
+        assert has_existing_output("a/x.md")
+        assert not has_existing_output("b/x.md")
+
+
+class TestBatchRunner:
+    """Test BatchRunner class."""
+
+    def test_respects_the_global_concurrency_limit(self):
+        """Test that no more than max_concurrency files run at once."""
+        graph = FakeGraph()
+        runner = BatchRunner(graph, max_concurrency=2)
+
+        results = asyncio.run(runner.run([f"f{i}.md" for i in range(6)], force=True))
+
+        assert [r.status for r in results] == ["done"] * 6
+        assert graph.max_in_flight == 2
+
+    def test_respects_the_provider_limit(self):
+        """Test that the provider limit applies when lower than the global one."""
+        graph = FakeGraph()
+        runner = BatchRunner(
+            graph,
+            max_concurrency=4,
+            provider_limits={"Anthropic": 1},
+            providers=["Anthropic", "OpenAI"],
+        )
+
+        asyncio.run(runner.run([f"f{i}.md" for i in range(3)], force=True))
+
+        assert graph.max_in_flight == 1
+
+    def test_a_failing_file_does_not_stop_the_batch(self):
+        """Test that a failure is recorded and the other files still run."""
+        graph = FakeGraph(fail_on={"bad.md"})
+        runner = BatchRunner(graph, max_concurrency=2)
+
+        results = asyncio.run(runner.run(["bad.md", "good.md"], force=True))
+
+        statuses = {r.input_filename: r.status for r in results}
+        assert statuses == {"bad.md": "failed", "good.md": "done"}
+
+    def test_skips_files_with_existing_outputs(self, tmp_path, monkeypatch):
+        """Test that already processed files are not run again."""
+        monkeypatch.setattr(config, "OUTPUT_FILE_PATH_OBSIDIAN_BASE", tmp_path)
+        (tmp_path / "old" / "20260101-120000").mkdir(parents=True)
+        (tmp_path / "old" / "20260101-120000" / "evaluation.md").write_text("x")
+        graph = FakeGraph()
+        runner = BatchRunner(graph)
+
+        results = asyncio.run(runner.run(["old.md", "new.md"]))
+
+        assert graph.inputs == ["new.md"]
+        assert {r.input_filename: r.status for r in results} == {
+            "old.md": "skipped",
+            "new.md": "done",
+        }
+
+
+def test_parse_provider_limits_overrides_defaults():
+    """Test that CLI overrides are merged into the configured limits."""
+    limits = parse_provider_limits(["Anthropic=1"])
+
+    assert limits["Anthropic"] == 1
+    assert limits["OpenAI"] == config.BATCH_MAX_CONCURRENCY_PER_PROVIDER["OpenAI"]
@@ -0,0 +1,100 @@
+"""Tests for the content-addressed blob store."""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.agents.walkandlearn_summary.blobs import (
+    BlobStore,
+    aput_text,
+    aresolve_text,
+    is_handle,
+    put_text,
+    resolve_text,
+)
+
+
+def make_store(tmp_path, max_age_s=3600, memory_bytes=1024):
+    return BlobStore(tmp_path, max_age_s=max_age_s, memory_bytes=memory_bytes)
+
+
+class TestBlobStore:
+    """Test BlobStore class."""
+
+    def test_same_content_gets_the_same_handle(self, tmp_path):
+        store = make_store(tmp_path)
+
+        handle = store.put("A long conversation")
+
+        assert is_handle(handle)
+        assert store.put("A long conversation") == handle
+        assert store.put("Another conversation") != handle
+        assert len(list(tmp_path.glob("*/*.txt"))) == 2
+
+    def test_reads_back_from_disk_in_another_store(self, tmp_path):
+        """Test that a handle outlives the process (e.g. a resumed run)."""
+        handle = make_store(tmp_path).put("Stored text")
+
+        assert make_store(tmp_path).get(handle) == "Stored text"
+
+    def test_async_get_reads_from_disk_then_from_memory(self, tmp_path):
+        handle = make_store(tmp_path).put("Stored text")
+        store = make_store(tmp_path)
+
+        assert asyncio.run(store.aget(handle)) == "Stored text"
+        for path in tmp_path.glob("*/*.txt"):
+            path.unlink()
+        assert asyncio.run(store.aget(handle)) == "Stored text"
+        with pytest.raises(KeyError):
+            asyncio.run(make_store(tmp_path).aget(handle))
+
+    def test_memory_cache_is_bounded(self, tmp_path):
+        store = make_store(tmp_path, memory_bytes=10)
+        first = store.put("x" * 8)
+        store.put("y" * 8)
+
+        assert first not in store._memory
+        # Still served from disk
+        assert store.get(first) == "x" * 8
+
+    def test_missing_blob_raises_key_error(self, tmp_path):
+        with pytest.raises(KeyError):
+            make_store(tmp_path).get("blob:" + "0" * 64)
+
+    def test_evicts_blobs_not_stored_for_max_age(self, tmp_path):
+        store = make_store(tmp_path, max_age_s=60)
+        old = store.put("Old text")
+        store.put("Recent text")
+        old_path = next(p for p in tmp_path.glob("*/*.txt") if p.stem in old)
+        os.utime(old_path, (time.time() - 120, time.time() - 120))
+
+        assert store.evict() == 1
+        assert len(list(tmp_path.glob("*/*.txt"))) == 1
+
+
+class TestStateValues:
+    """Test put_text and resolve_text functions."""
+
+    def test_without_a_store_the_state_keeps_the_text(self):
+        assert put_text(None, "Text") == "Text"
+        assert resolve_text(None, "Text") == "Text"
+
+    def test_resolves_handles_and_passes_plain_text_through(self, tmp_path):
+        store = make_store(tmp_path)
+        handle = asyncio.run(aput_text(store, "Summary"))
+
+        assert resolve_text(store, handle) == "Summary"
+        assert resolve_text(store, "[Emotional summary 0 is disabled]") == (
+            "[Emotional summary 0 is disabled]"
+        )
+        assert resolve_text(store, None) is None
+
+    def test_async_resolve(self, tmp_path):
+        store = make_store(tmp_path)
+        handle = store.put("Summary")
+
+        assert asyncio.run(aresolve_text(store, handle)) == "Summary"
+        assert asyncio.run(aresolve_text(store, "Text")) == "Text"
+        assert asyncio.run(aresolve_text(None, handle)) == handle
@@ -0,0 +1,195 @@
+"""Tests for the response cache."""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, Mock
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.walkandlearn_summary.cache import CachedAgent, ResponseCache
+
+
+def make_cache(tmp_path, max_bytes=10_000_000, max_age_s=3600):
+    return ResponseCache(tmp_path, max_bytes=max_bytes, max_age_s=max_age_s)
+
+
+def make_key(**overrides):
+    fields = {
+        "kind": "summary",
+        "model_slug": "claude-sonnet-4-5",
+        "temperature": 0.8,
+        "system_prompt": "Summarize",
+        "input_text": "conversation",
+        "candidate_index": 0,
+    }
+    return ResponseCache.make_key(**{**fields, **overrides})
+
+
+def agent_returning(content):
+    agent = Mock()
+    agent.invoke.return_value = {"messages": [AIMessage(content=content)]}
+    agent.ainvoke = AsyncMock(return_value={"messages": [AIMessage(content=content)]})
+    return agent
+
+
+AGENT_INPUT = {"messages": [HumanMessage(content="Here is the conversation")]}
+
+
+class TestResponseCacheKey:
+    """Test ResponseCache.make_key."""
+
+    def test_same_inputs_give_same_key(self):
+        """Test that the key is deterministic."""
+        assert make_key() == make_key()
+
+    def test_every_field_changes_the_key(self):
+        """Test that each field that determines the response is part of the key."""
+        base = make_key()
+        for field, value in [
+            ("model_slug", "gpt-5.2"),
+            ("temperature", 0.7),
+            ("system_prompt", "Other"),
+            ("input_text", "other conversation"),
+            ("candidate_index", 1),
+        ]:
+            assert make_key(**{field: value}) != base, field
+
+
+class TestResponseCache:
+    """Test ResponseCache storage and eviction."""
+
+    def test_round_trips_a_response(self, tmp_path):
+        """Test that a stored response is returned on the next lookup."""
+        cache = make_cache(tmp_path)
+
+        assert cache.get("ab" * 32) is None
+        cache.put("ab" * 32, "A summary")
+
+        assert cache.get("ab" * 32) == "A summary"
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Test that entries older than max_age_s are not served."""
+        cache = make_cache(tmp_path, max_age_s=60)
+        cache.put("ab" * 32, "Old summary")
+        path = next(tmp_path.glob("*/*.json"))
+        old = time.time() - 120
+        os.utime(path, (old, old))
+
+        assert cache.get("ab" * 32) is None
+        assert not path.exists()
+
+    def test_evicts_least_recently_used_entries_over_max_bytes(self, tmp_path):
+        """Test that the oldest entries go first when the cache is too large."""
+        cache = make_cache(tmp_path, max_bytes=10_000_000)
+        for i, key in enumerate(["aa" * 32, "bb" * 32, "cc" * 32]):
+            cache.put(key, "x" * 1000)
+            path = next(tmp_path.glob(f"*/{key}.json"))
+            os.utime(path, (1_000_000 + i, time.time() - 100 + i))
+        cache.max_bytes = 2500
+
+        removed = cache.evict()
+
+        assert removed == 1
+        assert cache.get("aa" * 32) is None
+        assert cache.get("cc" * 32) is not None
+
+    def test_evicts_every_evict_every_writes(self, tmp_path, monkeypatch):
+        """Test that put scans the cache only once per evict_every writes."""
+        cache = ResponseCache(
+            tmp_path, max_bytes=10_000_000, max_age_s=60, evict_every=3
+        )
+        evictions = []
+        monkeypatch.setattr(cache, "evict", lambda: evictions.append(1) or 0)
+
+        for i in range(7):
+            cache.put(f"{i:02d}" * 32, "A summary")
+
+        assert len(evictions) == 2
+
+
+class TestCachedAgent:
+    """Test CachedAgent wrapper."""
+
+    def test_second_call_is_served_from_cache(self, tmp_path):
+        """Test that the wrapped agent is only called on a miss."""
+        cache = make_cache(tmp_path)
+        agent = agent_returning("Fresh summary")
+
+        def wrapped():
+            return CachedAgent(
+                agent, cache, "summary", "slug", 0.8, "prompt", candidate_index=0
+            )
+
+        first = wrapped().invoke(AGENT_INPUT)
+        second = wrapped().invoke(AGENT_INPUT)
+
+        assert first["messages"][-1].content == "Fresh summary"
+        assert second["messages"][-1].content == "Fresh summary"
+        agent.invoke.assert_called_once()
+
+    def test_candidates_do_not_share_entries(self, tmp_path):
+        """Test that each candidate index gets its own response."""
+        cache = make_cache(tmp_path)
+        agent = agent_returning("Summary")
+
+        for index in range(3):
+            CachedAgent(
+                agent, cache, "summary", "slug", 0.8, "prompt", candidate_index=index
+            ).invoke(AGENT_INPUT)
+
+        assert agent.invoke.call_count == 3
+
+    def test_bypass_skips_lookup_but_refreshes_entry(self, tmp_path):
+        """Test that bypass calls the agent and stores the new response."""
+        cache = make_cache(tmp_path)
+        CachedAgent(
+            agent_returning("Old"), cache, "summary", "slug", 0.8, "prompt"
+        ).invoke(AGENT_INPUT)
+        fresh_agent = agent_returning("New")
+
+        result = CachedAgent(
+            fresh_agent, cache, "summary", "slug", 0.8, "prompt", bypass=True
+        ).invoke(AGENT_INPUT)
+        cached = CachedAgent(Mock(), cache, "summary", "slug", 0.8, "prompt").invoke(
+            AGENT_INPUT
+        )
+
+        assert result["messages"][-1].content == "New"
+        assert cached["messages"][-1].content == "New"
+        fresh_agent.invoke.assert_called_once()
+
+    def test_async_path_uses_the_same_entries(self, tmp_path):
+        """Test that ainvoke reads what invoke stored."""
+        cache = make_cache(tmp_path)
+        CachedAgent(
+            agent_returning("Stored"), cache, "evaluation", "slug", 0.6, "prompt"
+        ).invoke(AGENT_INPUT)
+        agent = agent_returning("Unused")
+
+        result = asyncio.run(
+            CachedAgent(agent, cache, "evaluation", "slug", 0.6, "prompt").ainvoke(
+                AGENT_INPUT
+            )
+        )
+
+        assert result["messages"][-1].content == "Stored"
+        agent.ainvoke.assert_not_awaited()
+
+    def test_lookup_and_store_share_entries_with_invoke(self, tmp_path):
+        """Test that responses stored from elsewhere are served by invoke."""
+        cache = make_cache(tmp_path)
+        cached = CachedAgent(None, cache, "summary", "slug", 0.8, "prompt", 1)
+
+        assert cached.lookup(AGENT_INPUT) is None
+        cached.store(AGENT_INPUT, "Generated elsewhere")
+        agent = agent_returning("Unused")
+        result = CachedAgent(agent, cache, "summary", "slug", 0.8, "prompt", 1).invoke(
+            AGENT_INPUT
+        )
+
+        assert cached.lookup(AGENT_INPUT)["messages"][-1].content == (
+            "Generated elsewhere"
+        )
+        assert result["messages"][-1].content == "Generated elsewhere"
+        agent.invoke.assert_not_called()
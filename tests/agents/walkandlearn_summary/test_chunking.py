@@ -0,0 +1,132 @@
+"""Tests for the map-reduce (chunked) mode helpers."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.agents.walkandlearn_summary.nodes.chunking import (
+    asummarize_chunks,
+    build_chunk_input,
+    chunk_tokens_for,
+    conversation_token_budget,
+    format_condensed_conversation,
+    needs_chunking,
+    split_conversation,
+    summarize_chunks,
+)
+
+
+class TestConversationTokenBudget:
+    """Test conversation_token_budget function."""
+
+    def test_subtracts_prompt_and_output_from_context_share(self):
+        """Test that the system prompt and reserved output are deducted."""
+        budget = conversation_token_budget(
+            context_window=10_000,
+            system_prompt="x" * 400,
+            reserved_output_tokens=1_000,
+            context_fraction=0.5,
+        )
+        assert budget == 5_000 - 101 - 1_000
+
+
+class TestChunkTokensFor:
+    """Test chunk_tokens_for function."""
+
+    def test_half_the_budget_up_to_the_maximum(self):
+        assert chunk_tokens_for(10_000, max_chunk_tokens=20_000, chunk_overlap=500) == (
+            5_000
+        )
+        assert chunk_tokens_for(
+            100_000, max_chunk_tokens=20_000, chunk_overlap=500
+        ) == (20_000)
+
+    def test_rejects_budgets_too_small_for_the_overlap(self):
+        for budget in (-3_000, 0, 1_000):
+            with pytest.raises(ValueError, match="context window is too small"):
+                chunk_tokens_for(budget, max_chunk_tokens=20_000, chunk_overlap=500)
+
+
+class TestNeedsChunking:
+    """Test needs_chunking function."""
+
+    def test_short_conversation_fits(self):
+        assert needs_chunking("a" * 400, token_budget=200) is False
+
+    def test_long_conversation_needs_chunking(self):
+        assert needs_chunking("a" * 4_000, token_budget=200) is True
+
+    def test_no_budget_never_chunks(self):
+        """Test that a missing budget (chunked mode off) never chunks."""
+        assert needs_chunking("a" * 1_000_000, token_budget=None) is False
+
+
+class TestSplitConversation:
+    """Test split_conversation function."""
+
+    def test_splits_into_chunks_of_at_most_chunk_tokens(self):
+        conversation = "".join(f"line {i}\n" for i in range(200))
+        chunks = split_conversation(
+            conversation, chunk_tokens=300, chunk_overlap=0, tokenizer="character"
+        )
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 300 for chunk in chunks)
+        assert "".join(chunks) == conversation
+
+    def test_consecutive_chunks_overlap(self):
+        conversation = "abcdefghij" * 50
+        chunks = split_conversation(
+            conversation, chunk_tokens=100, chunk_overlap=20, tokenizer="character"
+        )
+        assert chunks[0][-20:] == chunks[1][:20]
+
+
+class TestFormatting:
+    """Test build_chunk_input and format_condensed_conversation."""
+
+    def test_chunk_input_names_the_part(self):
+        agent_input = build_chunk_input("chunk text", index=1, total=3)
+        content = agent_input["messages"][0].content
+        assert "part 2 of 3" in content
+        assert "chunk text" in content
+
+    def test_condensed_conversation_keeps_notes_in_order(self):
+        condensed = format_condensed_conversation(["first notes", "second notes"])
+        assert condensed.index("Part 1 of 2") < condensed.index("first notes")
+        assert condensed.index("first notes") < condensed.index("Part 2 of 2")
+        assert condensed.index("Part 2 of 2") < condensed.index("second notes")
+
+
+class TestSummarizeChunks:
+    """Test summarize_chunks and asummarize_chunks functions."""
+
+    @staticmethod
+    def _agent_echoing_chunk():
+        def invoke(agent_input):
+            content = agent_input["messages"][0].content
+            return {"messages": [AIMessage(content=f"notes on {content[-1]}")]}
+
+        agent = Mock()
+        agent.invoke.side_effect = invoke
+        agent.ainvoke = AsyncMock(side_effect=invoke)
+        return agent
+
+    def test_returns_notes_in_chunk_order(self):
+        agent = self._agent_echoing_chunk()
+        make_agent = Mock(return_value=agent)
+
+        notes = summarize_chunks(make_agent, ["a", "b", "c"], max_workers=2)
+
+        assert notes == ["notes on a", "notes on b", "notes on c"]
+        assert sorted(c.args[0] for c in make_agent.call_args_list) == [0, 1, 2]
+
+    def test_async_returns_notes_in_chunk_order(self):
+        agent = self._agent_echoing_chunk()
+
+        notes = asyncio.run(asummarize_chunks(lambda _: agent, ["a", "b", "c"], 2))
+
+        assert notes == ["notes on a", "notes on b", "notes on c"]
+        assert agent.ainvoke.await_count == 3
+        agent.invoke.assert_not_called()
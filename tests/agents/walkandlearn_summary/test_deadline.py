@@ -0,0 +1,98 @@
+"""Tests for the per-run candidate deadline."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.agents.walkandlearn_summary.deadline import (
+    DeadlineExceeded,
+    acall_with_deadline,
+    call_with_deadline,
+    run_deadline_at,
+    run_deadline_s,
+)
+
+
+class TestRunDeadline:
+    """Test run_deadline_s function."""
+
+    def test_run_config_overrides_default(self):
+        config = {"configurable": {"deadline_s": 60}}
+
+        assert run_deadline_s(config, default=None) == 60
+
+    def test_zero_means_no_deadline(self):
+        assert run_deadline_s(None, default=0.0) is None
+        assert run_deadline_s({"configurable": {"deadline_s": 0}}, 30.0) is None
+
+
+class TestRunDeadlineAt:
+    """Test run_deadline_at function."""
+
+    def test_counts_from_the_run_start(self):
+        state = {"deadline_s": 60, "run_started_at": 1000.0}
+
+        assert run_deadline_at(state, None) == 1060.0
+
+    def test_counts_from_the_resume_of_a_resumed_run(self):
+        state = {"deadline_s": 60, "run_started_at": 1000.0}
+        config = {"configurable": {"resumed_at": 5000.0}}
+
+        assert run_deadline_at(state, config) == 5060.0
+
+    def test_no_budget_means_no_deadline(self):
+        assert run_deadline_at({"run_started_at": 1000.0}, None) is None
+
+
+class TestCallWithDeadline:
+    """Test call_with_deadline function."""
+
+    def test_returns_in_time(self):
+        assert call_with_deadline(lambda: "summary", time.time() + 5) == "summary"
+
+    def test_without_deadline(self):
+        assert call_with_deadline(lambda: "summary", None) == "summary"
+
+    def test_raises_when_the_call_is_too_slow(self):
+        started = time.perf_counter()
+
+        with pytest.raises(DeadlineExceeded):
+            call_with_deadline(lambda: time.sleep(1.0), time.time() + 0.05)
+
+        assert time.perf_counter() - started < 0.5
+
+    def test_expired_deadline_does_not_call(self):
+        calls = []
+
+        with pytest.raises(DeadlineExceeded):
+            call_with_deadline(lambda: calls.append(1), time.time() - 1)
+
+        assert calls == []
+
+
+class TestAcallWithDeadline:
+    """Test acall_with_deadline function."""
+
+    def test_cancels_the_call_at_the_deadline(self):
+        cancelled = []
+
+        async def slow_call():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(acall_with_deadline(slow_call(), time.time() + 0.05))
+
+        assert cancelled == [True]
+
+    def test_returns_in_time(self):
+        async def fast_call():
+            return "summary"
+
+        result = asyncio.run(acall_with_deadline(fast_call(), time.time() + 5))
+
+        assert result == "summary"
@@ -0,0 +1,86 @@
+"""Tests for the shared conversation digest."""
+
+from langchain_core.messages import AIMessage
+
+from src.agents.walkandlearn_summary.nodes.digest import (
+    choose_digest,
+    digest_stats,
+    normalize_transcript,
+)
+
+
+class TestNormalizeTranscript:
+    """Test normalize_transcript function."""
+
+    def test_strips_subtitle_cues_and_timestamps(self):
+        transcript = (
+            "WEBVTT\n\n1\n00:00:01.000 --> 00:00:03.000\nFlo: Hello\n\n"
+            "2\n00:00:04.000 --> 00:00:06.000\n[00:04] Anna: Hi there\n"
+        )
+
+        assert normalize_transcript(transcript) == "Flo: Hello\n\nAnna: Hi there\n"
+
+    def test_keeps_number_lines_outside_subtitle_cues(self):
+        transcript = "Anna: How many laps?\n3\nFlo: Three, yes.\n"
+
+        assert normalize_transcript(transcript) == transcript
+
+    def test_removes_filler_and_repeated_words(self):
+        transcript = "Flo: Um, so I I think the the the gradient is, uh, zero.\n"
+
+        assert normalize_transcript(transcript) == (
+            "Flo: so I think the gradient is, zero.\n"
+        )
+
+    def test_keeps_grammatical_doubled_words(self):
+        transcript = "Anna: She had had enough, and that that was it.\n"
+
+        assert normalize_transcript(transcript) == transcript
+
+    def test_keeps_words_containing_filler(self):
+        transcript = "Anna: The umbrella and the hummingbird, hmm.\n"
+
+        assert normalize_transcript(transcript) == (
+            "Anna: The umbrella and the hummingbird,\n"
+        )
+
+    def test_joins_turns_of_the_same_speaker_and_drops_repeated_lines(self):
+        transcript = (
+            "Flo: First part.\n\nFlo: Second part.\n"
+            "Anna: Yes.\nAnna: Yes.\n\n\n\nFlo: Next.\n"
+        )
+
+        assert normalize_transcript(transcript) == (
+            "Flo: First part. Second part.\nAnna: Yes.\n\nFlo: Next.\n"
+        )
+
+
+class TestChooseDigest:
+    """Test choose_digest function."""
+
+    def test_uses_a_shorter_model_digest(self):
+        result = {"messages": [AIMessage(content="Flo: Hi.")]}
+
+        assert choose_digest("Flo: Hello there.\n", result) == "Flo: Hi.\n"
+
+    def test_keeps_the_normalized_conversation_otherwise(self):
+        longer = {"messages": [AIMessage(content="Flo: Hello there, everyone.")]}
+
+        assert choose_digest("Flo: Hello.\n", None) == "Flo: Hello.\n"
+        assert choose_digest("Flo: Hello.\n", longer) == "Flo: Hello.\n"
+
+
+def test_digest_stats_counts_the_tokens_saved_over_all_candidates():
+    stats = digest_stats(
+        "x" * 4000, "x" * 2000, "x" * 1000, mode="model", candidate_calls=10
+    )
+
+    assert stats == {
+        "mode": "model",
+        "conversation_tokens": 1001,
+        "normalized_tokens": 501,
+        "digest_tokens": 251,
+        "reduction": 1 - 251 / 1001,
+        "candidate_calls": 10,
+        "saved_input_tokens": 7500,
+    }
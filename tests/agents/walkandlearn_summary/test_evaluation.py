@@ -1,13 +1,22 @@
 """Tests for evaluation functions."""
 
-from unittest.mock import Mock
+import asyncio
+import re
+from typing import ClassVar
+from unittest.mock import AsyncMock, Mock
 
 from langchain_core.messages import AIMessage
 
 from src.agents.walkandlearn_summary.nodes.evaluation import (
+    KingOfTheHill,
+    aevaluate_summaries,
+    aevaluate_tournament,
+    collapse_near_duplicates,
     evaluate_summaries,
+    evaluate_tournament,
     format_summaries_for_evaluation,
     parse_evaluation_result,
+    to_candidate_index,
 )
 
 
@@ -96,6 +105,24 @@ Reasoning: This is the best because:
         assert "It's concise" in reasoning
 
 
+class TestToCandidateIndex:
+    """Test to_candidate_index function."""
+
+    def test_maps_positions_to_the_finished_candidates(self):
+        """Test that with candidate 1 dropped, position 1 is candidate 2."""
+        best_idx, reasoning = to_candidate_index((1, "Clearer."), [0, 2, 3])
+
+        assert best_idx == 2
+        assert reasoning.startswith("Clearer.")
+        assert "0 = 0, 1 = 2, 2 = 3" in reasoning
+
+    def test_all_candidates_finished(self):
+        assert to_candidate_index((1, "Clearer."), [0, 1]) == (1, "Clearer.")
+
+    def test_invalid_position_has_no_candidate(self):
+        assert to_candidate_index((5, "Clearer."), [0, 2])[0] is None
+
+
 class TestEvaluateSummaries:
     """Test evaluate_summaries function."""
 
@@ -154,3 +181,221 @@ class TestEvaluateSummaries:
         assert best_idx == 1
         assert reasoning == "It's the clearest."
         mock_agent.invoke.assert_called_once()
+
+    def test_evaluates_near_duplicates_once(self):
+        """Test that the chosen index maps back to the original candidates."""
+        mock_agent = Mock()
+        mock_agent.invoke.return_value = {
+            "messages": [AIMessage(content="Best summary: 1\n\nReasoning: Warmer.")]
+        }
+        walk = "We walked along the river and talked about the new project plan"
+
+        best_idx, reasoning = evaluate_summaries(
+            evaluation_agent=mock_agent,
+            summaries=[walk, walk + ".", "A completely different summary of it"],
+            summary_type="emotional",
+            eval_disabled=False,
+            dedup_threshold=0.9,
+        )
+
+        prompt = mock_agent.invoke.call_args.args[0]["messages"][0].content
+        assert "Summary 2" not in prompt
+        assert best_idx == 2
+        assert reasoning.startswith("Warmer.")
+        assert "summaries evaluated as 0 = 0, 1 = 2" in reasoning
+
+
+class TestCollapseNearDuplicates:
+    """Test collapse_near_duplicates function."""
+
+    def test_keeps_first_of_each_group(self):
+        text = " ".join(f"word{i}" for i in range(100))
+        almost = text.replace("word50", "other")
+
+        kept_summaries, kept = collapse_near_duplicates(
+            [text, "unrelated text", almost], threshold=0.8
+        )
+
+        assert kept == [0, 1]
+        assert kept_summaries == [text, "unrelated text"]
+
+    def test_distinct_summaries_are_all_kept(self):
+        summaries = ["the walk was calm", "the project is late", "a new idea came up"]
+
+        assert collapse_near_duplicates(summaries, threshold=0.9)[1] == [0, 1, 2]
+
+
+class TestAevaluateSummaries:
+    """Test aevaluate_summaries function."""
+
+    def test_awaits_agent_and_parses_result(self):
+        """Test that the async path uses ainvoke and parses the result."""
+        mock_agent = Mock()
+        mock_agent.ainvoke = AsyncMock(
+            return_value={
+                "messages": [
+                    AIMessage(content="Best summary: 2\n\nReasoning: Most vivid.")
+                ]
+            }
+        )
+
+        best_idx, reasoning = asyncio.run(
+            aevaluate_summaries(
+                evaluation_agent=mock_agent,
+                summaries=["a", "b", "c"],
+                summary_type="emotional",
+                eval_disabled=False,
+            )
+        )
+
+        assert best_idx == 2
+        assert reasoning == "Most vivid."
+        mock_agent.invoke.assert_not_called()
+
+    def test_skips_agent_when_disabled(self):
+        """Test that a disabled evaluation never awaits the agent."""
+        mock_agent = Mock()
+        mock_agent.ainvoke = AsyncMock()
+
+        best_idx, _ = asyncio.run(
+            aevaluate_summaries(
+                evaluation_agent=mock_agent,
+                summaries=["a"],
+                summary_type="technical",
+                eval_disabled=True,
+            )
+        )
+
+        assert best_idx == 0
+        mock_agent.ainvoke.assert_not_awaited()
+
+
+class HighestScoreJudge:
+    """Evaluator picking the summary with the highest "score N" in its prompt."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def _verdict(self, agent_input: dict) -> dict:
+        prompt = agent_input["messages"][0].content
+        self.prompts.append(prompt)
+        scores = [int(n) for n in re.findall(r"score (\d+)", prompt)]
+        best = scores.index(max(scores))
+        return {
+            "messages": [
+                AIMessage(content=f"Best summary: {best}\n\nReasoning: Highest.")
+            ]
+        }
+
+    def invoke(self, agent_input: dict) -> dict:
+        return self._verdict(agent_input)
+
+    async def ainvoke(self, agent_input: dict) -> dict:
+        return self._verdict(agent_input)
+
+
+class TestEvaluateTournament:
+    """Test evaluate_tournament and aevaluate_tournament functions."""
+
+    summaries: ClassVar[list[str]] = [
+        f"Summary with score {score}" for score in (3, 9, 1, 4, 7, 2, 8)
+    ]
+
+    def test_finds_the_best_with_bounded_prompts(self):
+        """Test that every evaluator call compares at most group_size summaries."""
+        judge = HighestScoreJudge()
+
+        best_idx, reasoning = evaluate_tournament(
+            evaluation_agent=judge,
+            summaries=self.summaries,
+            summary_type="emotional",
+            eval_disabled=False,
+            group_size=2,
+        )
+
+        assert best_idx == 1
+        assert reasoning.startswith("Highest.")
+        assert "Tournament of 7 summaries in 3 rounds" in reasoning
+        # A knockout of 7 candidates plays 6 matches of 2
+        assert len(judge.prompts) == 6
+        assert all(prompt.count("Summary ") == 2 * 2 for prompt in judge.prompts)
+
+    def test_async_groups_of_three(self):
+        judge = HighestScoreJudge()
+
+        best_idx, _ = asyncio.run(
+            aevaluate_tournament(
+                evaluation_agent=judge,
+                summaries=self.summaries,
+                summary_type="technical",
+                eval_disabled=False,
+                group_size=3,
+            )
+        )
+
+        assert best_idx == 1
+        # Round 1: (3, 9, 1), (4, 7, 2) and a bye for 8; round 2: (9, 7, 8)
+        assert len(judge.prompts) == 3
+
+    def test_single_summary_needs_no_evaluator_call(self):
+        judge = HighestScoreJudge()
+
+        best_idx, _ = evaluate_tournament(
+            evaluation_agent=judge,
+            summaries=["only one"],
+            summary_type="emotional",
+            eval_disabled=False,
+        )
+
+        assert best_idx == 0
+        assert judge.prompts == []
+
+
+class TestKingOfTheHill:
+    """Test KingOfTheHill class."""
+
+    def test_each_arrival_challenges_the_best_so_far(self):
+        """Test that N arrivals take N - 1 pairwise comparisons."""
+        judge = HighestScoreJudge()
+        king = KingOfTheHill(judge, "emotional", eval_disabled=False)
+
+        # Candidates 2, 0 and 3 finished (in that order); 1 was dropped
+        for index, score in [(2, 4), (0, 5), (3, 9)]:
+            king.challenge(index, f"Summary with score {score}")
+
+        assert king.comparisons == 2
+        assert all(prompt.count("Summary ") == 4 for prompt in judge.prompts)
+        # The candidate index, not the position among the finished summaries
+        assert king.result([0, 2, 3]) == (3, "Highest.")
+
+    def test_async_challenges(self):
+        judge = HighestScoreJudge()
+        king = KingOfTheHill(judge, "technical", eval_disabled=False)
+
+        async def arrive():
+            for index, score in [(0, 1), (1, 5)]:
+                await king.achallenge(index, f"Summary with score {score}")
+
+        asyncio.run(arrive())
+
+        assert king.result([0, 1]) == (1, "Highest.")
+
+    def test_near_duplicate_challenger_is_skipped(self):
+        judge = HighestScoreJudge()
+        king = KingOfTheHill(judge, "emotional", False, dedup_threshold=0.9)
+
+        king.challenge(0, "We walked by the river and planned the week ahead")
+        king.challenge(1, "We walked by the river and planned the week ahead")
+
+        assert king.comparisons == 0
+        assert king.result([0, 1]) == (0, "Only one summary to evaluate")
+
+    def test_disabled_evaluation_never_compares(self):
+        judge = HighestScoreJudge()
+        king = KingOfTheHill(judge, "emotional", eval_disabled=True)
+
+        king.challenge(0, "score 1")
+        king.challenge(1, "score 2")
+
+        assert judge.prompts == []
+        assert king.result([0, 1]) == (0, "[Emotional evaluation disabled]")
@@ -0,0 +1,381 @@
+"""Tests for the graph's state reducers and per-run settings."""
+
+import asyncio
+import time
+from typing import Annotated, TypedDict
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+from pydantic import Field
+
+from src.agents.walkandlearn_summary import graph as graph_module
+from src.agents.walkandlearn_summary.config import CONFIG_TEMPLATE
+from src.agents.walkandlearn_summary.graph import (
+    GraphSettings,
+    build_graph,
+    build_summary_subgraph,
+    graph,
+    make_graph,
+    merge_candidates,
+    ordered_summaries,
+)
+
+
+class TestMergeCandidates:
+    """Test merge_candidates reducer."""
+
+    def test_merges_by_candidate_index(self):
+        merged = merge_candidates({2: "two"}, {0: "zero"})
+
+        assert merged == {0: "zero", 2: "two"}
+        assert ordered_summaries(merged) == ["zero", "two"]
+
+    def test_earlier_snapshots_keep_their_candidates(self):
+        """Test that a later candidate step does not change earlier states."""
+
+        class ToyState(TypedDict, total=False):
+            summaries: Annotated[dict[int, str], merge_candidates]
+
+        def make_candidate(index: int):
+            def candidate(state: ToyState) -> dict:
+                return {"summaries": {index: f"summary {index}"}}
+
+            return candidate
+
+        # candidate_0 finishes a step before the others
+        builder = StateGraph(ToyState)
+        for i in range(3):
+            builder.add_node(f"candidate_{i}", make_candidate(i))
+        builder.add_edge(START, "candidate_0")
+        builder.add_edge("candidate_0", "candidate_1")
+        builder.add_edge("candidate_0", "candidate_2")
+        config = {"configurable": {"thread_id": "t1"}}
+        compiled = builder.compile(checkpointer=InMemorySaver())
+
+        snapshots = [
+            values["summaries"]
+            for values in compiled.stream(
+                {"summaries": {}}, config, stream_mode="values"
+            )
+        ]
+        history = [
+            sorted(state.values["summaries"])
+            for state in compiled.get_state_history(config)
+        ]
+
+        assert [sorted(s) for s in snapshots] == [[], [0], [0, 1, 2]]
+        assert history == [[0, 1, 2], [0], [], []]
+
+    def test_empty_updates_keep_the_accumulated_summaries(self):
+        left = {0: "zero"}
+
+        assert merge_candidates(left, {}) is left
+        assert ordered_summaries(None) == []
+
+    def test_order_does_not_depend_on_completion_order(self):
+        """Test that candidates finishing in reverse order stay in index order."""
+
+        class ToyState(TypedDict, total=False):
+            summaries: Annotated[dict[int, str], merge_candidates]
+
+        def make_candidate(index: int):
+            async def candidate(state: ToyState) -> dict:
+                await asyncio.sleep(0.01 * (5 - index))
+                return {"summaries": {index: f"summary {index}"}}
+
+            return candidate
+
+        builder = StateGraph(ToyState)
+        for i in range(5):
+            builder.add_node(f"candidate_{i}", make_candidate(i))
+            builder.add_edge(START, f"candidate_{i}")
+            builder.add_edge(f"candidate_{i}", END)
+        result = asyncio.run(builder.compile().ainvoke({"summaries": {}}))
+
+        assert ordered_summaries(result["summaries"]) == [
+            f"summary {i}" for i in range(5)
+        ]
+
+
+class TestGraphSettings:
+    """Test GraphSettings.from_config and make_graph."""
+
+    def test_defaults_come_from_config(self):
+        assert GraphSettings.from_config(None) == GraphSettings()
+        assert GraphSettings.from_config({}).template == CONFIG_TEMPLATE
+
+    def test_reads_the_configurable_values(self):
+        settings = GraphSettings.from_config(
+            {
+                "configurable": {
+                    "template": "wip",
+                    "num_emotional_iterations": "5",
+                    "technical_disabled": "true",
+                    "eval_disabled": False,
+                }
+            }
+        )
+
+        assert settings.template == "wip"
+        assert settings.num_emotional_iterations == 5
+        assert settings.technical_disabled is True
+        assert settings.eval_disabled is False
+
+    def test_equal_settings_are_equal_cache_keys(self):
+        first = GraphSettings.from_config({"configurable": {"template": "wip"}})
+        second = GraphSettings.from_config({"configurable": {"template": "wip"}})
+
+        assert first == second
+        assert hash(first) == hash(second)
+
+    def test_configurable_round_trips(self):
+        settings = GraphSettings(template="wip", eval_disabled=True)
+        config = {"configurable": settings.configurable()}
+
+        assert GraphSettings.from_config(config) == settings
+
+    def test_rejects_unknown_templates(self):
+        with pytest.raises(ValueError, match="Unknown config template"):
+            GraphSettings.from_config({"configurable": {"template": "nope"}})
+
+    def test_rejects_zero_iterations(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            GraphSettings.from_config({"configurable": {"num_technical_iterations": 0}})
+
+    def test_default_run_reuses_the_module_graph(self):
+        assert make_graph({"configurable": {"thread_id": "t1"}}) is graph
+
+
+class TimedChatModel(BaseChatModel):
+    """Chat model recording when each call started and ended, and whether its
+    prompt carried a cache breakpoint."""
+
+    model_name: str = "claude-sonnet-4-5"
+    latency_s: float = 0.05
+    calls: list = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "timed"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        started = time.perf_counter()
+        time.sleep(self.latency_s)
+        content = messages[-1].content
+        self.calls.append(
+            {
+                "started": started,
+                "ended": time.perf_counter(),
+                "cache_control": isinstance(content, list)
+                and "cache_control" in content[0],
+                "text": content[0]["text"] if isinstance(content, list) else content,
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("Summary"))])
+
+
+class TestPromptCacheWarmUp:
+    """Test that the first Anthropic candidate writes the cache alone, if asked."""
+
+    def run(self, eval_mode, use_async, prompt_cache_warm_up):
+        model = TimedChatModel(calls=[])
+        subgraph = build_summary_subgraph(
+            summary_type="emotional",
+            model=model,
+            system_prompt="Summarize",
+            num_iterations=3,
+            summary_disabled=False,
+            eval_disabled=True,
+            evaluation_model=model,
+            use_async=use_async,
+            rate_limits=None,
+            hedging=False,
+            eval_mode=eval_mode,
+            prompt_cache_warm_up=prompt_cache_warm_up,
+        )
+
+        state = {"conversation": "A conversation"}
+        if use_async:
+            return model, asyncio.run(subgraph.ainvoke(state))
+        return model, subgraph.invoke(state)
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    @pytest.mark.parametrize("eval_mode", ["single", "streaming"])
+    def test_candidates_start_together_by_default(self, eval_mode, use_async):
+        model, result = self.run(eval_mode, use_async, prompt_cache_warm_up=False)
+
+        assert len(result["emotional_summaries"]) == 3
+        assert all(call["cache_control"] for call in model.calls)
+        starts = [call["started"] for call in model.calls]
+        assert max(starts) < min(call["ended"] for call in model.calls)
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    @pytest.mark.parametrize("eval_mode", ["single", "streaming"])
+    def test_other_candidates_start_after_the_first(self, eval_mode, use_async):
+        model, result = self.run(eval_mode, use_async, prompt_cache_warm_up=True)
+
+        first, *others = sorted(model.calls, key=lambda call: call["started"])
+        assert len(result["emotional_summaries"]) == 3
+        assert all(call["cache_control"] for call in model.calls)
+        assert all(call["started"] >= first["ended"] for call in others)
+        # The others still run in parallel
+        assert max(c["started"] for c in others) < min(c["ended"] for c in others)
+
+
+class TestRunDeadline:
+    """Test that the deadline counts from the run's start, or its resume."""
+
+    def build(self):
+        model = TimedChatModel(calls=[])
+        return build_summary_subgraph(
+            summary_type="emotional",
+            model=model,
+            system_prompt="Summarize",
+            num_iterations=2,
+            summary_disabled=False,
+            eval_disabled=True,
+            evaluation_model=model,
+            use_async=False,
+            rate_limits=None,
+            hedging=False,
+            response_cache=None,
+        )
+
+    def test_candidates_of_an_expired_run_are_dropped(self):
+        state = {
+            "conversation": "A conversation",
+            "deadline_s": 5.0,
+            "run_started_at": time.time() - 60,
+        }
+
+        result = self.build().invoke(state)
+
+        assert result["emotional_summaries"] == {}
+        assert sorted(result["dropped_candidates"]) == ["emotional_0", "emotional_1"]
+
+    def test_resumed_run_gets_its_budget_again(self):
+        state = {
+            "conversation": "A conversation",
+            "deadline_s": 5.0,
+            "run_started_at": time.time() - 60,
+        }
+        config = {"configurable": {"resumed_at": time.time()}}
+
+        result = self.build().invoke(state, config)
+
+        assert sorted(result["emotional_summaries"]) == [0, 1]
+        assert not result.get("dropped_candidates")
+
+
+class TestSubgraphRecords:
+    """Test that a summary subgraph only hands back its own records."""
+
+    def test_parent_records_are_not_returned(self):
+        model = TimedChatModel(calls=[], latency_s=0.0)
+        subgraph = build_summary_subgraph(
+            summary_type="technical",
+            model=model,
+            system_prompt="Summarize",
+            num_iterations=2,
+            summary_disabled=False,
+            eval_disabled=False,
+            evaluation_model=model,
+            use_async=False,
+            rate_limits=None,
+            hedging=False,
+            response_cache=None,
+        )
+        parent_record = {"node": "conversation_digest", "input_tokens": 10}
+
+        result = subgraph.invoke(
+            {
+                "conversation": "A conversation",
+                "llm_usage": [parent_record],
+                "node_timings": [{"node": "load_conversation"}],
+            }
+        )
+
+        assert parent_record not in result["llm_usage"]
+        assert len(result["llm_usage"]) == len(model.calls) == 3
+        assert {"node": "load_conversation"} not in result["node_timings"]
+
+
+class TestInputText:
+    """Test runs given the transcript instead of reading it."""
+
+    def test_uses_the_given_text_instead_of_the_file(self, tmp_path):
+        model = TimedChatModel(calls=[], latency_s=0.0)
+        compiled = build_graph(
+            models={"emotional": model, "technical": model, "evaluation": model},
+            num_emotional_iterations=1,
+            num_technical_iterations=1,
+            use_async=False,
+            response_cache_enabled=False,
+            rate_limits={},
+            output_base_folder=tmp_path / "output",
+            hedging=False,
+            multi_choice=False,
+            conversation_digest="off",
+            blob_state=False,
+            eval_disabled=True,
+        )
+
+        result = compiled.invoke(
+            {"input_filename": str(tmp_path / "missing.md"), "input_text": "We walked"}
+        )
+
+        assert result["conversation"] == "We walked"
+        assert result["input_text"] == ""
+        assert all("We walked" in call["text"] for call in model.calls)
+
+
+class TestCondenseConversation:
+    """Test the map step of conversations too long for the summary models."""
+
+    def test_condenses_once_for_both_summary_types(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(graph_module, "context_window_of", lambda model: 20_000)
+        model = TimedChatModel(calls=[], latency_s=0.0)
+        input_path = tmp_path / "walk.md"
+        input_path.write_text("word " * 40_000)
+        compiled = build_graph(
+            models={"emotional": model, "technical": model, "evaluation": model},
+            num_emotional_iterations=1,
+            num_technical_iterations=1,
+            use_async=False,
+            response_cache_enabled=False,
+            rate_limits={},
+            output_base_folder=tmp_path / "output",
+            hedging=False,
+            multi_choice=False,
+            conversation_digest="off",
+            blob_state=False,
+            eval_disabled=True,
+            chunk_tokenizer="character",
+        )
+
+        compiled.invoke({"input_filename": str(input_path)})
+
+        chunk_calls = [c for c in model.calls if c["text"].startswith("Here is part")]
+        summary_calls = [
+            c for c in model.calls if c["text"].startswith("Here is the conversation")
+        ]
+        total = int(chunk_calls[0]["text"].split(" of ")[1].split(" ")[0])
+        assert len(chunk_calls) == total > 1
+        assert len(summary_calls) == 2
+        assert all("notes of each part" in c["text"] for c in summary_calls)
+
+    def test_rejects_context_windows_too_small_for_chunks(self, monkeypatch):
+        monkeypatch.setattr(graph_module, "context_window_of", lambda model: 4_000)
+        model = TimedChatModel(calls=[])
+
+        with pytest.raises(ValueError, match="context window is too small"):
+            build_graph(
+                models={"emotional": model, "technical": model, "evaluation": model},
+                rate_limits={},
+                response_cache_enabled=False,
+                hedging=False,
+            )
@@ -0,0 +1,188 @@
+"""Tests for hedged summary requests."""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.agents.walkandlearn_summary.hedging import HedgedAgent, LatencyTracker
+
+
+class SlowAgent:
+    """Agent answering after a fixed delay, remembering if it was cancelled."""
+
+    def __init__(self, delay_s: float, content: str):
+        self.delay_s = delay_s
+        self.content = content
+        self.cancelled = False
+
+    def _result(self) -> dict:
+        message = AIMessage(
+            content=self.content,
+            usage_metadata={
+                "input_tokens": 1_000_000,
+                "output_tokens": 10,
+                "total_tokens": 1_000_010,
+            },
+        )
+        return {"messages": [message]}
+
+    def invoke(self, agent_input: dict) -> dict:
+        time.sleep(self.delay_s)
+        return self._result()
+
+    async def ainvoke(self, agent_input: dict) -> dict:
+        try:
+            await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self._result()
+
+
+def hedged_agent(primary, backup, history=(0.01,) * 10) -> HedgedAgent:
+    tracker = LatencyTracker()
+    for latency in history:
+        tracker.record(latency)
+    return HedgedAgent(
+        primary,
+        backup,
+        primary_slug="claude-sonnet-4-5",
+        backup_slug="gpt-5",
+        tracker=tracker,
+        percentile=0.9,
+        min_samples=10,
+    )
+
+
+class TestLatencyTracker:
+    """Test LatencyTracker class."""
+
+    def test_no_percentile_below_min_samples(self):
+        tracker = LatencyTracker()
+        tracker.record(1.0)
+
+        assert tracker.percentile(0.9, min_samples=2) is None
+
+    def test_percentile_of_recent_latencies(self):
+        tracker = LatencyTracker(window=100)
+        for latency in range(1, 101):
+            tracker.record(float(latency))
+
+        assert tracker.percentile(0.9) == pytest.approx(90.1)
+
+    def test_window_drops_old_latencies(self):
+        tracker = LatencyTracker(window=2)
+        for latency in (100.0, 1.0, 1.0):
+            tracker.record(latency)
+
+        assert tracker.percentile(0.99) == 1.0
+
+    @pytest.mark.parametrize(
+        ("q", "expected"), [(0.001, 1.099), (0.004, 1.396), (0.995, 99.505)]
+    )
+    def test_extreme_percentiles(self, q, expected):
+        tracker = LatencyTracker(window=100)
+        for latency in range(1, 101):
+            tracker.record(float(latency))
+
+        assert tracker.percentile(q) == pytest.approx(expected)
+
+    def test_percentile_of_a_single_latency(self):
+        tracker = LatencyTracker()
+        tracker.record(2.0)
+
+        assert tracker.percentile(0.9) == 2.0
+
+    @pytest.mark.parametrize("q", [0.0, 1.0, 90])
+    def test_rejects_percentiles_outside_0_and_1(self, q):
+        tracker = LatencyTracker()
+        tracker.record(1.0)
+
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            tracker.percentile(q)
+
+
+class TestHedgedAgent:
+    """Test HedgedAgent class."""
+
+    def test_backup_wins_and_primary_is_cancelled(self):
+        """Test that a slow primary is raced against the backup."""
+        primary = SlowAgent(5.0, "primary")
+        backup = SlowAgent(0.01, "backup")
+        agent = hedged_agent(primary, backup)
+
+        result = asyncio.run(agent.ainvoke({"messages": []}))
+
+        assert result["messages"][-1].content == "backup"
+        assert result["hedged"] is True
+        assert result["hedge_model"] == "gpt-5"
+        assert primary.cancelled
+        # The cancelled Sonnet request was billed 1M input tokens at $3
+        assert result["hedge_cost_usd"] == pytest.approx(3.0)
+
+    @pytest.mark.parametrize("use_async", [False, True])
+    def test_slow_primary_latency_is_recorded_when_the_backup_wins(self, use_async):
+        primary = SlowAgent(0.5, "primary")
+        backup = SlowAgent(0.05, "backup")
+        agent = hedged_agent(primary, backup)
+
+        if use_async:
+            asyncio.run(agent.ainvoke({"messages": []}))
+        else:
+            agent.invoke({"messages": []})
+
+        # The primary ran at least until the backup answered
+        assert len(agent.tracker._latencies) == 11
+        assert agent.tracker._latencies[-1] >= 0.05
+
+    def test_fast_primary_is_not_hedged(self):
+        primary = SlowAgent(0.0, "primary")
+        backup = SlowAgent(0.0, "backup")
+        agent = hedged_agent(primary, backup, history=(1.0,) * 10)
+
+        result = asyncio.run(agent.ainvoke({"messages": []}))
+
+        assert result["messages"][-1].content == "primary"
+        assert result["hedged"] is False
+        assert result["hedge_cost_usd"] == 0.0
+        # The primary's latency feeds the next hedge delays
+        assert len(agent.tracker._latencies) == 11
+
+    def test_never_hedges_without_latency_history(self):
+        primary = SlowAgent(0.05, "primary")
+        backup = SlowAgent(0.0, "backup")
+        agent = hedged_agent(primary, backup, history=())
+
+        result = agent.invoke({"messages": []})
+
+        assert result["messages"][-1].content == "primary"
+        assert result["hedged"] is False
+
+    def test_sync_backup_wins(self):
+        primary = SlowAgent(0.5, "primary")
+        backup = SlowAgent(0.01, "backup")
+        agent = hedged_agent(primary, backup)
+
+        started = time.perf_counter()
+        result = agent.invoke({"messages": []})
+
+        assert time.perf_counter() - started < 0.4
+        assert result["messages"][-1].content == "backup"
+        assert result["hedged"] is True
+
+    def test_failed_backup_falls_back_to_primary(self):
+        primary = SlowAgent(0.1, "primary")
+        backup = SlowAgent(0.0, "backup")
+
+        async def fail(agent_input):
+            raise RuntimeError("backup down")
+
+        backup.ainvoke = fail
+        agent = hedged_agent(primary, backup)
+
+        result = asyncio.run(agent.ainvoke({"messages": []}))
+
+        assert result["messages"][-1].content == "primary"
+        assert result["hedged"] is True
@@ -0,0 +1,119 @@
+"""Tests for per-node run metrics."""
+
+import asyncio
+import inspect
+
+from langchain_core.runnables import RunnableConfig
+
+from src.agents.walkandlearn_summary.metrics import (
+    summarize_hedging,
+    summarize_run_metrics,
+    timed_node,
+)
+
+
+class TestTimedNode:
+    """Test timed_node function."""
+
+    def test_adds_timing_to_the_update(self):
+        node = timed_node("load_conversation", lambda state: {"conversation": "x"})
+
+        update = node({})
+
+        assert update["conversation"] == "x"
+        [timing] = update["node_timings"]
+        assert timing["node"] == "load_conversation"
+        assert timing["duration_s"] >= 0
+
+    def test_keeps_the_timings_recorded_by_the_node(self):
+        inner = timed_node("emotional_0", lambda state: {"emotional_summaries": ["x"]})
+        node = timed_node("emotional_candidates", inner)
+
+        update = node({})
+
+        assert [t["node"] for t in update["node_timings"]] == [
+            "emotional_0",
+            "emotional_candidates",
+        ]
+
+    def test_wraps_async_nodes_and_keeps_the_signature(self):
+        async def evaluation_node(state: dict, config: RunnableConfig) -> dict:
+            return {}
+
+        node = timed_node("emotional_evaluation", evaluation_node)
+
+        assert inspect.iscoroutinefunction(node)
+        assert list(inspect.signature(node).parameters) == ["state", "config"]
+        update = asyncio.run(node({}, {}))
+        assert update["node_timings"][0]["node"] == "emotional_evaluation"
+
+
+def usage(node, input_tokens, output_tokens, cost_usd, wait_s=0.0, latency_s=1.0):
+    return {
+        "node": node,
+        "model": "claude-sonnet-4-5",
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_read_tokens": 0,
+        "cache_creation_tokens": 0,
+        "response_cache_hit": False,
+        "wait_s": wait_s,
+        "latency_s": latency_s,
+        "cost_usd": cost_usd,
+    }
+
+
+class TestSummarizeRunMetrics:
+    """Test summarize_run_metrics function."""
+
+    def test_joins_node_timings_with_llm_usage(self):
+        timings = [
+            {"node": "emotional_0", "started_at": 100.5, "duration_s": 4.0},
+            {"node": "load_conversation", "started_at": 100.0, "duration_s": 0.5},
+            {"node": "emotional_evaluation", "started_at": 104.5, "duration_s": 2.0},
+        ]
+        llm_usage = [
+            usage("emotional_0", 1000, 200, 0.006, wait_s=1.0),
+            usage("emotional_evaluation", 3000, 100, None),
+        ]
+
+        metrics = summarize_run_metrics(timings, llm_usage)
+
+        assert metrics["wall_time_s"] == 6.5
+        assert metrics["llm_calls"] == 2
+        assert metrics["cost_usd"] == 0.006
+        assert metrics["unpriced_calls"] == 1
+        assert metrics["wait_s"] == 1.0
+        assert [n["node"] for n in metrics["nodes"]] == [
+            "load_conversation",
+            "emotional_0",
+            "emotional_evaluation",
+        ]
+        emotional_0 = metrics["nodes"][1]
+        assert emotional_0["llm_calls"] == 1
+        assert emotional_0["input_tokens"] == 1000
+        assert emotional_0["cost_usd"] == 0.006
+
+    def test_empty_run(self):
+        metrics = summarize_run_metrics(None, None)
+
+        assert metrics["wall_time_s"] == 0.0
+        assert metrics["nodes"] == []
+
+
+def test_summarize_hedging():
+    """Test the hedge rate over the hedgeable calls and the cost of the losers."""
+    records = [
+        {**usage("emotional_0", 100, 10, 0.01), "hedged": False, "hedge_cost_usd": 0},
+        {**usage("emotional_1", 100, 10, 0.02), "hedged": True, "hedge_cost_usd": 0.01},
+        {**usage("emotional_evaluation", 100, 10, 0.01)},
+    ]
+
+    hedge = summarize_hedging(records)
+
+    assert hedge == {
+        "hedgeable_calls": 2,
+        "hedged_calls": 1,
+        "hedge_rate": 0.5,
+        "cost_usd": 0.01,
+    }
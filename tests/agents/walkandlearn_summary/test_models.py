@@ -0,0 +1,153 @@
+"""Tests for the model registry."""
+
+from unittest.mock import Mock
+
+import langchain.chat_models
+import pytest
+
+from src.agents.walkandlearn_summary import models
+from src.agents.walkandlearn_summary.models import (
+    MODEL_CATALOG,
+    LazyRoleModels,
+    ModelCatalog,
+    ModelSpec,
+    backup_model_for,
+    get_model_by_name,
+    supports_multiple_choices,
+)
+
+
+@pytest.fixture
+def fake_init_chat_model(monkeypatch):
+    """Replace init_chat_model so no real client (or API key) is needed."""
+    models._build_chat_model.cache_clear()
+    fake = Mock(side_effect=lambda **kwargs: Mock(name=kwargs["model"]))
+    monkeypatch.setattr(langchain.chat_models, "init_chat_model", fake)
+    yield fake
+    models._build_chat_model.cache_clear()
+
+
+class TestGetModelByName:
+    """Test get_model_by_name function."""
+
+    def test_reuses_client_for_same_slug_and_temperature(self, fake_init_chat_model):
+        """Test that the same (slug, provider, temperature) builds one client."""
+        first = get_model_by_name("GPT 5-nano", temp=0.7)
+        second = get_model_by_name("GPT 5-nano", temp=0.7)
+
+        assert first is second
+        fake_init_chat_model.assert_called_once()
+
+    def test_builds_separate_client_per_temperature(self, fake_init_chat_model):
+        """Test that a different temperature gets its own client."""
+        first = get_model_by_name("GPT 5-nano", temp=0.7)
+        second = get_model_by_name("GPT 5-nano", temp=0.8)
+
+        assert first is not second
+        assert fake_init_chat_model.call_count == 2
+
+    def test_raises_for_unknown_model(self, fake_init_chat_model):
+        """Test that an unknown friendly name raises ValueError."""
+        with pytest.raises(ValueError, match="not found"):
+            get_model_by_name("Does Not Exist")
+
+
+class TestLazyRoleModels:
+    """Test LazyRoleModels mapping."""
+
+    def test_does_not_build_clients_until_accessed(self, fake_init_chat_model):
+        """Test that creating the mapping builds nothing."""
+        roles = LazyRoleModels(
+            {"emotional": "Sonnet 4.5", "technical": "GPT 5-nano"},
+            temps={"emotional": 0.8, "technical": 0.7},
+        )
+
+        assert list(roles) == ["emotional", "technical"]
+        fake_init_chat_model.assert_not_called()
+
+    def test_builds_only_the_accessed_role(self, fake_init_chat_model):
+        """Test that accessing a role builds exactly that role's client."""
+        roles = LazyRoleModels(
+            {"emotional": "Sonnet 4.5", "technical": "GPT 5-nano"},
+            temps={"emotional": 0.8, "technical": 0.7},
+        )
+
+        roles["technical"]
+
+        fake_init_chat_model.assert_called_once()
+        assert fake_init_chat_model.call_args.kwargs["model"] == "gpt-5-nano"
+        assert fake_init_chat_model.call_args.kwargs["temperature"] == 0.7
+
+
+class TestModelCatalog:
+    """Test ModelCatalog indexes."""
+
+    def test_looks_up_by_friendly_name_and_slug(self):
+        """Test that both indexes return the same record."""
+        spec = MODEL_CATALOG.get("Sonnet 4.5")
+
+        assert spec.slug == "claude-sonnet-4-5"
+        assert spec.langchain_provider == "anthropic"
+        assert MODEL_CATALOG.get_by_slug("claude-sonnet-4-5") is spec
+
+    def test_groups_by_provider_and_type_in_declaration_order(self):
+        """Test provider and type indexes keep catalog order."""
+        catalog = ModelCatalog(
+            [
+                ModelSpec("A", "a", "P1", "main", "p1", 1.0),
+                ModelSpec("B", "b", "P2", "nano", "p2", 1.0),
+                ModelSpec("C", "c", "P1", "nano", "p1", 1.0),
+            ]
+        )
+
+        assert [m.friendly_name for m in catalog.by_provider("P1")] == ["A", "C"]
+        assert [m.friendly_name for m in catalog.by_type("nano")] == ["B", "C"]
+        assert catalog.by_type("unknown") == ()
+        assert catalog.providers() == ["P1", "P2"]
+
+    def test_rejects_duplicate_friendly_names(self):
+        """Test that a duplicated friendly name is an error."""
+        with pytest.raises(ValueError, match="Duplicate"):
+            ModelCatalog(
+                [
+                    ModelSpec("A", "a", "P1", "main", "p1", 1.0),
+                    ModelSpec("A", "a2", "P1", "main", "p1", 1.0),
+                ]
+            )
+
+    def test_records_are_immutable(self):
+        """Test that catalog records are frozen."""
+        spec = MODEL_CATALOG.get("GPT 5-nano")
+
+        with pytest.raises(AttributeError):
+            spec.slug = "other"
+
+
+class TestBackupModelFor:
+    """Test backup_model_for function."""
+
+    def test_prefers_same_type_from_another_provider(self):
+        """Test that a Sonnet request is hedged to another main model."""
+        backup = backup_model_for(Mock(model_name="claude-sonnet-4-5"))
+
+        assert backup.type == "main"
+        assert backup.provider != "Anthropic"
+
+    def test_unknown_model_has_no_backup(self):
+        assert backup_model_for(Mock(model_name="fake-model")) is None
+
+
+class TestSupportsMultipleChoices:
+    """Test supports_multiple_choices function."""
+
+    def test_clients_with_an_n_setting(self):
+        from langchain_anthropic import ChatAnthropic
+        from langchain_openai import ChatOpenAI
+
+        assert supports_multiple_choices(ChatOpenAI(model="gpt-5", api_key="x"))
+        assert not supports_multiple_choices(
+            ChatAnthropic(model="claude-sonnet-4-5", api_key="x")
+        )
+
+    def test_plain_objects_do_not(self):
+        assert not supports_multiple_choices(Mock())
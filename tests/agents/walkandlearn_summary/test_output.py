@@ -1,8 +1,17 @@
 """Tests for output formatting functions."""
 
+import json
+from datetime import datetime
+from typing import ClassVar
+from unittest.mock import patch
+
 from src.agents.walkandlearn_summary.nodes.output import (
-    format_evaluation_file_content,
     format_evaluation_chat_output,
+    format_evaluation_file_content,
+    format_llm_usage_section,
+    render_metrics_file,
+    render_result_file,
+    write_all_output_files,
 )
 
 
@@ -109,3 +118,213 @@ class TestFormatEvaluationChatOutput:
 
         assert "**Best:** Summary N/A" in result
         assert "**Why:** N/A" in result
+
+
+class TestFormatLlmUsageSection:
+    """Test format_llm_usage_section function."""
+
+    def test_reports_prompt_cache_hits_and_per_call_rows(self):
+        """Test the prompt cache summary line and the per-call table."""
+        usage = [
+            {
+                "node": "emotional_0",
+                "model": "claude-sonnet-4-5",
+                "input_tokens": 1000,
+                "output_tokens": 100,
+                "cache_read_tokens": 0,
+                "cache_creation_tokens": 900,
+                "response_cache_hit": False,
+            },
+            {
+                "node": "emotional_1",
+                "model": "claude-sonnet-4-5",
+                "input_tokens": 1000,
+                "output_tokens": 120,
+                "cache_read_tokens": 900,
+                "cache_creation_tokens": 0,
+                "response_cache_hit": False,
+            },
+        ]
+
+        result = format_llm_usage_section(usage)
+
+        assert "900 of 2000 input tokens read from cache (45%)" in result
+        assert "1 of 2 calls hit" in result
+        assert "| emotional_1 | claude-sonnet-4-5 | 1000 | 900 | 0 | 120 |" in result
+
+
+def write_outputs(output_folder, **kwargs):
+    arguments = {
+        "emotional_summaries": ["emo 0", "emo 1", "emo 2"],
+        "technical_summaries": [
+            "tech 0 [AHA_PLACEHOLDER]",
+            "tech 1 [AHA_PLACEHOLDER]",
+        ],
+        "emotional_best_idx": 2,
+        "emotional_best_reasoning": "most vivid",
+        "technical_best_idx": 1,
+        "technical_best_reasoning": "most complete",
+        **kwargs,
+    }
+    return write_all_output_files(
+        output_folder=output_folder,
+        input_filename="walk.md",
+        config_template="main-claude",
+        now=datetime(2026, 1, 2, 3, 4, 5),
+        **arguments,
+    )
+
+
+class TestWriteAllOutputFiles:
+    """Test write_all_output_files function."""
+
+    def test_writes_each_file_exactly_once(self, tmp_path):
+        """Test that N + M summaries, N × M results and the evaluation are written once."""
+        with patch("src.agents.walkandlearn_summary.sink.write_file") as write_file:
+            write_outputs(tmp_path)
+
+        written = [call.args[0].name for call in write_file.call_args_list]
+        assert len(written) == len(set(written)) == 3 + 2 + 3 * 2 + 1
+        assert "result_e2_t1.md" in written
+
+    def test_combines_emotional_into_technical_placeholder(self, tmp_path):
+        write_outputs(tmp_path)
+
+        result = (tmp_path / "result_e2_t1.md").read_text(encoding="utf-8")
+        assert "review-summary_type: result" in result
+        assert result.endswith("tech 1 emo 2")
+
+    def test_second_write_skips_unchanged_files(self, tmp_path):
+        write_outputs(tmp_path)
+
+        stats = write_outputs(tmp_path)
+
+        assert stats.written == []
+        assert len(stats.unchanged) == 12
+
+    def test_best_result_only_writes_the_best_combination(self, tmp_path):
+        write_outputs(tmp_path, best_result_only=True)
+
+        results = sorted(p.name for p in tmp_path.glob("result_*.md"))
+        assert results == ["result_e2_t1.md"]
+        assert (tmp_path / "emotional_0.md").exists()
+        assert (tmp_path / "evaluation.md").exists()
+
+    def test_files_are_named_after_the_candidate_index(self, tmp_path):
+        """Test that with emotional_1 dropped, emotional_2.md is emotional_2's."""
+        write_outputs(
+            tmp_path,
+            emotional_summaries={0: "emo 0", 2: "emo 2"},
+            best_result_only=True,
+        )
+
+        emotional = sorted(p.name for p in tmp_path.glob("emotional_*.md"))
+        assert emotional == ["emotional_0.md", "emotional_2.md"]
+        assert (
+            (tmp_path / "emotional_2.md").read_text(encoding="utf-8").endswith("emo 2")
+        )
+        assert [p.name for p in tmp_path.glob("result_*.md")] == ["result_e2_t1.md"]
+
+
+class TestRenderResultFile:
+    """Test render_result_file function."""
+
+    def test_renders_a_skipped_combination_like_a_full_run(self, tmp_path):
+        full_folder, best_folder = tmp_path / "full", tmp_path / "best"
+        write_outputs(full_folder)
+        write_outputs(best_folder, best_result_only=True)
+
+        path = render_result_file(best_folder, emotional_idx=0, technical_idx=1)
+
+        assert path == best_folder / "result_e0_t1.md"
+        assert path.read_text(encoding="utf-8") == (
+            full_folder / "result_e0_t1.md"
+        ).read_text(encoding="utf-8")
+
+
+class TestRunMetricsOutput:
+    """Test the run metrics in evaluation.md and metrics.json."""
+
+    timings: ClassVar[list[dict]] = [
+        {"node": "load_conversation", "started_at": 10.0, "duration_s": 0.1},
+        {"node": "emotional_0", "started_at": 10.1, "duration_s": 3.0},
+    ]
+
+    def test_evaluation_includes_per_node_metrics(self, tmp_path):
+        write_outputs(tmp_path, node_timings=self.timings)
+
+        evaluation = (tmp_path / "evaluation.md").read_text(encoding="utf-8")
+        assert "# Run Metrics" in evaluation
+        assert "**Wall time:** 3.1s" in evaluation
+        assert "| emotional_0 | 3.00 |" in evaluation
+
+    def test_metrics_file_is_machine_readable(self, tmp_path):
+        files = render_metrics_file(
+            tmp_path,
+            input_filename="walk.md",
+            config_template="main-claude",
+            now=datetime(2026, 1, 2, 3, 4, 5),
+            node_timings=self.timings,
+            llm_usage=[],
+        )
+
+        metrics = json.loads(files[tmp_path / "metrics.json"])
+        assert metrics["config_template"] == "main-claude"
+        assert [n["node"] for n in metrics["nodes"]] == [
+            "load_conversation",
+            "emotional_0",
+        ]
+
+    def test_records_dropped_candidates(self, tmp_path):
+        """Test that candidates cancelled by the deadline are listed."""
+        write_outputs(tmp_path, dropped_candidates=["technical_2", "emotional_3"])
+        files = render_metrics_file(
+            tmp_path,
+            input_filename="walk.md",
+            config_template="main-claude",
+            now=datetime(2026, 1, 2, 3, 4, 5),
+            node_timings=self.timings,
+            llm_usage=[],
+            dropped_candidates=["emotional_3"],
+        )
+
+        evaluation = (tmp_path / "evaluation.md").read_text(encoding="utf-8")
+        assert "# Dropped Candidates" in evaluation
+        assert "- emotional_3\n- technical_2\n" in evaluation
+        metrics = json.loads(files[tmp_path / "metrics.json"])
+        assert metrics["dropped_candidates"] == ["emotional_3"]
+
+    def test_reports_the_conversation_digest(self, tmp_path):
+        """Test that the digest's token reduction and duration are reported."""
+        timings = [
+            *self.timings,
+            {"node": "conversation_digest", "started_at": 10.1, "duration_s": 1.5},
+        ]
+        stats = {
+            "mode": "model",
+            "conversation_tokens": 10000,
+            "normalized_tokens": 8000,
+            "digest_tokens": 4000,
+            "reduction": 0.6,
+            "candidate_calls": 5,
+            "saved_input_tokens": 30000,
+        }
+        write_outputs(tmp_path, node_timings=timings, digest_stats=stats)
+        files = render_metrics_file(
+            tmp_path,
+            input_filename="walk.md",
+            config_template="main-claude",
+            now=datetime(2026, 1, 2, 3, 4, 5),
+            node_timings=timings,
+            llm_usage=[],
+            digest_stats=stats,
+        )
+
+        evaluation = (tmp_path / "evaluation.md").read_text(encoding="utf-8")
+        assert (
+            "**Conversation digest (model):** 10000 → 4000 tokens (-60%) in 1.5s"
+            in evaluation
+        )
+        metrics = json.loads(files[tmp_path / "metrics.json"])
+        assert metrics["digest"]["saved_input_tokens"] == 30000
+        assert metrics["digest"]["duration_s"] == 1.5
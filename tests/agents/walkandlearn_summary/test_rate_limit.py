@@ -0,0 +1,128 @@
+"""Tests for the rate limiter."""
+
+import asyncio
+from unittest.mock import Mock
+
+from langchain_core.messages import HumanMessage
+
+from src.agents.walkandlearn_summary.rate_limit import (
+    RateLimit,
+    RateLimitedAgent,
+    TokenBucketRateLimiter,
+    get_rate_limiter,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucketRateLimiter:
+    """Test TokenBucketRateLimiter scheduling."""
+
+    def test_allows_a_burst_up_to_the_request_limit(self):
+        """Test that a full bucket lets calls through without waiting."""
+        limiter = TokenBucketRateLimiter(
+            RateLimit(requests_per_minute=3, tokens_per_minute=1_000_000),
+            clock=FakeClock(),
+        )
+
+        waits = [limiter.reserve(tokens=10) for _ in range(3)]
+
+        assert waits == [0.0, 0.0, 0.0]
+
+    def test_schedules_calls_past_the_request_limit(self):
+        """Test that each extra call waits one more refill interval."""
+        limiter = TokenBucketRateLimiter(
+            RateLimit(requests_per_minute=60, tokens_per_minute=1_000_000),
+            clock=FakeClock(),
+        )
+        for _ in range(60):
+            limiter.reserve(tokens=1)
+
+        assert limiter.reserve(tokens=1) == 1.0
+        assert limiter.reserve(tokens=1) == 2.0
+
+    def test_schedules_calls_past_the_token_limit(self):
+        """Test that the token budget delays a call even with requests to spare."""
+        limiter = TokenBucketRateLimiter(
+            RateLimit(requests_per_minute=1000, tokens_per_minute=6000),
+            clock=FakeClock(),
+        )
+
+        assert limiter.reserve(tokens=6000) == 0.0
+        # 3000 tokens refill in 30 seconds at 6000/min
+        assert limiter.reserve(tokens=3000) == 30.0
+
+    def test_refills_over_time(self):
+        """Test that capacity comes back as the clock advances."""
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(
+            RateLimit(requests_per_minute=1000, tokens_per_minute=6000), clock=clock
+        )
+        limiter.reserve(tokens=6000)
+
+        clock.now = 60.0
+
+        assert limiter.reserve(tokens=6000) == 0.0
+
+    def test_clamps_calls_larger_than_the_budget(self):
+        """Test that an oversized call waits for a full bucket, not forever."""
+        limiter = TokenBucketRateLimiter(
+            RateLimit(requests_per_minute=1000, tokens_per_minute=100),
+            clock=FakeClock(),
+        )
+
+        assert limiter.reserve(tokens=10_000) == 0.0
+        assert limiter.reserve(tokens=10_000) == 60.0
+
+    def test_reports_queue_depth_while_waiting(self):
+        """Test that waiting calls are counted in queue_depth."""
+        limiter = TokenBucketRateLimiter(
+            RateLimit(requests_per_minute=600, tokens_per_minute=1_000_000)
+        )
+        for _ in range(600):
+            limiter.reserve(tokens=1)
+        depths = []
+
+        async def scenario():
+            waiter = asyncio.create_task(limiter.acquire(tokens=1))
+            await asyncio.sleep(0.01)
+            depths.append(limiter.queue_depth)
+            await waiter
+            depths.append(limiter.queue_depth)
+
+        asyncio.run(scenario())
+
+        assert depths == [1, 0]
+
+
+def test_get_rate_limiter_shares_one_limiter_per_provider_and_model():
+    """Test that the same key returns the same limiter."""
+    limit = RateLimit(requests_per_minute=10, tokens_per_minute=1000)
+
+    first = get_rate_limiter("TestProvider", "model-a", limit)
+
+    assert get_rate_limiter("TestProvider", "model-a", limit) is first
+    assert get_rate_limiter("TestProvider", "model-b", limit) is not first
+
+
+def test_rate_limited_agent_budgets_input_and_output_tokens():
+    """Test that the wrapper reserves estimated tokens before calling the agent."""
+    limiter = Mock()
+    limiter.acquire_sync.return_value = 1.5
+    agent = Mock()
+    agent.invoke.return_value = {"messages": []}
+    wrapped = RateLimitedAgent(
+        agent, limiter, expected_output_tokens=500, system_prompt="x" * 400
+    )
+
+    result = wrapped.invoke({"messages": [HumanMessage(content="y" * 400)]})
+
+    limiter.acquire_sync.assert_called_once_with(201 + 500)
+    agent.invoke.assert_called_once()
+    assert result["rate_limit_wait_s"] == 1.5
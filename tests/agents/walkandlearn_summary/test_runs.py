@@ -0,0 +1,124 @@
+"""Tests for checkpointed, resumable runs."""
+
+import asyncio
+import operator
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from src.agents.walkandlearn_summary.runs import (
+    list_runs,
+    new_thread_id,
+    open_checkpointer,
+    run_thread,
+    saved_settings,
+)
+
+
+class ToyState(TypedDict, total=False):
+    input_filename: str
+    results: Annotated[list[str], operator.add]
+
+
+def build_toy_graph(checkpointer, calls: dict, fail: dict):
+    """load -> (left, right) -> write, where right fails while fail["on"]."""
+
+    def node(name):
+        def run(state: ToyState) -> dict:
+            calls[name] = calls.get(name, 0) + 1
+            if name == "right" and fail["on"]:
+                raise RuntimeError("provider error")
+            return {"results": [name]}
+
+        return run
+
+    builder = StateGraph(ToyState)
+    for name in ("load", "left", "right", "write"):
+        builder.add_node(name, node(name))
+    builder.add_edge(START, "load")
+    builder.add_edge("load", "left")
+    builder.add_edge("load", "right")
+    builder.add_edge("left", "write")
+    builder.add_edge("right", "write")
+    builder.add_edge("write", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+class TestNewThreadId:
+    """Test new_thread_id function."""
+
+    def test_starts_with_input_stem_and_is_unique(self):
+        first = new_thread_id("walks/2025-06-01.md")
+        second = new_thread_id("walks/2025-06-01.md")
+        assert first.startswith("2025-06-01-")
+        assert first != second
+
+
+class TestResume:
+    """Test resuming a failed run from its checkpoints."""
+
+    def test_resume_only_reruns_the_nodes_that_did_not_complete(self, tmp_path):
+        calls, fail = {}, {"on": True}
+
+        async def scenario():
+            async with open_checkpointer(tmp_path / "runs.sqlite") as checkpointer:
+                graph = build_toy_graph(checkpointer, calls, fail)
+                try:
+                    await run_thread(graph, "t1", {"input_filename": "walk.md"})
+                except RuntimeError:
+                    pass
+                failed_runs = await list_runs(graph, checkpointer)
+
+                fail["on"] = False
+                await run_thread(graph, "t1", None)
+                return failed_runs, await list_runs(graph, checkpointer)
+
+        failed_runs, finished_runs = asyncio.run(scenario())
+
+        assert [run.thread_id for run in failed_runs] == ["t1"]
+        assert failed_runs[0].input_filename == "walk.md"
+        assert not failed_runs[0].complete
+        assert "right" in failed_runs[0].next_nodes
+        assert finished_runs[0].complete
+        assert calls == {"load": 1, "left": 1, "right": 2, "write": 1}
+
+    def test_lists_one_entry_per_thread(self, tmp_path):
+        calls, fail = {}, {"on": False}
+
+        async def scenario():
+            async with open_checkpointer(tmp_path / "runs.sqlite") as checkpointer:
+                graph = build_toy_graph(checkpointer, calls, fail)
+                await run_thread(graph, "a", {"input_filename": "a.md"})
+                await run_thread(graph, "b", {"input_filename": "b.md"})
+                return await list_runs(graph, checkpointer)
+
+        runs = asyncio.run(scenario())
+
+        assert sorted(run.thread_id for run in runs) == ["a", "b"]
+        assert all(run.complete for run in runs)
+
+
+class TestSavedSettings:
+    """Test saved_settings function."""
+
+    def test_returns_the_settings_the_run_started_with(self, tmp_path):
+        calls, fail = {}, {"on": True}
+        settings = {"template": "main-gpt", "num_emotional_iterations": 5}
+
+        async def scenario():
+            async with open_checkpointer(tmp_path / "runs.sqlite") as checkpointer:
+                graph = build_toy_graph(checkpointer, calls, fail)
+                try:
+                    await run_thread(graph, "t1", {"input_filename": "a.md"}, settings)
+                except RuntimeError:
+                    pass
+                return (
+                    await saved_settings(checkpointer, "t1"),
+                    await saved_settings(checkpointer, "unknown"),
+                )
+
+        saved, unknown = asyncio.run(scenario())
+
+        assert saved["template"] == "main-gpt"
+        assert saved["num_emotional_iterations"] == 5
+        assert unknown is None
@@ -0,0 +1,34 @@
+"""Tests for the output sink."""
+
+import asyncio
+
+from src.agents.walkandlearn_summary.sink import OutputSink
+
+
+class TestOutputSink:
+    """Test OutputSink class."""
+
+    def test_writes_files_and_creates_folders(self, tmp_path):
+        files = {tmp_path / "a" / "one.md": "one", tmp_path / "b" / "two.md": "two"}
+
+        stats = OutputSink(max_workers=2).write_all(files)
+
+        assert sorted(stats.written) == sorted(files)
+        assert (tmp_path / "a" / "one.md").read_text(encoding="utf-8") == "one"
+
+    def test_only_rewrites_changed_content(self, tmp_path):
+        sink = OutputSink(max_workers=2)
+        sink.write_all({tmp_path / "same.md": "same", tmp_path / "changed.md": "v1"})
+
+        stats = sink.write_all(
+            {tmp_path / "same.md": "same", tmp_path / "changed.md": "v2"}
+        )
+
+        assert stats.written == [tmp_path / "changed.md"]
+        assert stats.unchanged == [tmp_path / "same.md"]
+        assert (tmp_path / "changed.md").read_text(encoding="utf-8") == "v2"
+
+    def test_async_write(self, tmp_path):
+        stats = asyncio.run(OutputSink().awrite_all({tmp_path / "one.md": "one"}))
+
+        assert stats.written == [tmp_path / "one.md"]
@@ -1,14 +1,44 @@
 """Tests for summary generation functions."""
 
-from unittest.mock import Mock
+import asyncio
+from unittest.mock import AsyncMock, Mock
 
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
 
 from src.agents.walkandlearn_summary.nodes.summary import (
+    MultiChoiceAgent,
+    agenerate_summary_with_agent,
+    build_summary_input,
     generate_summary_with_agent,
 )
 
 
+class ChoicesChatModel(BaseChatModel):
+    """Chat model returning n numbered choices, each with the call's usage."""
+
+    n: int = 1
+    prompts: list = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "choices"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(messages)
+        usage = {"input_tokens": 100, "output_tokens": 30, "total_tokens": 130}
+        return ChatResult(
+            generations=[
+                ChatGeneration(
+                    message=AIMessage(content=f"Summary {i}", usage_metadata=usage)
+                )
+                for i in range(self.n)
+            ]
+        )
+
+
 class TestGenerateSummaryWithAgent:
     """Test generate_summary_with_agent function."""
 
@@ -45,3 +75,90 @@ class TestGenerateSummaryWithAgent:
         result = generate_summary_with_agent(mock_agent, "Some conversation")
 
         assert result == expected_summary
+
+
+class TestAgenerateSummaryWithAgent:
+    """Test agenerate_summary_with_agent function."""
+
+    def test_awaits_agent_ainvoke_with_conversation(self):
+        """Test that the async path uses ainvoke and never the blocking invoke."""
+        mock_agent = Mock()
+        mock_agent.ainvoke = AsyncMock(
+            return_value={"messages": [AIMessage(content="Async summary.")]}
+        )
+
+        result = asyncio.run(
+            agenerate_summary_with_agent(mock_agent, "Person A: Hello")
+        )
+
+        assert result == "Async summary."
+        mock_agent.ainvoke.assert_awaited_once()
+        mock_agent.invoke.assert_not_called()
+        call_args = mock_agent.ainvoke.call_args[0][0]
+        assert "Person A: Hello" in call_args["messages"][0].content
+
+    def test_joins_text_blocks_from_list_content(self):
+        """Test that list content blocks are joined into one string."""
+        mock_agent = Mock()
+        mock_agent.ainvoke = AsyncMock(
+            return_value={
+                "messages": [
+                    AIMessage(
+                        content=[
+                            {"type": "text", "text": "First"},
+                            {"type": "text", "text": "Second"},
+                        ]
+                    )
+                ]
+            }
+        )
+
+        result = asyncio.run(agenerate_summary_with_agent(mock_agent, "Hi"))
+
+        assert result == "First\nSecond"
+
+
+class TestBuildSummaryInput:
+    """Test build_summary_input function."""
+
+    def test_plain_text_message_by_default(self):
+        """Test that no cache marker is added by default."""
+        result = build_summary_input("Person A: Hello")
+
+        assert isinstance(result["messages"][0].content, str)
+
+    def test_marks_prompt_prefix_as_cacheable(self):
+        """Test that cache_prefix adds an Anthropic cache_control breakpoint."""
+        result = build_summary_input("Person A: Hello", cache_prefix=True)
+
+        [block] = result["messages"][0].content
+        assert "Person A: Hello" in block["text"]
+        assert block["cache_control"] == {"type": "ephemeral"}
+
+
+class TestMultiChoiceAgent:
+    """Test MultiChoiceAgent class."""
+
+    def test_returns_every_choice_from_one_call(self):
+        """Test that n summaries come back from a single request."""
+        model = ChoicesChatModel(prompts=[])
+        agent = MultiChoiceAgent(model, "Summarize", n=3)
+
+        result = agent.invoke(build_summary_input("Person A: Hello"))
+
+        assert result["choices"] == ["Summary 0", "Summary 1", "Summary 2"]
+        [prompt] = agent.model.prompts
+        assert isinstance(prompt[0], SystemMessage)
+        assert "Person A: Hello" in prompt[1].content
+        # The model the agent was built with keeps its own setting
+        assert model.n == 1
+
+    def test_usage_is_reported_once(self):
+        """Test that only the first choice, carrying the call's usage, is kept."""
+        agent = MultiChoiceAgent(ChoicesChatModel(prompts=[]), "Summarize", n=3)
+
+        result = asyncio.run(agent.ainvoke(build_summary_input("Hi")))
+
+        [_, message] = result["messages"]
+        assert message.content == "Summary 0"
+        assert message.usage_metadata["output_tokens"] == 30
@@ -0,0 +1,229 @@
+"""Tests for sweep mode."""
+
+import asyncio
+import json
+from datetime import datetime
+
+from src.agents.walkandlearn_summary import config, sweep
+from src.agents.walkandlearn_summary.batch import ProviderSlots, template_providers
+from src.agents.walkandlearn_summary.sweep import (
+    SweepResult,
+    evaluator_picks,
+    format_sweep_report,
+    run_sweep,
+    run_template,
+    write_sweep_report,
+)
+
+
+def final_state(best_idx=1):
+    return {
+        "emotional_summaries": {0: "e0", 1: "e1"},
+        "technical_summaries": {0: "t0", 1: "t1"},
+        "emotional_best_idx": best_idx,
+        "emotional_best_reasoning": "More vivid.",
+        "technical_best_idx": 0,
+        "technical_best_reasoning": "More accurate.",
+        "node_timings": [
+            {"node": "load_conversation", "started_at": 100.0, "duration_s": 0.1},
+            {"node": "write_output", "started_at": 101.0, "duration_s": 0.5},
+        ],
+        "llm_usage": [
+            {
+                "node": "emotional_summary",
+                "input_tokens": 1000,
+                "output_tokens": 200,
+                "cost_usd": 0.01,
+            }
+        ],
+    }
+
+
+class FakeGraph:
+    """Stands in for a template's compiled graph and records overlapping runs."""
+
+    def __init__(self, tracker, fail=False):
+        self.tracker = tracker
+        self.fail = fail
+        self.inputs = []
+        self.configs = []
+
+    async def ainvoke(self, graph_input, config):
+        self.inputs.append(graph_input)
+        self.configs.append(config)
+        self.tracker["in_flight"] += 1
+        self.tracker["max_in_flight"] = max(
+            self.tracker["max_in_flight"], self.tracker["in_flight"]
+        )
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail:
+                raise RuntimeError("boom")
+            return final_state()
+        finally:
+            self.tracker["in_flight"] -= 1
+
+
+class TestEvaluatorPicks:
+    """Test evaluator_picks function."""
+
+    def test_reads_the_picks_of_both_summary_types(self):
+        picks = evaluator_picks(final_state(best_idx=1))
+
+        assert picks["emotional"] == {
+            "best_idx": 1,
+            "candidates": 2,
+            "reasoning": "More vivid.",
+        }
+        assert picks["technical"]["best_idx"] == 0
+
+    def test_disabled_summaries_have_no_candidates(self):
+        picks = evaluator_picks({})
+
+        assert picks["technical"] == {
+            "best_idx": None,
+            "candidates": 0,
+            "reasoning": None,
+        }
+
+
+class TestRunTemplate:
+    """Test run_template function."""
+
+    def test_passes_the_template_and_the_shared_config(self):
+        graph = FakeGraph({"in_flight": 0, "max_in_flight": 0})
+        slots = ProviderSlots(4, None, template_providers("wip"))
+
+        result = asyncio.run(
+            run_template(
+                graph,
+                "wip",
+                "input.md",
+                slots,
+                graph_config={"configurable": {"bypass_response_cache": True}},
+            )
+        )
+
+        assert graph.configs == [
+            {"configurable": {"bypass_response_cache": True, "template": "wip"}}
+        ]
+        assert result.status == "done"
+        assert result.metrics["input_tokens"] == 1000
+        assert result.picks["emotional"]["best_idx"] == 1
+
+    def test_failures_are_recorded(self):
+        graph = FakeGraph({"in_flight": 0, "max_in_flight": 0}, fail=True)
+        slots = ProviderSlots(4, None, template_providers("wip"))
+
+        result = asyncio.run(run_template(graph, "wip", "input.md", slots))
+
+        assert result.status == "failed"
+        assert "boom" in result.error
+
+
+def write_input(tmp_path):
+    input_path = tmp_path / "walk.md"
+    input_path.write_text("A transcript", encoding="utf-8")
+    return str(input_path)
+
+
+class TestRunSweep:
+    """Test run_sweep function."""
+
+    def test_runs_the_templates_concurrently(self, tmp_path):
+        tracker = {"in_flight": 0, "max_in_flight": 0}
+        built = []
+
+        def factory(graph_config):
+            built.append(graph_config["configurable"]["template"])
+            return FakeGraph(tracker)
+
+        results = asyncio.run(
+            run_sweep(
+                write_input(tmp_path),
+                ["main-claude", "main-gpt"],
+                graph_factory=factory,
+            )
+        )
+
+        assert built == ["main-claude", "main-gpt"]
+        assert [r.template for r in results] == ["main-claude", "main-gpt"]
+        assert tracker["max_in_flight"] == 2
+
+    def test_respects_the_provider_limits(self, tmp_path):
+        """Test that templates sharing a provider wait for its slot."""
+        tracker = {"in_flight": 0, "max_in_flight": 0}
+
+        results = asyncio.run(
+            run_sweep(
+                write_input(tmp_path),
+                ["wip", "wip-thinking"],
+                graph_factory=lambda _: FakeGraph(tracker),
+                provider_limits={"OpenAI": 1},
+            )
+        )
+
+        assert all(r.status == "done" for r in results)
+        assert tracker["max_in_flight"] == 1
+
+    def test_reads_the_transcript_once_for_every_template(self, tmp_path, monkeypatch):
+        tracker = {"in_flight": 0, "max_in_flight": 0}
+        graphs, reads = [], []
+        monkeypatch.setattr(
+            sweep, "read_file", lambda path: reads.append(path) or "A transcript"
+        )
+
+        def factory(graph_config):
+            graphs.append(FakeGraph(tracker))
+            return graphs[-1]
+
+        asyncio.run(
+            run_sweep("walk.md", ["main-claude", "main-gpt"], graph_factory=factory)
+        )
+
+        assert len(reads) == 1
+        assert [g.inputs for g in graphs] == [
+            [{"input_filename": "walk.md", "input_text": "A transcript"}]
+        ] * 2
+
+
+class TestSweepReport:
+    """Test the sweep report."""
+
+    def test_compares_the_templates(self):
+        tracker = {"in_flight": 0, "max_in_flight": 0}
+        done = asyncio.run(
+            run_template(
+                FakeGraph(tracker),
+                "main-gpt",
+                "input.md",
+                ProviderSlots(1, None, template_providers("main-gpt")),
+            )
+        )
+        failed = SweepResult("main-claude", "failed", duration_s=2.0, error="boom")
+
+        report = format_sweep_report(
+            "input.md", [done, failed], datetime(2026, 1, 1, 12, 0)
+        )
+
+        assert "| main-gpt | done |" in report
+        assert "| 1000 | 200 | 0.0100 | #1 of 2 | #0 of 2 |" in report
+        assert "| main-claude | failed | 2.0 |" in report
+        assert "**Emotional pick (#1 of 2):** More vivid." in report
+        assert "Failed: `boom`" in report
+
+    def test_writes_the_report_and_its_data(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "OUTPUT_FILE_PATH_OBSIDIAN_BASE", tmp_path)
+        results = [SweepResult("main-gpt", "failed", error="boom")]
+
+        report_path = write_sweep_report(
+            "walks/walk-1.md", results, datetime(2026, 1, 1, 12, 0)
+        )
+
+        assert (
+            report_path
+            == tmp_path / "walks" / "walk-1" / "sweeps" / "20260101-120000.md"
+        )
+        data = json.loads(report_path.with_suffix(".json").read_text())
+        assert data["results"][0]["template"] == "main-gpt"
+        assert "technical" in data["results"][0]["models"]
@@ -0,0 +1,100 @@
+"""Tests for OpenTelemetry tracing of graph runs."""
+
+import asyncio
+import time
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+from src.agents.walkandlearn_summary.tracing import (
+    ROOT_SPAN_NAME,
+    GraphTracer,
+    JsonLinesSpanExporter,
+    max_concurrency,
+    summarize_traces,
+)
+
+
+class ToyState(TypedDict, total=False):
+    input_filename: str
+    done: list[str]
+
+
+def build_fan_out_graph(tracer: GraphTracer):
+    """load -> (a, b, c) -> write, where the fan-out nodes overlap in time."""
+
+    async def candidate(state: ToyState) -> dict:
+        await asyncio.sleep(0.05)
+        return {}
+
+    builder = StateGraph(ToyState)
+    builder.add_node("load", lambda state: {})
+    builder.add_node("write", lambda state: {})
+    builder.add_edge(START, "load")
+    for name in ("a", "b", "c"):
+        builder.add_node(name, candidate)
+        builder.add_edge("load", name)
+        builder.add_edge(name, "write")
+    builder.add_edge("write", END)
+    return builder.compile().with_config(callbacks=[tracer])
+
+
+def traced_provider(tmp_path) -> TracerProvider:
+    provider = TracerProvider()
+    provider.add_span_processor(
+        SimpleSpanProcessor(JsonLinesSpanExporter(tmp_path / "traces.jsonl"))
+    )
+    return provider
+
+
+class TestGraphTracer:
+    """Test GraphTracer callback handler."""
+
+    def test_one_trace_per_run_with_node_spans(self, tmp_path):
+        graph = build_fan_out_graph(GraphTracer(traced_provider(tmp_path)))
+
+        asyncio.run(graph.ainvoke({"input_filename": "walk.md"}))
+        asyncio.run(graph.ainvoke({"input_filename": "other.md"}))
+
+        [first, second] = summarize_traces(tmp_path / "traces.jsonl")
+        assert first["trace_id"] != second["trace_id"]
+        assert first["input_filename"] == "walk.md"
+        # The root fans out to load, a, b, c and write; a, b and c overlap
+        [fan_out] = first["fan_outs"]
+        assert fan_out == {"span": ROOT_SPAN_NAME, "nodes": 5, "max_concurrency": 3}
+
+    def test_failed_node_marks_its_span_as_error(self, tmp_path):
+        provider = traced_provider(tmp_path)
+
+        def fail(state: ToyState) -> dict:
+            raise RuntimeError("provider error")
+
+        builder = StateGraph(ToyState)
+        builder.add_node("fail", fail)
+        builder.add_edge(START, "fail")
+        builder.add_edge("fail", END)
+        graph = builder.compile().with_config(callbacks=[GraphTracer(provider)])
+
+        try:
+            graph.invoke({"input_filename": "walk.md"})
+        except RuntimeError:
+            pass
+
+        traces = (tmp_path / "traces.jsonl").read_text(encoding="utf-8")
+        assert '"status_code": "ERROR"' in traces
+        assert "provider error" in traces
+
+
+class TestMaxConcurrency:
+    """Test max_concurrency function."""
+
+    def test_counts_overlapping_intervals(self):
+        now = time.time()
+        intervals = [(now, now + 3), (now + 1, now + 2), (now + 2.5, now + 4)]
+
+        assert max_concurrency(intervals) == 2
+
+    def test_sequential_intervals(self):
+        assert max_concurrency([(0, 1), (1, 2), (2, 3)]) == 1
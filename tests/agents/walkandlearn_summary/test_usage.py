@@ -0,0 +1,127 @@
+"""Tests for LLM usage collection."""
+
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.walkandlearn_summary.usage import (
+    UsageRecorder,
+    extract_usage,
+    summarize_prompt_cache,
+)
+
+
+def ai_message(input_tokens, output_tokens, cache_read=0, cache_creation=0):
+    return AIMessage(
+        content="summary",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_token_details": {
+                "cache_read": cache_read,
+                "cache_creation": cache_creation,
+            },
+        },
+    )
+
+
+class TestExtractUsage:
+    """Test extract_usage function."""
+
+    def test_reads_cache_details_from_usage_metadata(self):
+        """Test that cache read/creation tokens are extracted."""
+        result = {
+            "messages": [
+                HumanMessage(content="conversation"),
+                ai_message(1000, 200, cache_read=900),
+            ]
+        }
+
+        usage = extract_usage(result)
+
+        assert usage == {
+            "input_tokens": 1000,
+            "output_tokens": 200,
+            "cache_read_tokens": 900,
+            "cache_creation_tokens": 0,
+            "response_cache_hit": False,
+            "wait_s": 0.0,
+        }
+
+    def test_reads_rate_limit_wait(self):
+        """Test that the wait reported by RateLimitedAgent is extracted."""
+        result = {"messages": [ai_message(10, 5)], "rate_limit_wait_s": 2.5}
+
+        assert extract_usage(result)["wait_s"] == 2.5
+
+    def test_handles_messages_without_usage(self):
+        """Test that a response-cache hit counts as zero tokens."""
+        result = {
+            "messages": [
+                AIMessage(content="x", response_metadata={"response_cache": "hit"})
+            ]
+        }
+
+        usage = extract_usage(result)
+
+        assert usage["input_tokens"] == 0
+        assert usage["response_cache_hit"] is True
+
+
+def test_usage_recorder_records_each_call():
+    """Test that the recorder passes calls through and keeps their usage."""
+    agent = Mock()
+    agent.invoke.return_value = {"messages": [ai_message(10, 5)]}
+    recorder = UsageRecorder(agent, node="emotional_0", model_slug="slug")
+
+    result = recorder.invoke({"messages": []})
+
+    assert result is agent.invoke.return_value
+    [record] = recorder.records
+    assert record["latency_s"] >= 0
+    assert {k: v for k, v in record.items() if k != "latency_s"} == {
+        "node": "emotional_0",
+        "model": "slug",
+        "input_tokens": 10,
+        "output_tokens": 5,
+        "cache_read_tokens": 0,
+        "cache_creation_tokens": 0,
+        "response_cache_hit": False,
+        "wait_s": 0.0,
+        "cost_usd": None,
+        "hedged": None,
+        "hedge_cost_usd": 0.0,
+    }
+
+
+def test_usage_recorder_prices_calls_from_the_catalog():
+    """Test that the cost uses the input, cache and output prices of the model."""
+    agent = Mock()
+    agent.invoke.return_value = {
+        "messages": [ai_message(1_000_000, 100_000, cache_read=400_000)]
+    }
+    recorder = UsageRecorder(agent, node="emotional_0", model_slug="claude-sonnet-4-5")
+
+    recorder.invoke({"messages": []})
+
+    # 600k uncached input at $3, 400k cache reads at $0.30, 100k output at $15
+    assert recorder.records[0]["cost_usd"] == pytest.approx(1.8 + 0.12 + 1.5)
+
+
+def test_summarize_prompt_cache_aggregates_hits():
+    """Test the run-level prompt cache metrics."""
+    records = [
+        {**extract_usage({"messages": [ai_message(1000, 1, cache_creation=900)]})},
+        {**extract_usage({"messages": [ai_message(1000, 1, cache_read=900)]})},
+        {**extract_usage({"messages": [ai_message(1000, 1, cache_read=900)]})},
+    ]
+
+    summary = summarize_prompt_cache(records)
+
+    assert summary["calls"] == 3
+    assert summary["calls_with_cache_hit"] == 2
+    assert summary["cache_read_tokens"] == 1800
+    assert summary["cache_creation_tokens"] == 900
+    assert summary["cache_hit_ratio"] == 0.6
@@ -0,0 +1,90 @@
+"""Tests for the fake-model graph overhead benchmark."""
+
+import asyncio
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.graph_overhead import (
+    FakeChatModel,
+    ideal_latency_s,
+    make_conversation,
+    run_scenario,
+    scenarios,
+)
+
+
+class TestFakeChatModel:
+    """Test FakeChatModel."""
+
+    def test_returns_requested_output_tokens(self):
+        """Test that the response reports the configured usage."""
+        model = FakeChatModel(response="Hi.", latency_s=0.0, output_tokens=20)
+
+        message = asyncio.run(model.ainvoke([HumanMessage(content="x" * 400)]))
+
+        assert message.content.startswith("Hi.")
+        assert message.usage_metadata["output_tokens"] == 20
+        assert message.usage_metadata["input_tokens"] == 100
+
+    def test_returns_n_completions(self):
+        """Test that n > 1 returns several generations from one call."""
+        model = FakeChatModel(response="Hi.", latency_s=0.0, n=3)
+
+        result = model.generate([[HumanMessage(content="hello")]])
+
+        assert len(result.generations[0]) == 3
+        assert len(model.calls) == 1
+
+    def test_sampled_latency_is_reproducible(self):
+        """Test that the same seed samples the same latencies."""
+        latencies = []
+        for _ in range(2):
+            model = FakeChatModel(latency_s=0.001, latency_sigma=0.5, seed=7)
+            for _ in range(3):
+                model.invoke("hello")
+            latencies.append([latency for _, latency in model.calls])
+
+        assert latencies[0] == latencies[1]
+        assert len(set(latencies[0])) == 3
+
+
+class TestIdealLatency:
+    """Test ideal_latency_s function."""
+
+    def test_slowest_candidate_plus_evaluation_of_slowest_subgraph(self):
+        calls = [
+            ("emotional_summaries", 1.0),
+            ("emotional_summaries", 3.0),
+            ("technical_summaries", 2.0),
+            ("emotional_summaries", 0.5),
+            ("technical_summaries", 2.0),
+        ]
+
+        assert ideal_latency_s(calls) == 4.0
+
+    def test_no_calls(self):
+        assert ideal_latency_s([]) == 0.0
+
+
+def test_scenarios_sweep_iterations_then_sizes():
+    """Test that sizes beyond the first are swept at fixed iterations."""
+    planned = scenarios([1, 8], [100, 1000], size_iterations=4, modes=["async"])
+
+    assert planned == [(1, 100, "async"), (8, 100, "async"), (4, 1000, "async")]
+
+
+def test_make_conversation_size():
+    assert 1000 <= len(make_conversation(1000)) < 1200
+
+
+def test_run_scenario_end_to_end():
+    """Test a tiny run of the real graph with fake models."""
+    result = run_scenario(
+        iterations=2, conversation_chars=500, mode="async", latency_s=0.01, repeat=1
+    )
+
+    # 2 candidates and 1 evaluation per subgraph
+    assert result["llm_calls"] == 6
+    assert result["ideal_s"] == 0.02
+    assert result["latency_s"] >= result["ideal_s"]
+    assert result["peak_threads"] >= 1
@@ -0,0 +1,118 @@
+"""Tests for the startup benchmark helpers."""
+
+import importlib
+
+from benchmarks.startup import (
+    EntryPoint,
+    detect_regressions,
+    load_entry_points,
+    measure_once,
+    parse_importtime,
+    summarize_import_tree,
+)
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 | json
+import time:       300 |        300 |     leaf
+import time:       200 |        500 |   child_a
+import time:        50 |         50 |   child_b
+import time:      1000 |       1550 | entry
+"""
+
+
+class TestParseImporttime:
+    """Test parse_importtime function."""
+
+    def test_builds_tree_from_post_order_output(self):
+        """Test that indented lines become children of the next shallower line."""
+        roots = parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert [r.module for r in roots] == ["json", "entry"]
+        entry = roots[1]
+        assert entry.self_us == 1000
+        assert [c.module for c in entry.children] == ["child_a", "child_b"]
+        assert [c.module for c in entry.children[0].children] == ["leaf"]
+
+    def test_summarizes_heaviest_children_first(self):
+        """Test that the summary sorts children by cumulative time."""
+        entry = parse_importtime(IMPORTTIME_OUTPUT)[1]
+
+        summary = summarize_import_tree(entry, max_depth=1)
+
+        assert summary["cumulative_ms"] == 1.6
+        assert [c["module"] for c in summary["children"]] == ["child_a", "child_b"]
+        assert "children" not in summary["children"][0]
+
+
+class TestLoadEntryPoints:
+    """Test load_entry_points function."""
+
+    def test_reads_graphs_from_langgraph_json(self):
+        """Test that every graph maps to an importable module and attribute."""
+        entry_points = {ep.name: ep for ep in load_entry_points()}
+
+        wl = entry_points["W&L Summary"]
+        assert wl.module == "src.agents.walkandlearn_summary.graph"
+        # A graph factory, whose default graph is the module-level one
+        module = importlib.import_module(wl.module)
+        assert getattr(module, wl.attr)({}) is module.graph
+
+
+FACTORY_MODULE = """
+class FakeGraph:
+    def invoke(self, graph_input, config=None):
+        return graph_input
+
+
+def make_graph(config):
+    return FakeGraph()
+"""
+
+
+class TestMeasureOnce:
+    """Test measure_once function."""
+
+    def test_calls_graph_factories(self, tmp_path, monkeypatch):
+        """Test that a factory entry point is timed building its graph."""
+        (tmp_path / "fake_entry.py").write_text(FACTORY_MODULE)
+        monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+
+        sample = measure_once(EntryPoint("Fake", "fake_entry", "make_graph"))
+
+        assert sample["graph"] == "FakeGraph"
+        assert sample["import_tree"]["module"] == "fake_entry"
+
+
+class TestDetectRegressions:
+    """Test detect_regressions function."""
+
+    @staticmethod
+    def run(import_s, rss=100.0):
+        return {
+            "results": {
+                "W&L": {"import_s": import_s, "compile_s": 0.1, "peak_rss_mb": rss}
+            }
+        }
+
+    def test_flags_metric_above_threshold(self):
+        """Test that a slowdown beyond the threshold is reported."""
+        history = [self.run(1.0), self.run(1.1), self.run(0.9)]
+
+        regressions = detect_regressions(
+            history, self.run(2.0)["results"], threshold=0.2
+        )
+
+        assert len(regressions) == 1
+        assert "import_s" in regressions[0]
+
+    def test_ignores_small_absolute_changes(self):
+        """Test that noise below the absolute floor is not a regression."""
+        history = [self.run(0.1)]
+
+        regressions = detect_regressions(history, self.run(0.14)["results"])
+
+        assert regressions == []
+
+    def test_no_history_means_no_regressions(self):
+        """Test that the first run never flags anything."""
+        assert detect_regressions([], self.run(5.0)["results"]) == []